@@ -14,6 +14,10 @@ Funciones disponibles:
 - generar_graficas_por_experimento_barras: Gráficos individuales por experimento
 - calcular_medias_medianas: Calcula estadísticas descriptivas
 - calcular_y_graficar_consistencia: Calcula y visualiza consistencia (diferencia media-mediana)
+- cargar_resultados_escalamiento: Carga el JSON del barrido de escalamiento (modo matriz)
+- calcular_metricas_escalamiento: MB/s y líneas/s por core, speedup y eficiencia paralela
+- ajustar_amdahl: Ajusta la fracción serial de Amdahl por experimento
+- graficar_escalamiento: Gráficos de throughput y eficiencia vs. cores
 
 Autores: Manuela Ramos Ospina, Paula Andrea Pirela Rios, Carlos Eduardo Baez Coronado
 """
@@ -23,8 +27,9 @@ import re
 import ast
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+# matplotlib y seaborn se importan dentro de las funciones que grafican:
+# procesar_logs_multi_formato y las funciones de estadísticas no los necesitan.
 
 
 def procesar_logs_multi_formato(ruta_carpeta_principal):
@@ -215,6 +220,9 @@ def generar_grafica_comparativa(df):
         >>> generar_grafica_comparativa(df_renamed)
         # Muestra gráfico de barras con tiempos promedio
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     df_promedio = df.groupby('experimento', as_index=False)['tiempo_de_ejecucion'].mean()
 
     plt.figure(figsize=(10, 6))
@@ -260,6 +268,9 @@ def generar_graficas_por_experimento_barras(df):
         >>> generar_graficas_por_experimento_barras(df_preparado)
         # Muestra grid de gráficos, uno por experimento
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     df_limpio = df.dropna(subset=['experimento', 'cantidad_registros_num', 'tiempo_de_ejecucion'])
 
     if df_limpio.empty:
@@ -381,6 +392,9 @@ def calcular_y_graficar_consistencia(df):
         ex-duckdb                 12.45              12.40          0.05          0.40%
         ex-polars                 15.67              14.20          1.47          9.38%
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     df['tiempo_de_ejecucion'] = pd.to_numeric(df['tiempo_de_ejecucion'], errors='coerce')
 
     # Calcular media y mediana
@@ -428,3 +442,230 @@ def calcular_y_graficar_consistencia(df):
     plt.tight_layout()
 
     return resultados
+
+
+def cargar_resultados_escalamiento(ruta_json):
+    """
+    Carga los registros del barrido de escalamiento (`python -m mineria_benchmark matrix`).
+
+    Args:
+        ruta_json (str): Ruta al JSON generado por el modo matriz
+            (por defecto results/matrix/scaling.json).
+
+    Returns:
+        pd.DataFrame: Un registro por medición, con columnas renombradas a la
+        convención del módulo:
+            - experimento: Nombre del experimento (ej: ex-polars)
+            - cores: Workers/hilos usados
+            - distribucion: Distribución de tamaños de archivo (uniform, skewed, heavy-tail)
+            - megabytes: Volumen total nominal en MB
+            - archivos, bytes, lineas: Tamaño real del dataset
+            - tiempo_de_ejecucion: Tiempo total (prepare + run) en segundos
+            - tiempo_de_proceso: Tiempo de run() en segundos (sin arranque)
+        Las mediciones fallidas o con conteos incorrectos se descartan.
+
+    Example:
+        >>> df_esc = cargar_resultados_escalamiento('results/matrix/scaling.json')
+    """
+    df = pd.read_json(ruta_json)
+
+    if 'ok' in df.columns:
+        df = df[df['ok'] == True]  # noqa: E712
+    df = df.dropna(subset=['wall_time_s'])
+
+    df = df.rename(columns={
+        'engine': 'experimento',
+        'workers': 'cores',
+        'distribution': 'distribucion',
+        'total_mb': 'megabytes',
+        'files': 'archivos',
+        'lines': 'lineas',
+        'wall_time_s': 'tiempo_de_ejecucion',
+        'run_s': 'tiempo_de_proceso',
+    })
+    df['experimento'] = 'ex-' + df['experimento'].astype(str)
+
+    return df.reset_index(drop=True)
+
+
+def calcular_metricas_escalamiento(df):
+    """
+    Calcula throughput, speedup y eficiencia paralela por experimento y número de cores.
+
+    Para cada combinación (experimento, distribucion, megabytes, cores) toma la
+    mediana del tiempo de ejecución y calcula:
+        - mb_s / lineas_s: Throughput total
+        - mb_s_por_core / lineas_s_por_core: Throughput dividido por los cores usados
+        - speedup: Tiempo con la menor cantidad de cores / tiempo con `cores`
+        - eficiencia: speedup / (cores / cores_base). 1.0 = escalamiento lineal
+
+    El speedup se mide contra el menor número de cores del barrido (cores=1 si
+    está incluido); ajustar_amdahl tiene en cuenta esa base.
+
+    Args:
+        df (pd.DataFrame): DataFrame de cargar_resultados_escalamiento.
+
+    Returns:
+        pd.DataFrame: Una fila por (experimento, distribucion, megabytes, cores).
+
+    Example:
+        >>> metricas = calcular_metricas_escalamiento(df_esc)
+        >>> print(metricas[['experimento', 'cores', 'mb_s', 'eficiencia']])
+    """
+    claves = ['experimento', 'distribucion', 'megabytes']
+
+    metricas = (
+        df.groupby(claves + ['cores'], as_index=False)
+        .agg(
+            tiempo_de_ejecucion=('tiempo_de_ejecucion', 'median'),
+            bytes=('bytes', 'first'),
+            lineas=('lineas', 'first'),
+            repeticiones=('tiempo_de_ejecucion', 'size'),
+        )
+        .sort_values(claves + ['cores'])
+    )
+
+    metricas['mb_s'] = metricas['bytes'] / (1024**2) / metricas['tiempo_de_ejecucion']
+    metricas['lineas_s'] = metricas['lineas'] / metricas['tiempo_de_ejecucion']
+    metricas['mb_s_por_core'] = metricas['mb_s'] / metricas['cores']
+    metricas['lineas_s_por_core'] = metricas['lineas_s'] / metricas['cores']
+
+    base = metricas.groupby(claves)[['cores', 'tiempo_de_ejecucion']].transform('first')
+    metricas['speedup'] = base['tiempo_de_ejecucion'] / metricas['tiempo_de_ejecucion']
+    metricas['eficiencia'] = metricas['speedup'] / (metricas['cores'] / base['cores'])
+
+    return metricas.reset_index(drop=True)
+
+
+def ajustar_amdahl(metricas):
+    """
+    Ajusta la ley de Amdahl a los tiempos medidos de cada experimento.
+
+    Amdahl: T(n) = s + p / n, con s el tiempo serial y p el paralelizable con
+    1 core; la fracción serial es f = s / (s + p) y speedup(n) = T(1) / T(n) =
+    1 / (f + (1 - f) / n). s y p se estiman por mínimos cuadrados de T contra
+    1/n, así que el ajuste no necesita una medición con cores=1: el speedup de
+    calcular_metricas_escalamiento es relativo al menor número de cores del
+    barrido, y se compara con el previsto relativo a esa misma base.
+
+    Args:
+        metricas (pd.DataFrame): DataFrame de calcular_metricas_escalamiento.
+
+    Returns:
+        pd.DataFrame: Una fila por (experimento, distribucion, megabytes) con:
+            - fraccion_serial: f estimada, acotada a [0, 1] (NaN con un solo nivel de cores)
+            - speedup_maximo: 1 / f respecto de 1 core (inf si f = 0)
+            - error_rms: Error cuadrático medio del ajuste sobre el speedup medido
+            - puntos: Cantidad de niveles de cores usados en el ajuste
+
+    Example:
+        >>> amdahl = ajustar_amdahl(metricas)
+        >>> print(amdahl.sort_values('fraccion_serial'))
+    """
+    filas = []
+    for (experimento, distribucion, megabytes), grupo in metricas.groupby(
+            ['experimento', 'distribucion', 'megabytes']):
+        n = grupo['cores'].to_numpy(dtype=float)
+        tiempo = grupo['tiempo_de_ejecucion'].to_numpy(dtype=float)
+        speedup = grupo['speedup'].to_numpy(dtype=float)
+
+        if len(np.unique(n)) > 1:
+            p, s = np.polyfit(1.0 / n, tiempo, 1)
+            # s o p negativos por ruido: el ajuste queda en el borde (todo paralelo o todo serial)
+            f = float(np.clip(s / (s + p), 0.0, 1.0)) if s + p > 0 else 1.0
+        else:
+            f = np.nan  # un solo nivel de cores: no hay escalamiento que ajustar
+
+        if np.isnan(f):
+            previsto = np.full_like(n, np.nan)
+        else:
+            base = n.min()
+            previsto = (f + (1.0 - f) / base) / (f + (1.0 - f) / n)
+        filas.append({
+            'experimento': experimento,
+            'distribucion': distribucion,
+            'megabytes': megabytes,
+            'fraccion_serial': f,
+            'speedup_maximo': (1.0 / f if f > 0 else np.inf) if not np.isnan(f) else np.nan,
+            'error_rms': float(np.sqrt(np.mean((previsto - speedup) ** 2))),
+            'puntos': len(n),
+        })
+
+    return pd.DataFrame(filas)
+
+
+def eficiencia_amdahl(f, cores, base):
+    """
+    Eficiencia prevista por Amdahl con la misma base que calcular_metricas_escalamiento.
+
+    La eficiencia medida es speedup / (cores / base), con el speedup relativo
+    al menor número de cores del barrido (`base`), no a 1 core.
+
+    Args:
+        f (float): Fracción serial estimada por ajustar_amdahl.
+        cores (float | np.ndarray): Cores donde evaluar la eficiencia.
+        base (float): Menor número de cores del barrido.
+
+    Returns:
+        float | np.ndarray: Eficiencia prevista (1.0 en `base`).
+    """
+    return (f + (1.0 - f) / base) / (f + (1.0 - f) / cores) * base / cores
+
+
+def graficar_escalamiento(metricas, amdahl=None):
+    """
+    Grafica el escalamiento por cores: throughput (MB/s) y eficiencia paralela.
+
+    Genera una fila de gráficos por combinación (distribucion, megabytes), con
+    una línea por experimento. Si se pasa el ajuste de Amdahl, la eficiencia
+    prevista se dibuja punteada.
+
+    Args:
+        metricas (pd.DataFrame): DataFrame de calcular_metricas_escalamiento.
+        amdahl (pd.DataFrame, optional): DataFrame de ajustar_amdahl.
+
+    Returns:
+        None: Muestra el gráfico con matplotlib.
+
+    Example:
+        >>> graficar_escalamiento(metricas, ajustar_amdahl(metricas))
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    escenarios = metricas[['distribucion', 'megabytes']].drop_duplicates().values.tolist()
+    if not escenarios:
+        print("¡ALERTA! No hay métricas de escalamiento para graficar.")
+        return
+
+    fig, axes = plt.subplots(len(escenarios), 2, figsize=(14, 5 * len(escenarios)), squeeze=False)
+    fig.suptitle('Escalamiento por Cores', fontsize=16, y=1.02)
+
+    for fila, (distribucion, megabytes) in enumerate(escenarios):
+        df_esc = metricas[(metricas['distribucion'] == distribucion) & (metricas['megabytes'] == megabytes)]
+        ax_mb, ax_ef = axes[fila]
+
+        sns.lineplot(data=df_esc, x='cores', y='mb_s', hue='experimento', marker='o', ax=ax_mb)
+        ax_mb.set_title(f'Throughput - {distribucion}, {megabytes:g} MB', fontsize=12)
+        ax_mb.set_xlabel('Cores', fontsize=10)
+        ax_mb.set_ylabel('MB/s', fontsize=10)
+        ax_mb.grid(linestyle=':', alpha=0.5)
+
+        sns.lineplot(data=df_esc, x='cores', y='eficiencia', hue='experimento', marker='o', ax=ax_ef)
+        if amdahl is not None:
+            ajuste = amdahl[(amdahl['distribucion'] == distribucion) & (amdahl['megabytes'] == megabytes)]
+            for _, fila_ajuste in ajuste.dropna(subset=['fraccion_serial']).iterrows():
+                f = fila_ajuste['fraccion_serial']
+                # Misma base que la eficiencia medida: el menor número de cores del experimento
+                base = df_esc.loc[df_esc['experimento'] == fila_ajuste['experimento'], 'cores'].min()
+                cores = np.linspace(base, df_esc['cores'].max(), 50)
+                ax_ef.plot(cores, eficiencia_amdahl(f, cores, base), linestyle='--', alpha=0.6,
+                           label=f"Amdahl {fila_ajuste['experimento']} (f={f:.2f})")
+            ax_ef.legend(fontsize=8)
+        ax_ef.axhline(1.0, color='gray', linewidth=0.8)
+        ax_ef.set_title(f'Eficiencia paralela - {distribucion}, {megabytes:g} MB', fontsize=12)
+        ax_ef.set_xlabel('Cores', fontsize=10)
+        ax_ef.set_ylabel('Eficiencia (speedup / cores)', fontsize=10)
+        ax_ef.grid(linestyle=':', alpha=0.5)
+
+    plt.tight_layout()
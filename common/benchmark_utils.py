@@ -7,8 +7,6 @@ import psutil
 import threading
 from typing import Dict, Iterable, Optional
 
-import boto3
-
 STATUS_RE = re.compile(r"HTTP\s+Status\s+Code:\s*(\d{3})")
 
 def extract_status(message: str) -> Optional[str]:
@@ -27,6 +25,7 @@ class MetricsSampler:
         self._cpu = []
         self._rss = []
         self._read_bytes = []
+        self._read_chars = []
         self._write_bytes = []
 
     def _sample(self):
@@ -38,6 +37,8 @@ class MetricsSampler:
                 self._rss.append(mem)
                 io_counters = proc.io_counters()
                 self._read_bytes.append(io_counters.read_bytes)
+                # read_chars (Linux) incluye lo servido por el page cache; read_bytes, sólo el disco
+                self._read_chars.append(getattr(io_counters, "read_chars", 0))
                 self._write_bytes.append(io_counters.write_bytes)
             except Exception:
                 pass
@@ -56,11 +57,13 @@ class MetricsSampler:
 
     def summary(self) -> Dict:
         read_delta = self._read_bytes[-1] - self._read_bytes[0] if len(self._read_bytes) >= 2 else 0
+        chars_delta = self._read_chars[-1] - self._read_chars[0] if len(self._read_chars) >= 2 else 0
         write_delta = self._write_bytes[-1] - self._write_bytes[0] if len(self._write_bytes) >= 2 else 0
         return {
             "cpu_percent_avg": (sum(self._cpu)/len(self._cpu)) if self._cpu else 0.0,
             "rss_mb_max": max(self._rss) if self._rss else 0.0,
             "read_bytes": int(read_delta),
+            "read_chars": int(chars_delta),
             "write_bytes": int(write_delta),
             "samples": len(self._cpu),
         }
@@ -98,6 +101,8 @@ def iter_s3_json_objects(s3_uri: str):
     if not s3_uri.startswith("s3://"):
         raise ValueError("Se esperaba un s3://bucket/prefix")
 
+    import boto3  # diferido: sólo se necesita al leer desde S3
+
     _, rest = s3_uri.split("s3://", 1)
     bucket, *prefix_parts = rest.split("/", 1)
     prefix = prefix_parts[0] if prefix_parts else ""
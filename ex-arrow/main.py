@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# /// script
+# requires-python = ">=3.12"
+# dependencies = ["pyarrow>=16.0.0"]
+# ///
+"""
+Experimento PyArrow (lector JSON de Arrow + kernels de pyarrow.compute).
+
+La implementación vive en mineria_benchmark/engines; este script se mantiene
+como punto de entrada para run.sh/user_data.sh y equivale a:
+  python -m mineria_benchmark run --engine arrow --input /ruta/a/directorio_con_json
+
+Uso:
+  python3 main.py --input /ruta/a/directorio_con_json
+Salida estándar (para que user_data la capture):
+  Execution time: X.YYYYYY seconds
+  {'2': 123, '4': 45, '5': 6}
+"""
+
+import os
+import sys
+
+# En local el paquete está en la raíz del repo; en la EC2 run.sh lo sube junto a main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mineria_benchmark.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main(["run", "--engine", "arrow", *sys.argv[1:]])
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# /// script
+# requires-python = ">=3.12"
+# dependencies = ["numpy>=1.26"]
+# ///
+"""
+Experimento NumPy (búsqueda vectorizada del status sobre bytes mapeados en memoria).
+
+La implementación vive en mineria_benchmark/engines; este script se mantiene
+como punto de entrada para run.sh/user_data.sh y equivale a:
+  python -m mineria_benchmark run --engine numpy --input /ruta/a/directorio_con_json
+
+Uso:
+  python3 main.py --input /ruta/a/directorio_con_json
+Salida estándar (para que user_data la capture):
+  Execution time: X.YYYYYY seconds
+  {'2': 123, '4': 45, '5': 6}
+"""
+
+import os
+import sys
+
+# En local el paquete está en la raíz del repo; en la EC2 run.sh lo sube junto a main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mineria_benchmark.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    main(["run", "--engine", "numpy", *sys.argv[1:]])
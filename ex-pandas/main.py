@@ -1,73 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
 # /// script
 # requires-python = ">=3.12"
 # dependencies = []
 # ///
-from collections import defaultdict
-from typing import TypedDict
-import pandas as pd
-from typing import Dict, List, Any
-import multiprocessing
-import pathlib
-import re
-import time
+"""
+Experimento Pandas (un DataFrame por archivo con multiprocessing).
 
+La implementación vive en mineria_benchmark/engines; este script se mantiene
+como punto de entrada para run.sh/user_data.sh y equivale a:
+  python -m mineria_benchmark run --engine pandas --input /ruta/a/directorio_con_json
 
+Uso:
+  python3 main.py --input /ruta/a/directorio_con_json
+Salida estándar (para que user_data la capture):
+  Execution time: X.YYYYYY seconds
+  {'2': 123, '4': 45, '5': 6}
+"""
 
-class Result(TypedDict):
-    rate_2xx: float
-    rate_4xx: float
-    rate_5xx: float
+import os
+import sys
 
-def load_dataset_from_path(file_path: str, file_format: str = 'json') -> pd.DataFrame:
-    if file_format == 'json':
-        df = pd.read_json(file_path, lines = True)
-    else:
-        df = pd.read_parquet(file_path)
-    return df
-
-
-def map_function(line: str) -> str:
-    """Maps an error code from a single line of text, 
-    return a tuple with the first number of the error code"""
-
-    error_code = re.search(r"\b(\d{3})\b", line)[0][0] # type: ignore
-    return error_code
-
-
-def group_and_reduce_function(filepath: str, column: str = 'message') -> Dict[str, int]:
-    dataframe = load_dataset_from_path(filepath)
-    dataframe[column] = dataframe[column].map(map_function) # type: ignore
-    df = dataframe.groupby(column)[column].count().to_dict() # type: ignore
-
-    return df
-
-def merge_results(results: List[Dict[str, int]]) -> Dict[str, int]:
-
-    results_dict = defaultdict(list)
-    for result in results:
-        for key, value in result.items():
-            results_dict[key].append(value) 
-    return {key: sum(value) for key, value in results_dict.items()}
-    
-
-
-def main(directory: str):
-    start_time = time.perf_counter()
-    file_path = pathlib.Path(directory)
-    with multiprocessing.Pool() as pool:
-        results = pool.map(group_and_reduce_function, list(file_path.glob('*.json'))) # type: ignore
-    calculations = merge_results(results)
-    end_time = time.perf_counter()
-    elapsed_time = end_time - start_time
-
-    print(f"Execution time: {elapsed_time:.6f} seconds")
-    return calculations
+# En local el paquete está en la raíz del repo; en la EC2 run.sh lo sube junto a main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from mineria_benchmark.cli import main  # noqa: E402
 
 if __name__ == "__main__":
-    import argparse
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--input", type=str, help="Path to s3 bucket with all data")
-    args = parser.parse_args()
-
-    print(main(args.input))
\ No newline at end of file
+    main(["run", "--engine", "pandas", *sys.argv[1:]])
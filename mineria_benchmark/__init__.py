@@ -0,0 +1,17 @@
+"""
+mineria_benchmark: punto de entrada único del benchmark de Python Puro,
+Pandas, Polars, DuckDB y Spark sobre logs NDJSON.
+"""
+
+from .engines import BenchmarkError, available_engines, get_engine
+from .results import BenchmarkResult
+from .runner import run_engine, run_named_engine
+
+__all__ = [
+    "BenchmarkError",
+    "BenchmarkResult",
+    "available_engines",
+    "get_engine",
+    "run_engine",
+    "run_named_engine",
+]
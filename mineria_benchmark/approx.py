@@ -0,0 +1,267 @@
+"""
+Modo aproximado (--approx): tasas por bucket a partir de una muestra.
+
+Los dashboards necesitan las tasas 2xx/4xx/5xx (la columna `rate` de
+ex-polars y ex-duckdb), no los conteos exactos. En lugar de leer todo:
+1) cada archivo se parte en bloques de `block_size` bytes (un archivo pequeño
+   es un solo bloque; ver engines.base.Block);
+2) los bloques, en orden de archivo, se agrupan en `strata` estratos de bytes
+   parecidos (los nombres de archivo siguen el orden temporal, así que cada
+   estrato cubre un tramo de tiempo);
+3) por rondas, se sortean bloques sin reemplazo en cada estrato con
+   asignación proporcional y el motor los cuenta con engine.count_blocks();
+4) la tasa de cada bucket es un estimador de razón estratificado
+   (sum y / sum x, con y las líneas del bucket y x las líneas con status del
+   bloque) y su varianza se aproxima por linealización con corrección por
+   población finita;
+5) se detiene cuando el semiancho del intervalo de confianza de todas las
+   tasas baja de `target_error`, cuando la muestra llega a `max_fraction` de
+   los bytes (cada ronda se recorta antes de leer para no pasarse) o cuando
+   se leyeron todos los bloques (resultado exacto).
+
+TABLESAMPLE de DuckDB y sample() de Spark muestrean filas después de leer y
+parsear el JSON, así que no reducen los bytes leídos; el muestreo por bloques
+ocurre antes del lector y sí lo hace. Dentro de cada bloque, DuckDB y Spark
+cuentan con su propio lector (ver count_blocks() de cada motor).
+"""
+
+import math
+import os
+import random
+import time
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+from .defaults import DEFAULT_BLOCK_SIZE, DEFAULT_CONFIDENCE, DEFAULT_STRATA, DEFAULT_TARGET_ERROR
+from .engines import BUCKETS, BenchmarkError, Block, Engine, get_engine
+from .results import total_bytes
+from .runner import apply_worker_env
+
+# Bloques por estrato en la primera ronda (la varianza necesita al menos 2)
+MIN_PER_STRATUM = 2
+
+
+def plan_blocks(files: List[str], block_size: int = DEFAULT_BLOCK_SIZE) -> List[Block]:
+    """Bloques de a lo sumo `block_size` bytes que cubren todos los archivos no vacíos."""
+    blocks = []
+    for path in files:
+        size = os.path.getsize(path)
+        blocks.extend(Block(path, start, min(start + block_size, size)) for start in range(0, size, block_size))
+    return blocks
+
+
+def stratify(blocks: List[Block], strata: int = DEFAULT_STRATA) -> List[List[Block]]:
+    """Reparte los bloques, en orden, en hasta `strata` grupos contiguos de bytes parecidos."""
+    strata = max(1, min(strata, len(blocks)))
+    total = sum(b.size for b in blocks)
+    groups: List[List[Block]] = [[] for _ in range(strata)]
+    seen = 0
+    for block in blocks:
+        # Índice por el punto medio del bloque: los grupos quedan contiguos y no vacíos
+        index = min(strata - 1, int((seen + block.size / 2) * strata / total)) if total else 0
+        groups[index].append(block)
+        seen += block.size
+    return [g for g in groups if g]
+
+
+class StratifiedEstimator:
+    """Tasas por bucket con estimador de razón estratificado e intervalo de confianza."""
+
+    def __init__(self, population: List[int], confidence: float = DEFAULT_CONFIDENCE):
+        self.population = population  # bloques por estrato (N_h)
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.confidence = confidence
+        # Por estrato, una fila por bloque muestreado: conteo de cada bucket
+        self.samples: List[List[Dict[str, int]]] = [[] for _ in population]
+
+    def add(self, stratum: int, counts: Dict[str, int]) -> None:
+        self.samples[stratum].append({b: int(counts.get(b, 0)) for b in BUCKETS})
+
+    def _expand(self, values: List[List[float]]) -> float:
+        """Total estimado de una variable por bloque: sum_h N_h * media_h."""
+        return sum(n_h * sum(v) / len(v) for n_h, v in zip(self.population, values) if v)
+
+    def _variance(self, values: List[List[float]]) -> Optional[float]:
+        """Varianza del total estimado (None si falta muestra en algún estrato)."""
+        variance = 0.0
+        for n_h, v in zip(self.population, values):
+            if len(v) >= n_h:
+                continue  # estrato censado por completo
+            if len(v) < 2:
+                return None
+            mean = sum(v) / len(v)
+            s2 = sum((x - mean) ** 2 for x in v) / (len(v) - 1)
+            variance += n_h ** 2 * (1 - len(v) / n_h) * s2 / len(v)
+        return variance
+
+    def estimate(self) -> Dict:
+        lines = [[sum(row.values()) for row in rows] for rows in self.samples]
+        total = self._expand(lines)
+        counts, rates, intervals = {}, {}, {}
+        half_width: Optional[float] = 0.0
+        for b in BUCKETS:
+            bucket = [[row[b] for row in rows] for rows in self.samples]
+            counts[b] = self._expand(bucket)
+            rate = counts[b] / total if total else 0.0
+            # Linealización de la razón: residuos d = y - R x por bloque
+            residuals = [[y - rate * x for y, x in zip(ys, xs)] for ys, xs in zip(bucket, lines)]
+            variance = self._variance(residuals)
+            if variance is None or not total:
+                half = None
+            else:
+                half = self.z * math.sqrt(variance) / total
+            rates[b] = rate
+            intervals[b] = None if half is None else [max(0.0, rate - half), min(1.0, rate + half)]
+            half_width = None if half is None or half_width is None else max(half_width, half)
+        return {
+            "counts": {b: round(c) for b, c in counts.items()},
+            "total": round(total),
+            "rates": rates,
+            "ci": intervals,
+            "half_width": half_width,
+            "confidence": self.confidence,
+        }
+
+
+def _allocate(remaining: List[List[Block]], population: List[int], size: int,
+              sampled: List[int]) -> List[int]:
+    """Bloques a sortear por estrato en la ronda: proporcional a N_h, mínimo 2 por estrato."""
+    total = sum(population)
+    take = []
+    for h, n_h in enumerate(population):
+        want = max(math.ceil(size * n_h / total), MIN_PER_STRATUM - sampled[h])
+        take.append(min(len(remaining[h]), max(0, want)))
+    return take
+
+
+def _within_budget(batch: List[Tuple[int, Block]], budget: float) -> Tuple[List, List]:
+    """Parte la ronda en lo que entra en `budget` bytes y lo que no.
+
+    Se recorre alternando estratos (el primer bloque de cada uno, luego el
+    segundo...) para que un recorte no deje fuera a los últimos estratos.
+    """
+    position: Dict[int, int] = {}
+    order = []
+    for h, block in batch:
+        order.append((position.get(h, 0), h, block))
+        position[h] = position.get(h, 0) + 1
+    order.sort(key=lambda item: item[:2])
+    kept, used = [], 0
+    for i, (_pos, h, block) in enumerate(order):
+        if used + block.size > budget:
+            return kept, [(h, b) for _p, h, b in order[i:]]
+        kept.append((h, block))
+        used += block.size
+    return kept, []
+
+
+def approximate(engine: Engine, input_dir: str, target_error: float = DEFAULT_TARGET_ERROR,
+                confidence: float = DEFAULT_CONFIDENCE, block_size: int = DEFAULT_BLOCK_SIZE,
+                strata: int = DEFAULT_STRATA, max_fraction: float = 1.0,
+                seed: Optional[int] = None, log=None) -> Dict:
+    """Estima las tasas de `input_dir` muestreando bloques hasta alcanzar `target_error`."""
+    if not 0 < max_fraction <= 1:
+        raise BenchmarkError("--max-fraction debe estar en (0, 1]", 1)
+    t0 = time.perf_counter()
+    try:
+        engine.prepare(input_dir)
+        t1 = time.perf_counter()
+        blocks = plan_blocks(engine.files, block_size)
+        groups = stratify(blocks, strata)
+        population = [len(g) for g in groups]
+        rng = random.Random(seed)
+        remaining = [rng.sample(g, len(g)) for g in groups]  # orden de sorteo por estrato
+        estimator = StratifiedEstimator(population, confidence)
+        sampled = [0] * len(groups)
+        total_size = sum(b.size for b in blocks)
+        scanned = 0
+        rounds = 0
+        round_size = max(MIN_PER_STRATUM * len(groups), engine.workers or os.cpu_count() or 1)
+        while True:
+            take = _allocate(remaining, population, round_size, sampled)
+            batch = [(h, remaining[h].pop()) for h, n in enumerate(take) for _ in range(n)]
+            # El tope se aplica antes de leer: la ronda no puede pasarse de max_fraction
+            batch, over = _within_budget(batch, max_fraction * total_size - scanned)
+            for h, block in over:
+                remaining[h].append(block)  # vuelve al frente del sorteo del estrato
+            if not batch:
+                stopped = "max_fraction" if over else "exhausted"
+                break
+            try:
+                counts = engine.count_blocks([block for _h, block in batch])
+            except BenchmarkError:
+                raise
+            except Exception as e:
+                raise BenchmarkError(f"falló la ejecución: {e}") from e
+            for (h, block), block_counts in zip(batch, counts):
+                estimator.add(h, block_counts)
+                sampled[h] += 1
+                scanned += block.size
+            rounds += 1
+            estimate = estimator.estimate()
+            if log is not None:
+                log(rounds, scanned, estimate)
+            if not any(remaining):
+                stopped = "exhausted"
+                break
+            if estimate["half_width"] is not None and estimate["half_width"] <= target_error:
+                stopped = "target"
+                break
+            if scanned >= max_fraction * total_size:
+                stopped = "max_fraction"
+                break
+            # Duplicar la muestra acumulada: pocas rondas y error que baja ~1/sqrt(2) por ronda
+            round_size = sum(sampled)
+        t2 = time.perf_counter()
+    finally:
+        engine.teardown()
+
+    estimate = estimator.estimate()
+    return {
+        "engine": engine.name,
+        "input_dir": input_dir,
+        "mode": "approx",
+        "files": len(engine.files),
+        "bytes": total_bytes(engine.files),
+        "workers": engine.workers,
+        "wall_time_s": t2 - t0,
+        "prepare_s": t1 - t0,
+        "run_s": t2 - t1,
+        **estimate,
+        "target_error": target_error,
+        "stopped": stopped,
+        "rounds": rounds,
+        "blocks": len(blocks),
+        "blocks_sampled": sum(sampled),
+        "strata": len(groups),
+        "block_size": block_size,
+        "bytes_scanned": scanned,
+        "fraction_scanned": scanned / total_size if total_size else 0.0,
+        "seed": seed,
+        "timestamp": time.time(),
+    }
+
+
+def run_approx(name: str, input_dir: str, workers: Optional[int] = None, **kwargs) -> Dict:
+    """Atajo: resuelve el motor por nombre y estima sus tasas."""
+    if workers is not None:
+        apply_worker_env(workers)
+    return approximate(get_engine(name)(workers=workers), input_dir, **kwargs)
+
+
+def format_approx(record: Dict) -> str:
+    """Tasas con su intervalo, para stderr (stdout conserva el formato de output.log)."""
+    parts = []
+    for b in BUCKETS:
+        ci = record["ci"][b]
+        interval = f"[{ci[0]:.4f}, {ci[1]:.4f}]" if ci is not None else "[sin IC]"
+        parts.append(f"{b}xx {record['rates'][b]:.4f} {interval}")
+    return (f"[{record['engine']}] approx: {', '.join(parts)} ({record['confidence']:.0%}) | "
+            f"leídos {record['bytes_scanned'] / 1024**2:.1f} de {record['bytes'] / 1024**2:.1f} MB "
+            f"({record['fraction_scanned']:.1%}, {record['blocks_sampled']}/{record['blocks']} bloques, "
+            f"{record['rounds']} rondas, fin: {record['stopped']})")
+
+
+def to_log(record: Dict) -> str:
+    """Formato de output.log con los conteos estimados."""
+    return f"Execution time: {record['wall_time_s']:.6f} seconds\n{record['counts']}"
@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CLI unificada del benchmark.
+
+Uso:
+  python -m mineria_benchmark run --engine polars --input /ruta/a/directorio_con_json
+  python -m mineria_benchmark run --engine duckdb --input ... --format json
+  python -m mineria_benchmark run --engine spark --input ... --profile-startup
+  python -m mineria_benchmark run --engine python --input ... --profile ./perfiles
+  python -m mineria_benchmark run --engine polars --input ... --follow --emit-interval 5
+  python -m mineria_benchmark run --engine duckdb --input ... --approx --target-error 0.005
+  python -m mineria_benchmark run --engine numpy --input ... --io direct --cold-cache --format json
+  python -m mineria_benchmark startup --input ...   (todos los motores)
+  python -m mineria_benchmark verify                (todos los motores, dataset generado)
+  python -m mineria_benchmark matrix --engine polars --engine duckdb --workers 1,2,4,8
+  python -m mineria_benchmark memcap --input ... --limits 1,2,4,8
+  python -m mineria_benchmark serve --engine duckdb --port 8765
+  python -m mineria_benchmark loadtest --engine duckdb --input ... --concurrency 1,4,8
+  python -m mineria_benchmark compact --input ... --output-dir ... --shard-size 256M --benchmark
+  python -m mineria_benchmark shard --engine polars --input ... --local-workers 4 --shards 16
+  python -m mineria_benchmark worker --connect coordinador:8766   (en otro host)
+  python -m mineria_benchmark orchestrate --dataset 5k/10=/datos/5k --engine polars --cpus 0-3 --timeout 1800
+  python -m mineria_benchmark compare --engine polars --repeat 7        (falla con código 5 si hay regresiones)
+  python -m mineria_benchmark engines
+
+Salida estándar por defecto (para que user_data la capture):
+  Execution time: X.YYYYYY seconds
+  {'2': 123, '4': 45, '5': 6}
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from .datagen import DISTRIBUTIONS
+from .defaults import (
+    CACHE_MODES,
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_CONFIDENCE,
+    DEFAULT_DATA_DIR,
+    DEFAULT_LIMITS_GB,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_PORT,
+    DEFAULT_RANGE_SIZE,
+    DEFAULT_SHARD_SIZE,
+    DEFAULT_SLOW_FACTOR,
+    DEFAULT_STRATA,
+    DEFAULT_TARGET_ERROR,
+    GB,
+    IO_STRATEGIES,
+    PIN_MODES,
+    parse_size,
+)
+from .engines import BenchmarkError, available_engines, get_engine
+from .runner import run_named_engine
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    if args.verify:
+        # Ningún tiempo se registra si el motor no reproduce el histograma esperado
+        from .verify import require_verified
+        require_verified(args.engine)
+
+    if args.follow and args.approx:
+        raise BenchmarkError("--follow y --approx no se pueden combinar", 1)
+
+    if args.approx:
+        from .approx import format_approx, run_approx, to_log
+        record = run_approx(args.engine, args.input, workers=args.workers, target_error=args.target_error,
+                            confidence=args.confidence, block_size=args.block_size, strata=args.strata,
+                            max_fraction=args.max_fraction, seed=args.seed)
+        if args.format == "json":
+            print(json.dumps(record, indent=2))
+        else:
+            print(format_approx(record), file=sys.stderr)
+            print(to_log(record))
+        return 0
+
+    if args.follow:
+        from .follow import follow
+        follow(args.engine, args.input, emit_interval=args.emit_interval, window=args.window,
+               duration=args.duration, poll_interval=args.poll_interval, fmt=args.format,
+               workers=args.workers)
+        return 0
+
+    sampler = None
+    if args.metrics:
+        from common.benchmark_utils import MetricsSampler
+        sampler = MetricsSampler()
+
+    result = run_named_engine(args.engine, args.input, sampler=sampler, profile_dir=args.profile,
+                              workers=args.workers, memory_limit=args.memory_limit,
+                              spill_dir=args.spill_dir, io_strategy=args.io, cold_cache=args.cold_cache)
+    if result.io is not None and args.format != "json":
+        from .iopath import format_io
+        print(f"[{args.engine}] {format_io(result.io)}", file=sys.stderr)
+    if result.profile and args.format != "json":
+        print(f"[{args.engine}] perfil: {', '.join(result.profile)}", file=sys.stderr)
+
+    if args.profile_startup:
+        from .startup import format_startup, profile_startup
+        result.startup = profile_startup(args.engine, args.input, repeat=args.repeat)
+        if args.format != "json":
+            # stdout queda con el formato de output.log; el perfil va a stderr
+            print(format_startup(result.startup), file=sys.stderr)
+
+    if args.format == "json":
+        print(result.to_json())
+    else:
+        print(result.to_log())
+    return 0
+
+
+def cmd_startup(args: argparse.Namespace) -> int:
+    from .startup import format_startup, profile_startup
+
+    profiles = []
+    for name in args.engine or available_engines():
+        try:
+            profiles.append(profile_startup(name, args.input, repeat=args.repeat))
+        except RuntimeError as e:
+            print(f"[{name}] ERROR: {e}", file=sys.stderr)
+
+    if args.format == "json":
+        print(json.dumps(profiles, indent=2))
+    else:
+        print("\n".join(format_startup(p) for p in profiles))
+    return 0
+
+
+def cmd_verify(args: argparse.Namespace) -> int:
+    from .verify import EXIT_VERIFY_ERROR, format_report, verify_engines, verify_generated
+
+    engines = args.engine or available_engines()
+    if args.input:
+        report = verify_engines(engines, args.input)
+    else:
+        report = verify_generated(engines, seed=args.seed)
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(report))
+    return EXIT_VERIFY_ERROR if any(entry["ok"] is False for entry in report) else 0
+
+
+def cmd_matrix(args: argparse.Namespace) -> int:
+    from .matrix import default_workers, format_record, run_matrix
+
+    records = run_matrix(
+        engines=args.engine or available_engines(),
+        workers=args.workers or default_workers(),
+        distributions=args.distribution,
+        sizes_mb=args.total_mb,
+        files=args.files,
+        repeat=args.repeat,
+        data_dir=args.data_dir,
+        seed=args.seed,
+        timeout=args.timeout,
+        log=lambda record: print(format_record(record), file=sys.stderr),
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+    print(f"{len(records)} mediciones escritas en {args.out}")
+    return 0
+
+
+def cmd_memcap(args: argparse.Namespace) -> int:
+    from .memcap import format_record, run_memcap
+
+    records = run_memcap(
+        engines=args.engine or available_engines(),
+        input_dir=args.input,
+        limits=[int(gb * GB) for gb in args.limits],
+        workers=args.workers,
+        repeat=args.repeat,
+        timeout=args.timeout,
+        log=lambda record: print(format_record(record), file=sys.stderr),
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+    print(f"{len(records)} mediciones escritas en {args.out}")
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from .service import serve
+
+    serve(args.engine, port=args.port, socket_path=args.socket, workers=args.workers)
+    return 0
+
+
+def cmd_loadtest(args: argparse.Namespace) -> int:
+    from contextlib import nullcontext
+
+    from .service import cold_baseline, format_summary, load_test, spawned_service
+
+    # El servicio lanzado corre en la raíz del repo: las rutas viajan absolutas
+    inputs = [os.path.abspath(path) for path in args.input]
+    request = ({"query": "rollup", "inputs": inputs} if len(inputs) > 1
+               else {"query": "count", "input": inputs[0]})
+    summaries = []
+    service = (nullcontext(args.address) if args.address
+               else spawned_service(args.engine, workers=args.workers))
+    with service as address:
+        for concurrency in args.concurrency:
+            summary = load_test(address, request, concurrency, args.requests)
+            summaries.append(summary)
+            print(format_summary(summary), file=sys.stderr)
+    if args.cold:
+        for path in inputs:
+            summary = cold_baseline(args.engine, path, args.cold, workers=args.workers, timeout=args.timeout)
+            summaries.append(summary)
+            print(format_summary(summary), file=sys.stderr)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"engine": args.engine, "request": request, "results": summaries}, f, indent=2)
+    print(f"{len(summaries)} mediciones escritas en {args.out}")
+    return 0
+
+
+def cmd_compact(args: argparse.Namespace) -> int:
+    from .compact import compact, compare_layouts, format_index, format_record, format_summary, summarize_layouts
+
+    index = compact(args.input, args.output_dir, shard_size=args.shard_size, range_size=args.range_size)
+    print(f"{args.output_dir}: {format_index(index)}", file=sys.stderr)
+    if not args.benchmark:
+        return 0
+
+    records = compare_layouts(
+        engines=args.engine or available_engines(),
+        raw_dir=args.input,
+        compacted_dir=args.output_dir,
+        workers=args.workers,
+        repeat=args.repeat,
+        timeout=args.timeout,
+        log=lambda record: print(format_record(record), file=sys.stderr),
+    )
+    summary = summarize_layouts(records)
+    for entry in summary:
+        print(format_summary(entry), file=sys.stderr)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"raw": args.input, "compacted": args.output_dir, "summary": summary, "records": records},
+                  f, indent=2)
+    print(f"{len(records)} mediciones escritas en {args.out}")
+    return 0
+
+
+def cmd_shard(args: argparse.Namespace) -> int:
+    from .sharded import AUTHKEY_ENV, format_sharded, parse_address, run_sharded, to_log
+
+    authkey = args.authkey or os.environ.get(AUTHKEY_ENV)
+    record = run_sharded(
+        engine=args.engine,
+        input_dir=args.input,
+        manifest=args.manifest,
+        local_workers=args.local_workers,
+        shards=args.shards,
+        engine_workers=args.engine_workers,
+        transfer=args.transfer,
+        listen=parse_address(args.listen),
+        authkey=authkey.encode() if authkey else None,
+        max_attempts=args.max_attempts,
+        slow_factor=args.slow_factor,
+        shard_timeout=args.shard_timeout,
+        timeout=args.timeout,
+        log=lambda line: print(line, file=sys.stderr),
+    )
+    print(format_sharded(record), file=sys.stderr)
+    if args.format == "json":
+        print(json.dumps(record, indent=2))
+    else:
+        print(to_log(record))
+    return 0
+
+
+def cmd_worker(args: argparse.Namespace) -> int:
+    from .sharded import AUTHKEY_ENV, parse_address, serve_worker
+
+    authkey = args.authkey or os.environ.get(AUTHKEY_ENV)
+    if not authkey:
+        raise BenchmarkError(f"falta la authkey del coordinador (--authkey o {AUTHKEY_ENV})", 1)
+    serve_worker(parse_address(args.connect), authkey.encode(), root=args.root, transfer=args.transfer, scratch=args.scratch)
+    return 0
+
+
+def cmd_orchestrate(args: argparse.Namespace) -> int:
+    from .orchestrate import format_record, orchestrate, parse_cpus, parse_dataset
+
+    datasets = [parse_dataset(spec) for spec in args.dataset]
+    records = orchestrate(
+        engines=args.engine or available_engines(),
+        datasets=datasets,
+        results_dir=args.results_dir,
+        cpus=parse_cpus(args.cpus) if args.cpus else None,
+        pin=args.pin,
+        cache=args.cache,
+        workers=args.workers,
+        repeat=args.repeat,
+        timeout=args.timeout,
+        resume=args.resume,
+        log=lambda record: print(format_record(record), file=sys.stderr),
+    )
+    out = os.path.join(args.results_dir, "orchestrate.json")
+    os.makedirs(args.results_dir, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2)
+    print(f"{len(records)} mediciones escritas en {out}")
+    failed = [r for r in records if r["outcome"] != "ok"]
+    return 3 if failed else 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    from .orchestrate import parse_cpus
+    from .regression import EXIT_REGRESSION, failed, format_report, run_compare
+
+    engines = args.engine
+    if not engines:
+        engines = []
+        for name in available_engines():
+            try:
+                get_engine(name)
+            except ImportError:
+                continue  # librería no instalada: no entra a la suite por defecto
+            engines.append(name)
+    rows = run_compare(
+        engines=engines,
+        baseline_path=args.baseline,
+        distributions=args.distribution,
+        sizes_mb=args.total_mb,
+        files=args.files,
+        data_dir=args.data_dir,
+        seed=args.seed,
+        repeat=args.repeat,
+        alpha=args.alpha,
+        min_effect=args.min_effect,
+        update=args.update,
+        cpus=parse_cpus(args.cpus) if args.cpus else None,
+        workers=args.workers,
+        cache=args.cache,
+        timeout=args.timeout,
+        log=lambda record: print(f"[{record['engine']}] {record['dataset']} #{record['repeat']}: "
+                                 f"{record['outcome']}", file=sys.stderr) if args.verbose else None,
+        warn=lambda message: print(f"aviso: {message}", file=sys.stderr),
+    )
+    print(format_report(rows))
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    if args.update:
+        print(f"línea base actualizada en {args.baseline}", file=sys.stderr)
+    return EXIT_REGRESSION if failed(rows) else 0
+
+
+def _size(value: str) -> int:
+    try:
+        return parse_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v]
+
+
+def _str_list(value: str) -> List[str]:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def cmd_engines(args: argparse.Namespace) -> int:
+    for name in available_engines():
+        try:
+            caps = get_engine(name)().capabilities()
+        except ImportError as e:
+            print(f"{name}: no disponible ({e})")
+            continue
+        flags = ", ".join(k for k, v in vars(caps).items() if v) or "-"
+        print(f"{name}: {flags}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="mineria_benchmark", description=__doc__.split("\n\n")[0].strip())
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Ejecuta un motor sobre un directorio de NDJSON")
+    run.add_argument("--engine", required=True, choices=available_engines())
+    run.add_argument("--input", required=True, help="Directorio local con archivos .json (NDJSON)")
+    run.add_argument("--workers", type=int, help="Procesos/hilos del motor (por defecto, todos los cores)")
+    run.add_argument("--format", choices=("log", "json"), default="log",
+                     help="log: formato de output.log (por defecto); json: registro canónico")
+    run.add_argument("--metrics", action="store_true",
+                     help="Muestrea CPU/RSS/IO con MetricsSampler y los incluye en el resultado")
+    run.add_argument("--verify", action="store_true",
+                     help="Antes de medir, verifica el motor contra un dataset generado con conteos conocidos")
+    run.add_argument("--profile", nargs="?", const=".", metavar="DIR",
+                     help="Perfila la ruta caliente y escribe profile-<motor>.* en DIR (por defecto '.')")
+    run.add_argument("--profile-startup", action="store_true",
+                     help="Perfila el arranque del motor (-X importtime y latencia hasta el primer byte)")
+    run.add_argument("--repeat", type=int, default=3, help="Lanzamientos por medición de arranque")
+    run.add_argument("--memory-limit", type=_size, metavar="SIZE",
+                     help="Ajusta las opciones de memoria del motor a este techo (p. ej. 4G); "
+                          "para imponerlo sobre el proceso use el comando memcap")
+    run.add_argument("--spill-dir", help="Directorio para los volcados a disco del motor")
+    run.add_argument("--io", choices=IO_STRATEGIES,
+                     help="Ruta de lectura de los motores que leen desde Python (python, pandas, numpy): "
+                          "buffered, mmap + madvise, posix_fadvise o O_DIRECT")
+    run.add_argument("--cold-cache", action="store_true",
+                     help="Saca los archivos de entrada del page cache antes de medir (lectura en frío)")
+    run.add_argument("--follow", action="store_true",
+                     help="Sigue el directorio y cuenta sólo los bytes nuevos (python, polars)")
+    run.add_argument("--emit-interval", type=float, default=5.0, help="Segundos entre reportes de --follow")
+    run.add_argument("--window", type=float, default=60.0, help="Ventana deslizante de --follow en segundos")
+    run.add_argument("--duration", type=float, help="Termina --follow tras estos segundos (por defecto, Ctrl-C)")
+    run.add_argument("--poll-interval", type=float, default=0.5,
+                     help="Sondeo de --follow cuando no hay inotify")
+
+    run.add_argument("--approx", action="store_true",
+                     help="Estima las tasas con una muestra estratificada de bloques e intervalos de confianza")
+    run.add_argument("--target-error", type=float, default=DEFAULT_TARGET_ERROR,
+                     help="Semiancho máximo del intervalo de cada tasa para detener --approx")
+    run.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE, help="Nivel de confianza de --approx")
+    run.add_argument("--block-size", type=_size, default=DEFAULT_BLOCK_SIZE, metavar="SIZE",
+                     help="Tamaño de bloque de muestreo de --approx (por defecto 8M)")
+    run.add_argument("--strata", type=int, default=DEFAULT_STRATA, help="Estratos de --approx")
+    run.add_argument("--max-fraction", type=float, default=1.0,
+                     help="Fracción máxima de bytes a leer en --approx aunque no se alcance el error")
+    run.add_argument("--seed", type=int, help="Semilla del muestreo de --approx")
+    run.set_defaults(func=cmd_run)
+
+    startup = sub.add_parser("startup", help="Perfila el arranque de uno o varios motores")
+    startup.add_argument("--engine", action="append", choices=available_engines(),
+                         help="Motor a perfilar (repetible; por defecto todos)")
+    startup.add_argument("--input", help="Si se indica, el arranque incluye prepare() sobre este directorio")
+    startup.add_argument("--repeat", type=int, default=3)
+    startup.add_argument("--format", choices=("text", "json"), default="text")
+    startup.set_defaults(func=cmd_startup)
+
+    verify = sub.add_parser("verify", help="Verifica que los motores producen el mismo histograma")
+    verify.add_argument("--engine", action="append", choices=available_engines(),
+                        help="Motor a verificar (repetible; por defecto todos)")
+    verify.add_argument("--input", help="Directorio a verificar contra el oráculo (por defecto, dataset generado)")
+    verify.add_argument("--seed", type=int, default=0, help="Semilla del dataset generado")
+    verify.add_argument("--format", choices=("text", "json"), default="text")
+    verify.set_defaults(func=cmd_verify)
+
+    matrix = sub.add_parser("matrix", help="Barrido de escalamiento: workers x tamaños x distribuciones")
+    matrix.add_argument("--engine", action="append", choices=available_engines(),
+                        help="Motor a medir (repetible; por defecto todos)")
+    matrix.add_argument("--workers", type=_int_list,
+                        help="Lista de workers, p. ej. 1,2,4,8 (por defecto potencias de 2 hasta los cores)")
+    matrix.add_argument("--distribution", type=_str_list, default=["uniform"],
+                        help=f"Distribuciones de tamaño de archivo separadas por coma: {', '.join(DISTRIBUTIONS)}")
+    matrix.add_argument("--total-mb", type=_float_list, default=[64.0],
+                        help="Volúmenes totales en MB separados por coma")
+    matrix.add_argument("--files", type=int, default=64, help="Archivos por dataset")
+    matrix.add_argument("--repeat", type=int, default=3, help="Repeticiones por punto")
+    matrix.add_argument("--seed", type=int, default=0)
+    matrix.add_argument("--timeout", type=float, help="Límite en segundos por medición")
+    matrix.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Caché de datasets generados")
+    matrix.add_argument("--out", default=os.path.join("results", "matrix", "scaling.json"),
+                        help="Archivo JSON de salida")
+    matrix.set_defaults(func=cmd_matrix)
+
+    memcap = sub.add_parser("memcap", help="Mide cada motor bajo techos de memoria (cgroup o setrlimit)")
+    memcap.add_argument("--engine", action="append", choices=available_engines(),
+                        help="Motor a medir (repetible; por defecto todos)")
+    memcap.add_argument("--input", required=True, help="Directorio local con archivos .json (NDJSON)")
+    memcap.add_argument("--limits", type=_float_list, default=list(DEFAULT_LIMITS_GB),
+                        help="Techos en GB separados por coma (por defecto 1,2,4,8)")
+    memcap.add_argument("--workers", type=int)
+    memcap.add_argument("--repeat", type=int, default=1, help="Repeticiones por techo")
+    memcap.add_argument("--timeout", type=float, help="Límite en segundos por medición")
+    memcap.add_argument("--out", default=os.path.join("results", "memcap", "memcap.json"),
+                        help="Archivo JSON de salida")
+    memcap.set_defaults(func=cmd_memcap)
+
+    serve = sub.add_parser("serve", help="Mantiene un motor caliente y atiende consultas por HTTP")
+    serve.add_argument("--engine", required=True, choices=available_engines())
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help="Puerto en 127.0.0.1")
+    serve.add_argument("--socket", help="Socket Unix en lugar de TCP")
+    serve.add_argument("--workers", type=int)
+    serve.set_defaults(func=cmd_serve)
+
+    loadtest = sub.add_parser("loadtest", help="Latencia y consultas/s del servicio caliente frente a main.py")
+    loadtest.add_argument("--engine", required=True, choices=available_engines())
+    loadtest.add_argument("--input", action="append", required=True,
+                          help="Directorio a consultar (repetible: varios hacen una consulta rollup)")
+    loadtest.add_argument("--address", help="Servicio ya levantado (http://127.0.0.1:8765 o unix:///ruta); "
+                                            "por defecto se lanza uno")
+    loadtest.add_argument("--concurrency", type=_int_list, default=[1, 4, 8],
+                          help="Clientes concurrentes separados por coma")
+    loadtest.add_argument("--requests", type=int, default=50, help="Consultas por nivel de concurrencia")
+    loadtest.add_argument("--cold", type=int, default=5,
+                          help="Ejecuciones de ex-<motor>/main.py como referencia en frío (0 = omitir)")
+    loadtest.add_argument("--workers", type=int)
+    loadtest.add_argument("--timeout", type=float, help="Límite en segundos por ejecución en frío")
+    loadtest.add_argument("--out", default=os.path.join("results", "service", "loadtest.json"),
+                          help="Archivo JSON de salida")
+    loadtest.set_defaults(func=cmd_loadtest)
+
+    compact = sub.add_parser("compact", help="Compacta archivos pequeños en shards con índice de offsets")
+    compact.add_argument("--input", required=True, help="Directorio local con archivos .json (NDJSON)")
+    compact.add_argument("--output-dir", required=True, help="Directorio de los shards y su índice")
+    compact.add_argument("--shard-size", type=_size, default=DEFAULT_SHARD_SIZE, metavar="SIZE",
+                         help="Tamaño objetivo de cada shard (por defecto 256M)")
+    compact.add_argument("--range-size", type=_size, default=DEFAULT_RANGE_SIZE, metavar="SIZE",
+                         help="Distancia entre offsets del índice: rangos paralelos por shard (por defecto 32M)")
+    compact.add_argument("--benchmark", action="store_true",
+                         help="Después de compactar, mide cada motor sobre el layout original y el compactado")
+    compact.add_argument("--engine", action="append", choices=available_engines(),
+                         help="Motor a medir con --benchmark (repetible; por defecto todos)")
+    compact.add_argument("--workers", type=int, help="Workers por medición (por defecto, todos los cores)")
+    compact.add_argument("--repeat", type=int, default=3, help="Repeticiones por motor y layout")
+    compact.add_argument("--timeout", type=float, help="Límite en segundos por medición")
+    compact.add_argument("--out", default=os.path.join("results", "compact", "layouts.json"),
+                         help="Archivo JSON de salida de --benchmark")
+    compact.set_defaults(func=cmd_compact)
+
+    shard = sub.add_parser("shard", help="Reparte la entrada en shards entre workers y fusiona los histogramas")
+    shard.add_argument("--engine", required=True, choices=available_engines(), help="Motor de cada worker")
+    source = shard.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="Directorio con archivos .json (NDJSON), compactado o no")
+    source.add_argument("--manifest", help="Archivo con una ruta por línea (relativas a su directorio)")
+    shard.add_argument("--local-workers", type=int, default=2,
+                       help="Procesos worker locales (0: sólo workers remotos)")
+    shard.add_argument("--shards", type=int, help="Cantidad de shards (por defecto 4 por worker local)")
+    shard.add_argument("--engine-workers", type=int,
+                       help="Workers del motor dentro de cada worker (por defecto, cores / workers locales)")
+    shard.add_argument("--transfer", choices=["link", "copy"], default="link",
+                       help="link: sistema de archivos compartido; copy: descarga como de un object store")
+    shard.add_argument("--listen", default="127.0.0.1:0", metavar="HOST:PUERTO",
+                       help="Dirección del coordinador (puerto 0: cualquiera libre)")
+    shard.add_argument("--authkey", help="Clave compartida con los workers remotos")
+    shard.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                       help="Intentos por shard antes de abortar")
+    shard.add_argument("--slow-factor", type=float, default=DEFAULT_SLOW_FACTOR,
+                       help="Un shard que tarda estas veces lo esperado se despacha otra vez")
+    shard.add_argument("--shard-timeout", type=float, help="Segundos sin respuesta tras los que un worker se descarta")
+    shard.add_argument("--timeout", type=float, help="Límite en segundos de toda la ejecución")
+    shard.add_argument("--format", choices=["log", "json"], default="log", help="Formato de salida")
+    shard.set_defaults(func=cmd_shard)
+
+    worker = sub.add_parser("worker", help="Worker del modo shard: se conecta a un coordinador")
+    worker.add_argument("--connect", required=True, metavar="HOST:PUERTO", help="Dirección del coordinador")
+    worker.add_argument("--authkey", help="Clave del coordinador")
+    worker.add_argument("--root", help="Ruta local de la entrada del coordinador (otro punto de montaje)")
+    worker.add_argument("--transfer", choices=["link", "copy"], default="link",
+                        help="link: enlaza los archivos; copy: los copia antes de contar")
+    worker.add_argument("--scratch", help="Directorio de trabajo para los shards")
+    worker.set_defaults(func=cmd_worker)
+
+    orch = sub.add_parser("orchestrate", help="Corre la matriz motores x datasets en local, fijada a CPUs")
+    orch.add_argument("--dataset", action="append", required=True, metavar="GRUPO/TAMAÑO=DIR",
+                      help="Dataset y su lugar en results (repetible), p. ej. 5k/10=/datos/5k-10gb")
+    orch.add_argument("--engine", action="append", choices=available_engines(),
+                      help="Motor a medir (repetible; por defecto todos)")
+    orch.add_argument("--cpus", help="CPUs de cada medición, formato de taskset (por defecto todas las permitidas)")
+    orch.add_argument("--pin", choices=PIN_MODES, default="auto",
+                      help="cgroup cpuset, afinidad (taskset) o sin fijar; auto prueba cgroup y luego afinidad")
+    orch.add_argument("--cache", choices=CACHE_MODES, default="evict",
+                      help="Vaciado del page cache antes de cada medición (drop requiere root)")
+    orch.add_argument("--workers", type=int, help="Workers del motor (por defecto, una por CPU fijada)")
+    orch.add_argument("--repeat", type=int, default=1, help="Repeticiones por motor y dataset")
+    orch.add_argument("--timeout", type=float, help="Límite en segundos por medición")
+    orch.add_argument("--results-dir", default=os.path.join("results", "local"),
+                      help="Raíz de los resultados (estructura de procesar_logs_multi_formato)")
+    orch.add_argument("--resume", action="store_true", help="No vuelve a medir las celdas ya completas")
+    orch.set_defaults(func=cmd_orchestrate)
+
+    cmp_ = sub.add_parser("compare", help="Compara la suite con la línea base y falla ante regresiones")
+    cmp_.add_argument("--engine", action="append", choices=available_engines(),
+                      help="Motor a medir (repetible; por defecto los instalados)")
+    cmp_.add_argument("--baseline", default=os.path.join("results", "baseline", "baseline.json"),
+                      help="Archivo de la línea base")
+    cmp_.add_argument("--update", action="store_true",
+                      help="Graba las muestras medidas como nueva línea base (después de comparar)")
+    cmp_.add_argument("--repeat", type=int, default=5, help="Muestras por motor y dataset")
+    cmp_.add_argument("--alpha", type=float, default=0.05, help="Nivel de la prueba de Mann-Whitney")
+    cmp_.add_argument("--min-effect", type=float, default=0.05,
+                      help="Empeoramiento relativo mínimo de la mediana para contar como regresión")
+    cmp_.add_argument("--distribution", type=_str_list, default=["uniform"],
+                      help=f"Distribuciones de tamaño de archivo separadas por coma: {', '.join(DISTRIBUTIONS)}")
+    cmp_.add_argument("--total-mb", type=_float_list, default=[8.0], help="Volúmenes totales en MB separados por coma")
+    cmp_.add_argument("--files", type=int, default=32, help="Archivos por dataset")
+    cmp_.add_argument("--seed", type=int, default=0)
+    cmp_.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Caché de datasets generados")
+    cmp_.add_argument("--cpus", help="CPUs de cada medición, formato de taskset")
+    cmp_.add_argument("--workers", type=int)
+    cmp_.add_argument("--cache", choices=CACHE_MODES, default="none",
+                      help="Vaciado del page cache antes de cada medición (por defecto, caché caliente)")
+    cmp_.add_argument("--timeout", type=float, help="Límite en segundos por medición")
+    cmp_.add_argument("--out", help="Archivo JSON con el reporte completo")
+    cmp_.add_argument("--verbose", action="store_true", help="Muestra cada medición en stderr")
+    cmp_.set_defaults(func=cmd_compare)
+
+    engines = sub.add_parser("engines", help="Lista los motores y sus capacidades")
+    engines.set_defaults(func=cmd_engines)
+
+    return ap
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    try:
+        code = args.func(args)
+    except BenchmarkError as e:
+        print(f"[{getattr(args, 'engine', 'benchmark')}] ERROR: {e}", file=sys.stderr)
+        sys.exit(e.exit_code)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Compactación de directorios con muchos archivos pequeños (compact).
+
+Con tamaño total fijo, el número de archivos (5k, 10k, 20k) cambia el tiempo:
+cada motor paga por archivo la apertura, el glob, la inferencia de esquema o
+una tarea (y en los motores de Pool, un pickle por tarea). compact() concatena
+los .json de un directorio, en orden, en shards shard-NNNNN.json de
+`shard_size` bytes aproximados:
+- un archivo fuente nunca se parte entre shards (un shard cierra al pasar
+  `shard_size`), así que un fuente mayor que el objetivo queda en su propio shard;
+- a un fuente sin salto de línea final se le agrega uno, para que su última
+  línea no se pegue a la primera del siguiente; los archivos vacíos se omiten;
+- las líneas se copian sin tocar, inválidas incluidas: los conteos no cambian.
+
+El índice (engines.INDEX_FILE, JSON) guarda por shard su tamaño, sus líneas,
+los fuentes que contiene y offsets de inicio de línea cada ~`range_size`
+bytes. Engine.prepare() lo carga si coincide con los archivos: los motores de
+Pool reparten un rango por tarea y Spark usa range_size como
+maxPartitionBytes. DuckDB, Polars y Arrow ya parten un archivo grande en
+bloques paralelos con su propio lector.
+
+compare_layouts() mide cada motor sobre el directorio original y el compactado,
+cada medición en un proceso nuevo (ver matrix.run_point).
+"""
+
+import json
+import os
+import subprocess
+from typing import Dict, List, Optional
+
+from .defaults import DEFAULT_RANGE_SIZE, DEFAULT_SHARD_SIZE
+from .engines import INDEX_FILE, BenchmarkError, list_json_files, load_index
+from .engines.base import EXIT_INVALID_INPUT, EXIT_READ_ERROR
+from .matrix import run_point
+
+# Tamaño de las lecturas al copiar un fuente
+COPY_BUFFER = 1 << 20
+
+INDEX_VERSION = 1
+
+
+def shard_name(i: int) -> str:
+    return f"shard-{i:05d}.json"
+
+
+class ShardWriter:
+    """Escribe un shard y registra offsets de inicio de línea cada ~`range_size` bytes."""
+
+    def __init__(self, path: str, range_size: int):
+        self.path = path
+        self.range_size = range_size
+        self.file = open(path, "wb")
+        self.size = 0
+        self.lines = 0
+        self.offsets = [0]
+        self.sources: List[List] = []
+
+    def write(self, data: bytes) -> None:
+        # El corte es el primer inicio de línea en o después de offsets[-1] + range_size;
+        # si el salto de línea aún no llegó, se busca en el bloque siguiente
+        while True:
+            target = self.offsets[-1] + self.range_size
+            newline = data.find(b"\n", max(0, target - 1 - self.size))
+            if newline < 0:
+                break
+            self.offsets.append(self.size + newline + 1)
+        self.file.write(data)
+        self.size += len(data)
+        self.lines += data.count(b"\n")
+
+    def add_source(self, path: str) -> None:
+        """Copia un archivo fuente completo, terminado en salto de línea."""
+        start = self.size
+        last = b""
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(COPY_BUFFER)
+                if not data:
+                    break
+                self.write(data)
+                last = data[-1:]
+        if last != b"\n":
+            self.write(b"\n")
+        self.sources.append([os.path.basename(path), os.path.getsize(path), start])
+
+    def close(self) -> Dict:
+        self.file.close()
+        if self.offsets[-1] == self.size:
+            self.offsets.pop()  # corte justo al final: no abre un rango vacío
+        return {
+            "file": os.path.basename(self.path),
+            "bytes": self.size,
+            "lines": self.lines,
+            "offsets": self.offsets + [self.size],
+            "sources": self.sources,
+        }
+
+
+def _sources(input_dir: str) -> List[str]:
+    """Archivos .json no vacíos de `input_dir`, con las validaciones de Engine.prepare()."""
+    if not os.path.isdir(input_dir):
+        raise BenchmarkError(f"'{input_dir}' no es un directorio válido.", EXIT_INVALID_INPUT)
+    files = list_json_files(input_dir)
+    if not files:
+        raise BenchmarkError(f"no se encontraron archivos JSON en '{input_dir}'.", EXIT_READ_ERROR)
+    files = [f for f in files if os.path.getsize(f)]
+    if not files:
+        raise BenchmarkError(f"todos los archivos JSON en '{input_dir}' están vacíos.", EXIT_READ_ERROR)
+    return files
+
+
+def _reusable(index: Optional[Dict], sources: List[str], shard_size: int, range_size: int) -> bool:
+    """True si `index` ya compacta exactamente `sources` con los mismos tamaños objetivo."""
+    if index is None or index.get("version") != INDEX_VERSION:
+        return False
+    if (index["shard_size"], index["range_size"]) != (shard_size, range_size):
+        return False
+    compacted = [(name, size) for shard in index["shards"] for name, size, _start in shard["sources"]]
+    return compacted == [(os.path.basename(p), os.path.getsize(p)) for p in sources]
+
+
+def compact(input_dir: str, out_dir: str, shard_size: int = DEFAULT_SHARD_SIZE,
+            range_size: int = DEFAULT_RANGE_SIZE) -> Dict:
+    """Compacta los .json de `input_dir` en shards dentro de `out_dir` y devuelve el índice.
+
+    Si `out_dir` ya tiene una compactación vigente de la misma entrada, se
+    reutiliza (index["reused"] = True).
+    """
+    if shard_size <= 0 or range_size <= 0:
+        raise BenchmarkError("--shard-size y --range-size deben ser positivos", EXIT_INVALID_INPUT)
+    sources = _sources(input_dir)
+    if os.path.abspath(input_dir) == os.path.abspath(out_dir):
+        raise BenchmarkError("el directorio de salida debe ser distinto del de entrada", EXIT_INVALID_INPUT)
+
+    existing = list_json_files(out_dir) if os.path.isdir(out_dir) else []
+    if existing:
+        index = load_index(out_dir, existing)
+        if _reusable(index, sources, shard_size, range_size):
+            return {**index, "reused": True}
+        raise BenchmarkError(f"'{out_dir}' ya tiene archivos .json de otra compactación; "
+                             "use un directorio vacío", EXIT_INVALID_INPUT)
+    os.makedirs(out_dir, exist_ok=True)
+
+    shards = []
+    writer: Optional[ShardWriter] = None
+    for path in sources:
+        if writer is None:
+            writer = ShardWriter(os.path.join(out_dir, shard_name(len(shards))), range_size)
+        writer.add_source(path)
+        if writer.size >= shard_size:
+            shards.append(writer.close())
+            writer = None
+    if writer is not None:
+        shards.append(writer.close())
+
+    index = {
+        "version": INDEX_VERSION,
+        "source": os.path.abspath(input_dir),
+        "shard_size": shard_size,
+        "range_size": range_size,
+        "files": len(sources),
+        "bytes": sum(s["bytes"] for s in shards),
+        "lines": sum(s["lines"] for s in shards),
+        "shards": shards,
+    }
+    # El índice se escribe al final: su presencia marca una compactación completa
+    with open(os.path.join(out_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return {**index, "reused": False}
+
+
+def compare_layouts(engines: List[str], raw_dir: str, compacted_dir: str,
+                    workers: Optional[int] = None, repeat: int = 3,
+                    timeout: Optional[float] = None, log=None) -> List[Dict]:
+    """Mide cada motor sobre el layout original y el compactado; un registro por medición.
+
+    `ok` indica si los conteos coinciden con los de la primera medición del
+    motor sobre el layout original.
+    """
+    workers = workers or os.cpu_count() or 1
+    records = []
+    for engine in engines:
+        reference = None
+        for layout, path in (("raw", raw_dir), ("compacted", compacted_dir)):
+            for rep in range(repeat):
+                record = {"engine": engine, "layout": layout, "input_dir": path,
+                          "workers": workers, "repeat": rep}
+                try:
+                    result = run_point(engine, path, workers, timeout=timeout)
+                    if reference is None and layout == "raw":
+                        reference = result["counts"]
+                    record.update(
+                        files=result["files"],
+                        bytes=result["bytes"],
+                        wall_time_s=result["wall_time_s"],
+                        prepare_s=result["prepare_s"],
+                        run_s=result["run_s"],
+                        mb_per_s=result["mb_per_s"],
+                        counts=result["counts"],
+                        ok=reference is not None and result["counts"] == reference,
+                    )
+                except (RuntimeError, subprocess.TimeoutExpired) as e:
+                    record.update(wall_time_s=None, ok=False, error=str(e))
+                records.append(record)
+                if log is not None:
+                    log(record)
+    return records
+
+
+def summarize_layouts(records: List[Dict]) -> List[Dict]:
+    """Mediana de tiempo por motor y layout, y speedup del compactado frente al original."""
+    from statistics import median
+
+    summary = []
+    for engine in dict.fromkeys(r["engine"] for r in records):
+        times = {}
+        for layout in ("raw", "compacted"):
+            values = [r["wall_time_s"] for r in records
+                      if r["engine"] == engine and r["layout"] == layout and r.get("wall_time_s") is not None]
+            times[layout] = median(values) if values else None
+        speedup = times["raw"] / times["compacted"] if times["raw"] and times["compacted"] else None
+        summary.append({"engine": engine, "raw_s": times["raw"], "compacted_s": times["compacted"],
+                        "speedup": speedup})
+    return summary
+
+
+def format_index(index: Dict) -> str:
+    verb = "reutilizados" if index.get("reused") else "escritos"
+    ranges = sum(len(s["offsets"]) - 1 for s in index["shards"])
+    return (f"{index['files']} archivos -> {len(index['shards'])} shards {verb} "
+            f"({index['bytes'] / 1024**2:.1f} MB, {index['lines']} líneas, {ranges} rangos)")
+
+
+def format_record(record: Dict) -> str:
+    head = f"[{record['engine']}] {record['layout']} #{record['repeat']}"
+    if record.get("wall_time_s") is None:
+        return f"{head}: ERROR {record.get('error')}"
+    flag = "" if record["ok"] else "  (¡conteos distintos al layout original!)"
+    return (f"{head}: {record['files']} archivos {record['wall_time_s']:.3f}s "
+            f"{record['mb_per_s']:.1f} MB/s{flag}")
+
+
+def format_summary(entry: Dict) -> str:
+    if entry["speedup"] is None:
+        return f"[{entry['engine']}] sin mediciones completas en ambos layouts"
+    return (f"[{entry['engine']}] original {entry['raw_s']:.3f}s, compactado {entry['compacted_s']:.3f}s "
+            f"(x{entry['speedup']:.2f})")
@@ -0,0 +1,157 @@
+"""
+Generación local y reproducible de logs NDJSON con conteos conocidos.
+
+Replica el formato de generator.ipynb ({"message", "service", "timestamp"},
+un objeto por línea) pero con semilla fija, y devuelve los conteos esperados
+por bucket para usarlos como oráculo.
+
+Con edge_cases=True se mezclan casos que los motores deben tratar igual:
+- líneas que no son JSON, JSON truncado y líneas vacías (se descartan);
+- objetos que empiezan y terminan como uno válido pero no son JSON (coma
+  final, valor ausente) (se descartan);
+- "message" repetido con null al final (json.loads se queda con la última
+  clave: se descarta);
+- objetos sin "message" o con "message" null (se descartan);
+- mensajes con otros números de 3 dígitos (sólo cuenta el de "HTTP Status Code:");
+- status fuera de los buckets 2/4/5 (1xx, 3xx: no se reportan);
+- un archivo .json vacío, uno .json sin ninguna línea JSON y archivos no .json
+  en el directorio (deben ignorarse).
+
+file_sizes() reparte un total de líneas entre archivos según una distribución
+(uniforme, sesgada o de cola pesada) para los barridos de escalamiento.
+"""
+
+import json
+import os
+import random
+from typing import Dict, List, Optional, Sequence, Union
+
+from .engines import BUCKETS
+
+# Mismos valores que generator.ipynb
+STATUSES = [200, 201, 202, 203, 400, 401, 402, 403, 404, 500]
+SERVICES = ["training", "evaluation", "inference", "monitoring"]
+
+# Status fuera de los buckets reportados
+OTHER_STATUSES = [101, 301, 302, 304]
+
+BASE_TIMESTAMP = 1.760218583963927e9
+
+
+def _record(message: Optional[str], rng: random.Random, **extra) -> str:
+    event = {"message": message, "service": rng.choice(SERVICES),
+             "timestamp": BASE_TIMESTAMP + rng.randint(1, 300), **extra}
+    return json.dumps(event, separators=(",", ":"))
+
+
+def _edge_line(rng: random.Random, counts: Dict[str, int]) -> str:
+    """Devuelve una línea "difícil" y actualiza `counts` si debe contarse."""
+    kind = rng.randrange(12)
+    status = rng.choice(STATUSES)
+    if kind == 0:
+        return "not a json line " + str(status)
+    if kind == 1:
+        return _record(f"HTTP Status Code: {status}", rng)[:-7]  # JSON truncado
+    if kind == 2:
+        return ""
+    if kind == 3:
+        return _record(None, rng)
+    if kind == 4:
+        return json.dumps({"service": rng.choice(SERVICES), "timestamp": BASE_TIMESTAMP})
+    if kind == 5:
+        # números de 3 dígitos antes y después del status
+        counts[str(status)[0]] += 1
+        return _record(f"upstream 503 after 250 ms; HTTP Status Code: {status} (retry 123)", rng)
+    if kind == 6:
+        # números de 3 dígitos sin el prefijo: no cuenta
+        return _record(f"retry {rng.choice(STATUSES)} after {rng.randint(100, 999)} ms", rng)
+    if kind == 7:
+        return _record(f"HTTP Status Code: {rng.choice(OTHER_STATUSES)}", rng)
+    if kind == 9:
+        return _record(f"HTTP Status Code: {status}", rng)[:-1] + ",}"  # coma final
+    if kind == 10:
+        return _record(f"HTTP Status Code: {status}", rng)[:-1] + ',"x":}'  # valor ausente
+    if kind == 11:
+        # clave repetida: json.loads se queda con la última
+        return _record(f"HTTP Status Code: {status}", rng)[:-1] + ',"message":null}'
+    # status con espacios extra, también lo acepta el patrón
+    counts[str(status)[0]] += 1
+    return _record(f"HTTP  Status  Code:{status}", rng, latency_ms=rng.randint(100, 999))
+
+
+def estimate_line_bytes(seed: int = 0, sample: int = 1000) -> float:
+    """Bytes promedio por línea generada (incluye el salto de línea)."""
+    rng = random.Random(seed)
+    return sum(len(_record("HTTP Status Code: 200", rng)) + 1 for _ in range(sample)) / sample
+
+
+DISTRIBUTIONS = ("uniform", "skewed", "heavy-tail")
+
+
+def file_sizes(files: int, total_lines: int, distribution: str = "uniform",
+               seed: int = 0) -> List[int]:
+    """Reparte `total_lines` entre `files` archivos.
+
+    - uniform: todos del mismo tamaño.
+    - skewed: log-normal (sigma=1), unos pocos archivos varias veces mayores.
+    - heavy-tail: Pareto (alpha=1.2), un puñado de archivos concentra buena parte de los datos.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"distribución desconocida '{distribution}'. Disponibles: {DISTRIBUTIONS}")
+    if distribution == "uniform":
+        weights = [1.0] * files
+    else:
+        rng = random.Random(seed)
+        if distribution == "skewed":
+            weights = [rng.lognormvariate(0.0, 1.0) for _ in range(files)]
+        else:
+            weights = [rng.paretovariate(1.2) for _ in range(files)]
+
+    total_weight = sum(weights)
+    sizes = [int(total_lines * w / total_weight) for w in weights]
+    # El redondeo se reparte en los primeros archivos para que el total sea exacto
+    for i in range(total_lines - sum(sizes)):
+        sizes[i % files] += 1
+    return sizes
+
+
+def generate_dataset(
+    out_dir: str,
+    files: int = 8,
+    lines_per_file: Union[int, Sequence[int]] = 1000,
+    seed: int = 0,
+    edge_cases: bool = False,
+    edge_rate: float = 0.05,
+) -> Dict[str, int]:
+    """Escribe `files` archivos part-XXXXX.json en `out_dir` y devuelve los conteos esperados.
+
+    `lines_per_file` puede ser un entero o una lista con las líneas de cada archivo.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    counts = {b: 0 for b in BUCKETS}
+    sizes: List[int] = ([lines_per_file] * files if isinstance(lines_per_file, int)
+                        else list(lines_per_file))
+
+    for i, n_lines in enumerate(sizes):
+        lines = []
+        for _ in range(n_lines):
+            if edge_cases and rng.random() < edge_rate:
+                lines.append(_edge_line(rng, counts))
+                continue
+            status = rng.choice(STATUSES)
+            counts[str(status)[0]] += 1
+            lines.append(_record(f"HTTP Status Code: {status}", rng))
+        with open(os.path.join(out_dir, f"part-{i:05d}.json"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+
+    if edge_cases:
+        open(os.path.join(out_dir, "empty.json"), "w").close()
+        with open(os.path.join(out_dir, "not-ndjson.json"), "w", encoding="utf-8") as f:
+            f.write("service,timestamp,message\ntraining,1760218583.9,HTTP Status Code: 500\n")
+        with open(os.path.join(out_dir, "README.txt"), "w", encoding="utf-8") as f:
+            f.write('{"message":"HTTP Status Code: 500"}\n')  # no es .json: se ignora
+        with open(os.path.join(out_dir, "_SUCCESS"), "w", encoding="utf-8") as f:
+            f.write("")
+
+    return counts
@@ -0,0 +1,55 @@
+"""
+Valores por defecto y conversiones que la CLI necesita al construir el parser.
+
+Este módulo no importa nada fuera de la biblioteca estándar: ex-*/main.py
+corren con `uv run` sin más dependencias que la de su motor, así que el parser
+no debe importar los módulos de cada modo (memcap usa psutil, service levanta
+http.server, etc.); éstos se importan al ejecutar su comando.
+"""
+
+import os
+import re
+import tempfile
+
+GB = 1024**3
+
+# memcap: techos de memoria en GB
+DEFAULT_LIMITS_GB = (1.0, 2.0, 4.0, 8.0)
+
+# matrix: caché de datasets generados
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "mineria-benchmark-data")
+
+# serve/loadtest
+DEFAULT_PORT = 8765
+
+# run --approx
+DEFAULT_BLOCK_SIZE = 8 * 1024**2
+DEFAULT_STRATA = 8
+DEFAULT_TARGET_ERROR = 0.005
+DEFAULT_CONFIDENCE = 0.95
+
+# compact: tamaño objetivo de shard y de rango del índice
+DEFAULT_SHARD_SIZE = 256 * 1024**2
+DEFAULT_RANGE_SIZE = 32 * 1024**2
+
+# run --io: estrategias de lectura (ver iopath.py) y tamaño de cada lectura
+IO_STRATEGIES = ("buffered", "mmap", "fadvise", "direct")
+DEFAULT_IO_CHUNK = 8 * 1024**2
+
+# shard: re-despacho de shards fallidos (intentos) y lentos (veces lo esperado)
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_SLOW_FACTOR = 3.0
+
+# orchestrate: cómo se fijan las CPUs y cómo se vacía el page cache entre mediciones
+PIN_MODES = ("auto", "cgroup", "affinity", "none")
+CACHE_MODES = ("evict", "drop", "none")
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": GB, "T": 1024**4}
+
+
+def parse_size(value: str) -> int:
+    """'512M', '4G', '1.5GB' o bytes -> bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)I?B?\s*", value.upper())
+    if not match:
+        raise ValueError(f"tamaño inválido '{value}' (use p. ej. 512M o 4G)")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
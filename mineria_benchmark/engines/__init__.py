@@ -0,0 +1,75 @@
+"""
+Registro de motores.
+
+Los módulos de cada motor se importan sólo cuando se piden, para que ejecutar
+polars no pague la importación de pyspark, duckdb, etc.
+"""
+
+import importlib
+from typing import Dict, List
+
+from .base import (
+    BUCKETS,
+    INDEX_FILE,
+    STATUS_PATTERN,
+    BenchmarkError,
+    Block,
+    Capabilities,
+    Engine,
+    PoolEngine,
+    index_ranges,
+    list_json_files,
+    load_index,
+    merge_counts,
+    normalize_counts,
+    read_block,
+)
+
+# nombre -> "módulo:Clase" (relativo a este paquete)
+ENGINES: Dict[str, str] = {
+    "python": "python_engine:PythonEngine",
+    "pandas": "pandas_engine:PandasEngine",
+    "numpy": "numpy_engine:NumpyEngine",
+    "arrow": "arrow_engine:ArrowEngine",
+    "polars": "polars_engine:PolarsEngine",
+    "duckdb": "duckdb_engine:DuckDBEngine",
+    "spark": "spark_engine:SparkEngine",
+}
+
+
+def available_engines() -> List[str]:
+    return list(ENGINES)
+
+
+def get_engine(name: str) -> type:
+    """Importa y devuelve la clase del motor `name`."""
+    try:
+        target = ENGINES[name]
+    except KeyError:
+        raise BenchmarkError(
+            f"motor desconocido '{name}'. Disponibles: {', '.join(ENGINES)}", exit_code=1
+        ) from None
+    module_name, class_name = target.split(":")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    return getattr(module, class_name)
+
+
+__all__ = [
+    "BUCKETS",
+    "ENGINES",
+    "INDEX_FILE",
+    "STATUS_PATTERN",
+    "BenchmarkError",
+    "Block",
+    "Capabilities",
+    "Engine",
+    "PoolEngine",
+    "available_engines",
+    "get_engine",
+    "index_ranges",
+    "list_json_files",
+    "load_index",
+    "merge_counts",
+    "normalize_counts",
+    "read_block",
+]
@@ -0,0 +1,172 @@
+"""
+Motor de PyArrow (ex-arrow): lector JSON de Arrow + pyarrow.compute.
+
+Aísla cuánto de la ventaja de Polars/DuckDB viene del parser JSON y cuánto del
+motor de consultas: los archivos se leen con el lector NDJSON de Arrow
+(pyarrow.dataset sobre JsonFileFormat, esquema explícito con sólo "message")
+y el conteo se hace batch a batch con kernels de pyarrow.compute:
+  extract_regex -> utf8_slice_codeunits(0, 1) -> value_counts
+
+El lector de Arrow no sabe saltar líneas inválidas: si el escaneo falla, el
+motor reintenta archivo por archivo y sólo los archivos que fallan se leen
+línea a línea con json.loads antes de pasar por los mismos kernels. Los
+bloques en memoria de --approx siguen el mismo camino con pyarrow.json.read_json.
+
+Con --profile escribe profile-arrow-top.txt con el tiempo de lectura/parseo
+frente al de cómputo.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.json as pa_json
+
+from .base import (
+    EXIT_READ_ERROR,
+    STATUS_PATTERN,
+    BenchmarkError,
+    Capabilities,
+    Engine,
+)
+
+SCHEMA = pa.schema([pa.field("message", pa.string())])
+
+# Cada bloque es una tarea de parseo. Bloques de 1 MiB caben en caché; con 8 x 50 MB
+# (un hilo) 1 MiB tardó 1.16 s frente a 1.54 s con 4 MiB y 1.98 s con 8 MiB.
+BLOCK_SIZE = 1 << 20
+
+MIN_IO_THREADS = 2
+
+# extract_regex exige grupos con nombre
+_ARROW_STATUS_PATTERN = re.sub(r"\((?!\?)", "(?P<status>", STATUS_PATTERN, count=1)
+
+
+def parse_options() -> "pa_json.ParseOptions":
+    return pa_json.ParseOptions(explicit_schema=SCHEMA, unexpected_field_behavior="ignore")
+
+
+def json_format(block_size: int = BLOCK_SIZE, use_threads: bool = True) -> "ds.JsonFileFormat":
+    return ds.JsonFileFormat(
+        read_options=pa_json.ReadOptions(block_size=block_size, use_threads=use_threads),
+        parse_options=parse_options(),
+    )
+
+
+def bucket_counts(messages: "pa.Array") -> Dict[str, int]:
+    """Conteo {primer dígito: n} de una columna de mensajes."""
+    status = pc.struct_field(pc.extract_regex(messages, _ARROW_STATUS_PATTERN), [0])
+    buckets = pc.utf8_slice_codeunits(status, 0, 1).drop_null()
+    return {str(v["values"]): int(v["counts"]) for v in pc.value_counts(buckets).to_pylist()}
+
+
+def tolerant_messages(lines: Iterable[str]) -> "pa.Array":
+    """Parsea línea a línea; las líneas que no son objetos JSON dan null."""
+    messages = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        message = record.get("message") if isinstance(record, dict) else None
+        messages.append(message if isinstance(message, str) else None)
+    return pa.array(messages, type=pa.string())
+
+
+class ArrowEngine(Engine):
+    name = "arrow"
+    block_size = BLOCK_SIZE
+
+    def __init__(self, workers: Optional[int] = None):
+        super().__init__(workers)
+        self.format = None
+        self.use_threads = True
+        self.timings: Counter = Counter()
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities(parallel=True, streaming=True, profiler="arrow")
+
+    def start(self) -> None:
+        if self.format is not None:
+            return
+        if self.workers is not None:
+            pa.set_cpu_count(self.workers)
+            # El escaneo del dataset se bloquea con un solo hilo de IO (la lectura
+            # espera tareas encoladas en el mismo pool): el pool de IO nunca baja de 2
+            pa.set_io_thread_count(max(MIN_IO_THREADS, self.workers))
+        # Parsear por bloques dentro de un archivo no gana nada con un solo hilo de CPU
+        self.use_threads = pa.cpu_count() > 1
+        self.format = json_format(block_size=self.block_size, use_threads=self.use_threads)
+
+    def prepare(self, input_dir: str) -> None:
+        super().prepare(input_dir)
+        # Arrow no acepta archivos vacíos como JSON
+        self.files = [f for f in self.files if os.path.getsize(f)]
+
+    def run(self) -> Dict[str, int]:
+        try:
+            return self._count(ds.dataset(self.files, format=self.format, schema=SCHEMA))
+        except pa.ArrowInvalid as e:
+            print(f"[arrow] aviso: el lector JSON falló ({e}); se reintenta archivo por archivo",
+                  file=sys.stderr)
+            self.timings.clear()
+
+        counts: Counter = Counter()
+        for path in self.files:
+            try:
+                counts.update(self._count(ds.dataset(path, format=self.format, schema=SCHEMA)))
+            except pa.ArrowInvalid:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    counts.update(self._count_batches([tolerant_messages(f)]))
+            except OSError as e:
+                raise BenchmarkError(f"falló la lectura de {path}: {e}", EXIT_READ_ERROR) from e
+        return dict(counts)
+
+    def count_chunk(self, data: bytes) -> Dict[str, int]:
+        if not data:
+            return {}
+        try:
+            table = pa_json.read_json(
+                pa.BufferReader(data),
+                read_options=pa_json.ReadOptions(block_size=self.block_size, use_threads=self.use_threads),
+                parse_options=parse_options(),
+            )
+            return bucket_counts(table.column("message"))
+        except pa.ArrowInvalid:
+            return bucket_counts(tolerant_messages(data.decode("utf-8", errors="replace").splitlines()))
+
+    def _count(self, dataset: "ds.Dataset") -> Dict[str, int]:
+        batches = dataset.to_batches(columns=["message"], use_threads=self.use_threads)
+        return self._count_batches(batch.column(0) for batch in batches)
+
+    def _count_batches(self, columns: Iterable["pa.Array"]) -> Dict[str, int]:
+        """Consume los batches midiendo por separado lectura/parseo y cómputo."""
+        counts: Counter = Counter()
+        columns = iter(columns)
+        while True:
+            t0 = time.perf_counter()
+            column = next(columns, None)
+            t1 = time.perf_counter()
+            self.timings["read_parse"] += t1 - t0
+            if column is None:
+                return dict(counts)
+            counts.update(bucket_counts(column))
+            self.timings["compute"] += time.perf_counter() - t1
+            self.timings["batches"] += 1
+
+    def finish_profile(self) -> List[str]:
+        from ..profiling import profile_prefix, write_table
+
+        if self.profile_dir is None:
+            return []
+        rows = [[phase, f"{self.timings[phase]:.6f}"] for phase in ("read_parse", "compute")]
+        rows.append(["batches", self.timings["batches"]])
+        return [write_table(f"{profile_prefix(self.profile_dir, self.name)}-top.txt",
+                            ["phase", "seconds"], rows)]
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Interfaz común de los motores del benchmark.
+
+Cada motor (python, pandas, polars, duckdb, spark) implementa el mismo ciclo:
+- __init__(workers): número de procesos/hilos (None = todos los cores).
+- prepare(input_dir): valida la entrada y levanta los recursos del motor
+  con start() (Pool, conexión, SparkSession...). start() es idempotente: el
+  modo servicio (service.py) lo llama una vez y después prepare()/run() por
+  consulta, reutilizando los recursos hasta teardown().
+- run(): procesa los archivos y devuelve los conteos por bucket.
+- teardown(): libera los recursos.
+- capabilities(): describe qué soporta el motor.
+- start_profile(out_dir) / finish_profile(): perfilado opcional (--profile);
+  finish_profile() se llama después de teardown() y devuelve los archivos escritos.
+- count_chunk(data): conteos de un bloque de líneas completas, para --follow
+  (sólo los motores con capabilities().follow) y --approx.
+- count_blocks(blocks): conteos por rango de bytes de archivo (Block), para
+  --approx; por defecto lee cada bloque y llama a count_chunk().
+
+Los motores que leen desde Python (capabilities().io) pueden leer con una
+estrategia de iopath.py (use_io(), --io).
+
+Si el directorio fue compactado (compact.py), prepare() carga su índice de
+offsets (INDEX_FILE) y deja en `ranges` los rangos de líneas completas de cada
+shard, para que los motores que reparten un archivo por tarea los partan.
+
+Los errores se reportan con BenchmarkError, que lleva el código de salida que
+usaban los main.py originales (1: entrada inválida, 2: lectura, 3: ejecución).
+"""
+
+import glob
+import json
+import multiprocessing
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Patrón canónico para extraer el status HTTP del campo "message"
+STATUS_PATTERN = r"HTTP\s+Status\s+Code:\s*(\d{3})"
+
+# Buckets reportados por todos los motores (primer dígito del status)
+BUCKETS = ("2", "4", "5")
+
+EXIT_INVALID_INPUT = 1
+EXIT_READ_ERROR = 2
+EXIT_RUN_ERROR = 3
+
+# Índice de offsets de un directorio compactado; .txt para no leerlo como dato
+INDEX_FILE = "index.txt"
+
+
+class BenchmarkError(Exception):
+    """Error de un motor con el código de salida que debe devolver la CLI."""
+
+    def __init__(self, message: str, exit_code: int = EXIT_RUN_ERROR):
+        super().__init__(message)
+        self.exit_code = exit_code
+
+    def __reduce__(self):
+        # Un error lanzado en un worker del Pool vuelve al padre por pickle con su código
+        return type(self), (str(self), self.exit_code)
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """Características de un motor, usadas por la CLI para decidir qué ofrecer."""
+    parallel: bool = False      # usa varios cores
+    lazy: bool = False          # plan de ejecución perezoso
+    streaming: bool = False     # procesa sin cargar todo a memoria
+    sql: bool = False           # motor de consultas SQL
+    jvm: bool = False           # requiere levantar una JVM
+    profiler: str = ""          # tipo de perfil de --profile (cprofile, polars, duckdb, spark)
+    follow: bool = False        # procesa incrementalmente bytes agregados (--follow)
+    io: bool = False            # lee los archivos desde Python con una estrategia de iopath (--io)
+
+
+def list_json_files(input_dir: str) -> List[str]:
+    """Lista (ordenados) los archivos .json de un directorio."""
+    return sorted(glob.glob(os.path.join(input_dir, "*.json")))
+
+
+class Block(NamedTuple):
+    """Rango de bytes [start, end) de un archivo NDJSON.
+
+    Un bloque es dueño de las líneas cuyo primer byte cae en el rango, así que
+    bloques contiguos cubren cada línea exactamente una vez.
+    """
+    path: str
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+def read_block(block: Block) -> bytes:
+    """Líneas completas de las que `block` es dueño."""
+    with open(block.path, "rb") as f:
+        if block.start > 0:
+            # La línea que empezó antes del bloque pertenece al anterior
+            f.seek(block.start - 1)
+            f.readline()
+        begin = f.tell()
+        if begin >= block.end:
+            return b""
+        data = f.read(block.end - begin)
+        if data and not data.endswith(b"\n"):
+            data += f.readline()
+    return data
+
+
+def count_block(count_chunk: Callable[[bytes], Dict[str, int]], block: Block) -> Dict[str, int]:
+    """Tarea de Pool: lee un bloque en el worker y lo cuenta con `count_chunk`."""
+    return dict(count_chunk(read_block(block)))
+
+
+def merge_counts(results: List[Dict[str, int]]) -> Dict[str, int]:
+    """Suma histogramas parciales {bucket: n}."""
+    merged: Counter = Counter()
+    for result in results:
+        merged.update(result)
+    return dict(merged)
+
+
+def load_index(input_dir: str, files: List[str]) -> Optional[Dict]:
+    """Índice de `input_dir` si describe exactamente `files`; None si no hay o no coincide."""
+    try:
+        with open(os.path.join(input_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        shards = {os.path.join(input_dir, shard["file"]): shard["bytes"] for shard in index["shards"]}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[benchmark] aviso: se ignora {INDEX_FILE} ilegible ({e})", file=sys.stderr)
+        return None
+    # Un shard reescrito o agregado a mano invalida los offsets
+    if sorted(shards) != files or any(os.path.getsize(path) != size for path, size in shards.items()):
+        print(f"[benchmark] aviso: {INDEX_FILE} no coincide con los archivos de '{input_dir}'; se ignora",
+              file=sys.stderr)
+        return None
+    return index
+
+
+def index_ranges(input_dir: str, index: Dict) -> List[Block]:
+    """Bloques [offset_i, offset_i+1) de cada shard; los offsets caen en inicios de línea."""
+    ranges = []
+    for shard in index["shards"]:
+        path = os.path.join(input_dir, shard["file"])
+        offsets = shard["offsets"]
+        ranges.extend(Block(path, start, end) for start, end in zip(offsets, offsets[1:]))
+    return ranges
+
+
+def normalize_counts(counts: Dict[str, int]) -> Dict[str, int]:
+    """Lleva cualquier conteo por bucket al formato {'2': n, '4': n, '5': n}."""
+    buckets = {b: 0 for b in BUCKETS}
+    for key, value in counts.items():
+        b = str(key)
+        if b in buckets:
+            buckets[b] += int(value)
+    return buckets
+
+
+class Engine:
+    """Clase base de los motores. Las subclases implementan run()."""
+
+    name = "base"
+
+    def __init__(self, workers: Optional[int] = None):
+        # Procesos/hilos a usar; None = lo que el motor use por defecto (todos los cores)
+        self.workers = workers
+        self.input_dir: Optional[str] = None
+        self.pattern: Optional[str] = None
+        self.files: List[str] = []
+        self.profile_dir: Optional[str] = None
+        # Techo de memoria en bytes y directorio para volcar a disco (ver memcap.py)
+        self.memory_limit: Optional[int] = None
+        self.spill_dir: Optional[str] = None
+        # Bytes volcados a disco según el propio motor; None = medir spill_dir desde fuera
+        self.spilled_bytes: Optional[int] = None
+        # Índice de un directorio compactado y sus rangos (ver compact.py)
+        self.index: Optional[Dict] = None
+        self.ranges: List[Block] = []
+        # Estrategia de lectura (iopath.py) y sus estadísticas tras run()
+        self.io_strategy: Optional[str] = None
+        self.io_stats: Optional[Dict] = None
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities()
+
+    def prepare(self, input_dir: str) -> None:
+        """Valida el directorio de entrada, resuelve la lista de archivos y llama a start()."""
+        if not os.path.isdir(input_dir):
+            raise BenchmarkError(f"'{input_dir}' no es un directorio válido.", EXIT_INVALID_INPUT)
+
+        self.input_dir = input_dir
+        self.pattern = os.path.join(input_dir, "*.json")
+        self.files = list_json_files(input_dir)
+        if not self.files:
+            raise BenchmarkError(f"no se encontraron archivos JSON en '{self.pattern}'.", EXIT_READ_ERROR)
+        if not any(os.path.getsize(f) for f in self.files):
+            raise BenchmarkError(f"todos los archivos JSON en '{self.pattern}' están vacíos.", EXIT_READ_ERROR)
+        self.index = load_index(input_dir, self.files)
+        self.ranges = index_ranges(input_dir, self.index) if self.index is not None else []
+        self.start()
+
+    def start(self) -> None:
+        """Levanta los recursos del motor si aún no existen (no depende de la entrada)."""
+
+    def run(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def count_chunk(self, data: bytes) -> Dict[str, int]:
+        """Conteos por bucket de un bloque de líneas NDJSON completas (--follow, --approx)."""
+        raise NotImplementedError
+
+    def count_blocks(self, blocks: List[Block]) -> List[Dict[str, int]]:
+        """Conteos de cada bloque, en el mismo orden (modo --approx)."""
+        return [self.count_chunk(read_block(block)) for block in blocks]
+
+    def teardown(self) -> None:
+        pass
+
+    def start_profile(self, out_dir: str) -> None:
+        """Activa el perfilado; se llama antes de prepare()."""
+        self.profile_dir = out_dir
+
+    def finish_profile(self) -> List[str]:
+        return []
+
+    def limit_memory(self, limit: int, spill_dir: Optional[str] = None) -> None:
+        """Ajusta el motor a un techo de memoria (bytes); se llama antes de prepare().
+
+        Los motores sin opciones de memoria propias sólo quedan acotados por el
+        límite que impone memcap sobre el proceso.
+        """
+        self.memory_limit = limit
+        self.spill_dir = spill_dir
+
+    def use_io(self, strategy: str) -> None:
+        """Lee los archivos con `strategy` (ver iopath.py); se llama antes de prepare()."""
+        from ..iopath import check_strategy
+
+        if not self.capabilities().io:
+            raise BenchmarkError(f"{self.name} lee los archivos con su propio lector; --io sólo aplica a "
+                                 "los motores que leen desde Python", EXIT_INVALID_INPUT)
+        check_strategy(strategy)
+        self.io_strategy = strategy
+
+
+class PoolEngine(Engine):
+    """Motor que reparte un archivo por tarea en un multiprocessing.Pool.
+
+    En un directorio compactado reparte en cambio un rango del índice por
+    tarea (count_block con chunk_task): un shard de cientos de MB en una sola
+    tarea dejaría a los demás workers sin trabajo. Con use_io(), cada archivo
+    o rango se lee con la estrategia elegida (iopath.count_range).
+
+    Las subclases definen task (función a nivel de módulo, para que sea
+    serializable), merge (fusión de los resultados parciales) y chunk_task
+    (conteo de un bloque de bytes: --follow lo usa en el proceso principal y
+    --approx reparte los bloques muestreados en el Pool).
+    """
+
+    task = None
+    merge = None
+    chunk_task = None
+
+    def __init__(self, workers: Optional[int] = None):
+        super().__init__(workers)
+        self.pool = None
+        self.profiler = None
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities(parallel=True, profiler="cprofile", io=True)
+
+    def start(self) -> None:
+        if self.pool is None:
+            kwargs = self.profiler.pool_kwargs() if self.profiler is not None else {}
+            self.pool = multiprocessing.Pool(processes=self.workers, **kwargs)
+
+    def run(self) -> Dict[str, int]:
+        if self.io_strategy is not None:
+            return self._run_io()
+        if self.ranges:
+            return merge_counts(self.pool.map(partial(count_block, self.chunk_task), self.ranges))
+        results = self.pool.map(self.task, self.files)
+        return dict(self.merge(results))
+
+    def _run_io(self) -> Dict[str, int]:
+        from ..iopath import count_range, merge_io_stats
+
+        # Los rangos del índice y los archivos completos empiezan en inicio de línea
+        blocks = self.ranges or [Block(path, 0, os.path.getsize(path)) for path in self.files]
+        results = self.pool.map(partial(count_range, self.chunk_task, self.io_strategy), blocks)
+        self.io_stats = merge_io_stats(self.io_strategy, [stats for _counts, stats in results])
+        return merge_counts([counts for counts, _stats in results])
+
+    def count_chunk(self, data: bytes) -> Dict[str, int]:
+        return dict(self.chunk_task(data))
+
+    def count_blocks(self, blocks: List[Block]) -> List[Dict[str, int]]:
+        return self.pool.map(partial(count_block, self.chunk_task), blocks)
+
+    def teardown(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def start_profile(self, out_dir: str) -> None:
+        from ..profiling import PoolProfiler
+
+        super().start_profile(out_dir)
+        self.profiler = PoolProfiler(out_dir, self.name)
+        self.profiler.start()
+
+    def finish_profile(self) -> List[str]:
+        if self.profiler is None:
+            return []
+        return self.profiler.stop()
@@ -0,0 +1,195 @@
+"""
+Motor de DuckDB (ex-duckdb): consulta SQL vectorizada sobre NDJSON.
+
+Las líneas se leen como texto y se parsean con las funciones JSON de DuckDB
+(ver counts_query): read_json_auto acepta JSON que json.loads rechaza (comas
+finales) y se queda con la primera clave repetida, así que no coincidía con el
+oráculo.
+
+En --approx, los bloques que son archivos completos se cuentan en una sola
+lectura agrupada por archivo; los rangos parciales se pasan como texto.
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+import duckdb
+
+from .base import (
+    EXIT_READ_ERROR,
+    STATUS_PATTERN,
+    BenchmarkError,
+    Block,
+    Capabilities,
+    Engine,
+    read_block,
+)
+
+# El patrón va como literal SQL: DuckDB no interpreta los '\' dentro de '...'
+_SQL_STATUS_PATTERN = STATUS_PATTERN.replace("'", "''")
+
+# memory_limit sólo cubre el buffer manager; el resto queda para el proceso
+MEMORY_SHARE = 0.8
+
+
+# Coma antes de '}' o ']' fuera de un string: las funciones JSON de DuckDB la aceptan,
+# json.loads no. El primer patrón es un filtro barato; el segundo salta los strings
+_TRAILING_COMMA_HINT = r",\s*[}\]]"
+_TRAILING_COMMA = r'^(?:[^"]|"(?:[^"\\]|\\.)*")*,\s*[}\]]'
+# Valor de la última clave "message" (json.loads se queda con la última; ->'$.message', con la primera)
+_LAST_MESSAGE = "list_filter(list_zip(json_keys(line), json_extract(line, '$.*')), p -> p[1] = 'message')[-1][2]"
+
+
+def lines_source(source: str, filename: bool = False) -> str:
+    """Relación con una columna `line` por línea de los archivos de `source`.
+
+    read_csv con un delimitador de control es el lector de líneas más rápido de
+    DuckDB (read_json_auto tarda 20 veces más). Un byte de control sin escapar no
+    puede aparecer en un JSON válido, así que las filas que se parten en más
+    columnas se pueden descartar (ignore_errors).
+    """
+    return (f"read_csv({source}, columns={{'line': 'VARCHAR'}}, header=false, delim=chr(1), "
+            f"quote='', escape='', new_line='\\n', auto_detect=false, ignore_errors=true, "
+            f"filename={str(filename).lower()})")
+
+
+def counts_query(lines: str, group: str = "") -> str:
+    """
+    Conteo por bucket de una relación `lines` con una columna `line` de texto,
+    con la semántica de json.loads del oráculo:
+    1) sólo líneas JSON válidas para json.loads (json_valid más el rechazo de
+       comas finales, que DuckDB tolera)
+    2) "message" es el valor de la última clave con ese nombre y cuenta sólo si
+       es texto
+    3) extrae el código HTTP con regexp_extract y toma el primer dígito como
+       bucket
+    `group` agrega columnas de `lines` al GROUP BY (p. ej. "filename, ").
+    """
+    return f"""
+    SELECT {group}substr(status3, 1, 1) AS bucket, COUNT(*) AS count
+    FROM (
+      SELECT {group}regexp_extract(message, '{_SQL_STATUS_PATTERN}', 1) AS status3
+      FROM (
+        SELECT {group}CASE
+          WHEN NOT json_valid(line)
+               OR (regexp_matches(line, '{_TRAILING_COMMA_HINT}') AND regexp_matches(line, '{_TRAILING_COMMA}'))
+            THEN NULL
+          WHEN line LIKE '%"message"%"message"%' AND len(list_filter(json_keys(line), k -> k = 'message')) > 1
+            THEN CASE WHEN json_type({_LAST_MESSAGE}) = 'VARCHAR' THEN {_LAST_MESSAGE} ->> '$' END
+          WHEN json_type(line, '$.message') = 'VARCHAR'
+            THEN json_extract_string(line, '$.message')
+        END AS message
+        FROM {lines}
+      )
+    )
+    WHERE status3 <> ''
+    GROUP BY ALL
+    """
+
+
+def build_query(source: str) -> str:
+    """
+    Consulta del benchmark: conteos y tasas por bucket de los archivos de
+    `source`, una expresión SQL que read_csv acepta ('patrón' o ['a', 'b']).
+    """
+    return f"""
+    SELECT bucket, count, count * 1.0 / NULLIF(SUM(count) OVER(), 0) AS rate
+    FROM ({counts_query(lines_source(source))})
+    ORDER BY bucket;
+    """
+
+
+def per_file_query(source: str) -> str:
+    """Conteos por (archivo, bucket) en una sola lectura (--approx)."""
+    return counts_query(lines_source(source, filename=True), group="filename, ") + ";"
+
+
+# Bloque en memoria: se parte en líneas dentro de DuckDB (10x más rápido que pasar
+# una lista de Python)
+CHUNK_QUERY = counts_query("(SELECT unnest(string_split(?, chr(10))) AS line)") + ";"
+
+
+def sql_literal(path: str) -> str:
+    return "'" + path.replace("'", "''") + "'"
+
+
+class DuckDBEngine(Engine):
+    name = "duckdb"
+
+    def __init__(self, workers: Optional[int] = None):
+        super().__init__(workers)
+        self.con = None
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities(parallel=True, streaming=True, sql=True, profiler="duckdb")
+
+    def start(self) -> None:
+        if self.con is not None:
+            return
+        self.con = duckdb.connect(database=":memory:")
+        if self.workers is not None:
+            self.con.execute(f"SET threads = {int(self.workers)}")
+        if self.memory_limit is not None:
+            self.con.execute(f"SET memory_limit = '{int(self.memory_limit * MEMORY_SHARE) // 2**20}MB'")
+        if self.spill_dir is not None:
+            self.con.execute(f"SET temp_directory = {sql_literal(self.spill_dir)}")
+        if self.profile_dir is not None:
+            # La consulta del benchmark escribe su propio perfil (equivalente a EXPLAIN ANALYZE)
+            self.con.execute("SET enable_profiling = 'json'")
+            self.con.execute(f"SET profiling_output = {sql_literal(self._profile_json())}")
+
+    def run(self) -> Dict[str, int]:
+        try:
+            rows = self.con.execute(build_query(sql_literal(self.pattern))).fetchall()
+        except duckdb.IOException as e:
+            # Suele ocurrir si no hay archivos .json
+            raise BenchmarkError(f"falló la lectura de JSON ({self.pattern}): {e}", EXIT_READ_ERROR) from e
+        return {str(bucket): int(count) for bucket, count, _rate in rows}
+
+    def count_chunk(self, data: bytes) -> Dict[str, int]:
+        rows = self.con.execute(CHUNK_QUERY, [data.decode("utf-8", errors="replace")]).fetchall()
+        return {str(bucket): int(count) for bucket, count in rows}
+
+    def count_blocks(self, blocks: List[Block]) -> List[Dict[str, int]]:
+        whole = {b for b in blocks if b.start == 0 and b.end == os.path.getsize(b.path)}
+        by_file = self._count_files(sorted(b.path for b in whole)) if whole else {}
+        return [dict(by_file[b.path]) if b in whole and b.path in by_file else self.count_chunk(read_block(b))
+                for b in blocks]
+
+    def _count_files(self, paths: List[str]) -> Dict[str, Counter]:
+        by_file: Dict[str, Counter] = {path: Counter() for path in paths}
+        source = "[" + ", ".join(sql_literal(path) for path in paths) + "]"
+        try:
+            rows = self.con.execute(per_file_query(source)).fetchall()
+        except duckdb.Error:
+            # p. ej. ningún archivo de la muestra tiene "message" de texto: bloque a bloque
+            return {}
+        for filename, bucket, count in rows:
+            by_file[filename][str(bucket)] += int(count)
+        return by_file
+
+    def teardown(self) -> None:
+        if self.con is not None:
+            self.con.close()
+            self.con = None
+
+    def _profile_json(self) -> str:
+        from ..profiling import profile_prefix
+
+        return f"{profile_prefix(self.profile_dir, self.name)}.json"
+
+    def finish_profile(self) -> List[str]:
+        from ..profiling import duckdb_operators, write_table
+
+        json_path = self._profile_json()
+        if not os.path.exists(json_path):
+            return []
+        with open(json_path, "r", encoding="utf-8") as f:
+            tree = json.load(f)
+        operators = sorted(duckdb_operators(tree), key=lambda op: op[2], reverse=True)
+        rows = [[name, f"{seconds:.6f}", cardinality, depth] for depth, name, seconds, cardinality in operators]
+        top_path = write_table(json_path[:-len(".json")] + "-top.txt",
+                               ["operator", "seconds", "rows", "depth"], rows)
+        return [json_path, top_path]
@@ -0,0 +1,179 @@
+"""
+Motor de NumPy (ex-numpy): búsqueda vectorizada del marcador sobre bytes.
+
+Cada worker del Pool mapea un archivo en memoria (np.memmap) y, sin
+decodificar texto ni parsear JSON:
+1) localiza las posiciones de b"HTTP Status Code: " con comparaciones
+   vectorizadas byte a byte sobre los candidatos;
+2) toma los 3 dígitos siguientes con un único fancy-index;
+3) cuenta el primer dígito con np.bincount.
+
+Para respetar la semántica del benchmark (sólo cuentan objetos JSON cuyo
+"message" tiene status), la vía vectorizada sólo acepta líneas con la forma
+canónica {"message":"HTTP Status Code: NNN", ... }. Que una línea empiece y
+termine así no prueba que sea JSON válido ({"message":"...",} no lo es), así
+que otras búsquedas vectorizadas de bytes marcan como sospechosas las líneas
+con un separador sin valor (",}", ",]", ",,", ":}", ":,", con o sin un
+espacio en medio), una segunda clave "message", bytes no ASCII o de control,
+o escapes. Esas líneas salen de la vía vectorizada y, junto con las demás que
+contienen "HTTP", pasan por json.loads + regex, igual que el motor de Python
+puro: líneas mal formadas, con el status en otra posición o con valores que
+la forma canónica no cubre. En los datos del benchmark no hay ninguna.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+from .base import STATUS_PATTERN, Capabilities, PoolEngine
+
+STATUS_RE = re.compile(STATUS_PATTERN)
+
+MARKER = np.frombuffer(b"HTTP Status Code: ", dtype=np.uint8)
+# Prefijos canónicos de la línea antes del marcador (separadores de Spark y de json.dumps)
+PREFIXES = [np.frombuffer(p, dtype=np.uint8) for p in (b'{"message":"', b'{"message": "')]
+MESSAGE_KEY = np.frombuffer(b'"message"', dtype=np.uint8)
+HTTP = np.frombuffer(b"HTTP", dtype=np.uint8)
+
+_NEWLINE, _CR, _QUOTE, _BRACE, _ZERO, _SPACE, _BACKSLASH, _COMMA, _COLON = (ord(c) for c in '\n\r"}0 \\,:')
+
+# Separador -> bytes que no pueden seguirlo en JSON válido (ver docstring del módulo)
+_NO_VALUE_AFTER = {
+    _COMMA: np.frombuffer(b"}],", dtype=np.uint8),
+    _COLON: np.frombuffer(b"},", dtype=np.uint8),
+}
+
+
+def find_bytes(data: np.ndarray, pattern: np.ndarray, width: int = 0) -> np.ndarray:
+    """Posiciones de `pattern` con al menos `width` bytes disponibles desde cada una."""
+    width = max(width, pattern.size)
+    if data.size < width:
+        return np.empty(0, dtype=np.int64)
+    pos = np.flatnonzero(data[:data.size - width + 1] == pattern[0])
+    for k in range(1, pattern.size):
+        pos = pos[data[pos + k] == pattern[k]]
+    return pos
+
+
+def find_status_codes(data: np.ndarray):
+    """Posiciones del marcador seguido de 3 dígitos y el primer dígito de cada status."""
+    pos = find_bytes(data, MARKER, MARKER.size + 3)
+    digits = data[pos[:, None] + (MARKER.size + np.arange(3))] - _ZERO  # (n, 3)
+    is_status = (digits <= 9).all(axis=1)  # uint8: los bytes < '0' dan la vuelta y quedan > 9
+    return pos[is_status], digits[is_status, 0]
+
+
+def _canonical(data: np.ndarray, pos: np.ndarray, line_start: np.ndarray, line_end: np.ndarray) -> np.ndarray:
+    """Máscara de coincidencias cuya línea tiene la forma canónica (ver docstring del módulo)."""
+    after = pos + MARKER.size + 3
+    closes_message = np.zeros(pos.size, dtype=bool)
+    in_range = after < data.size
+    closes_message[in_range] = data[after[in_range]] == _QUOTE
+
+    last = line_end - 1
+    last = np.where((last > line_start) & (data[np.maximum(last, 0)] == _CR), last - 1, last)
+    closes_object = (last > line_start) & (data[np.maximum(last, 0)] == _BRACE)
+
+    starts_object = np.zeros(pos.size, dtype=bool)
+    for prefix in PREFIXES:
+        at_prefix = (pos - line_start) == prefix.size
+        if at_prefix.any():
+            idx = np.flatnonzero(at_prefix)
+            window = data[line_start[idx, None] + np.arange(prefix.size)]
+            starts_object[idx[(window == prefix).all(axis=1)]] = True
+
+    return starts_object & closes_message & closes_object
+
+
+def _suspect_lines(data: np.ndarray, newlines: np.ndarray) -> np.ndarray:
+    """Máscara por línea de las que la vía vectorizada no puede dar por JSON válido."""
+    # Bytes no ASCII o de control (salvo los fines de línea) y escapes; uint8: < 0x20 da la vuelta
+    odd = np.flatnonzero(((data - 0x20) >= 0x60) | (data == _BACKSLASH))
+    found = [odd[(data[odd] != _NEWLINE) & (data[odd] != _CR)]]
+    for separator, forbidden in _NO_VALUE_AFTER.items():
+        at = np.flatnonzero(data[:-1] == separator)
+        # Primer byte tras el separador, saltando un espacio
+        following = at + 1
+        following[(data[following] == _SPACE) & (following + 1 < data.size)] += 1
+        found.append(at[np.isin(data[following], forbidden)])
+        if separator == _COMMA:
+            # Una segunda clave "message" sigue a una coma (json.loads se queda con la última)
+            key = np.flatnonzero(following + MESSAGE_KEY.size <= data.size)
+            for k in range(MESSAGE_KEY.size):
+                key = key[data[following[key] + k] == MESSAGE_KEY[k]]
+            found.append(at[key])
+
+    suspect = np.zeros(newlines.size + 1, dtype=bool)
+    suspect[np.searchsorted(newlines, np.concatenate(found))] = True
+    return suspect
+
+
+def _count_line(raw: bytes) -> str:
+    """Vía lenta: misma semántica que el motor de Python puro para una línea."""
+    try:
+        record = json.loads(raw.decode("utf-8", errors="replace"))
+    except ValueError:
+        return ""
+    message = record.get("message") if isinstance(record, dict) else None
+    if not isinstance(message, str):
+        return ""
+    match = STATUS_RE.search(message)
+    return match.group(1)[0] if match else ""
+
+
+def count_buffer(data: np.ndarray) -> Dict[str, int]:
+    """Histograma {primer dígito: conteo} de líneas NDJSON en un arreglo de bytes."""
+    newlines = np.flatnonzero(data == _NEWLINE)
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.concatenate((newlines, [data.size]))
+
+    pos, first_digit = find_status_codes(data)
+    line = np.searchsorted(newlines, pos)  # índice de línea de cada coincidencia
+    suspect = _suspect_lines(data, newlines)
+    fast = _canonical(data, pos, line_starts[line], line_ends[line]) & ~suspect[line]
+    counts = np.bincount(first_digit[fast], minlength=10)
+    histogram = {str(d): int(c) for d, c in enumerate(counts) if c}
+
+    # Vía lenta: el resto de las líneas que podrían tener un status; las sospechosas
+    # incluyen las que tienen escapes, que json.loads puede convertir en "HTTP"
+    slow = suspect.copy()
+    slow[np.searchsorted(newlines, find_bytes(data, HTTP))] = True
+    slow[line[fast]] = False
+    extra = Counter(_count_line(data[line_starts[i]:line_ends[i]].tobytes()) for i in np.flatnonzero(slow))
+    extra.pop("", None)
+    for bucket, c in extra.items():
+        histogram[bucket] = histogram.get(bucket, 0) + c
+    return histogram
+
+
+def count_file(filepath: str) -> Dict[str, int]:
+    """Histograma de un archivo NDJSON mapeado en memoria."""
+    if os.path.getsize(filepath) == 0:
+        return {}
+    return count_buffer(np.memmap(filepath, dtype=np.uint8, mode="r"))
+
+
+def count_bytes(data: bytes) -> Dict[str, int]:
+    """Histograma de un bloque de líneas en memoria (--follow, --approx)."""
+    return count_buffer(np.frombuffer(data, dtype=np.uint8)) if data else {}
+
+
+def merge_results(results: List[Dict[str, int]]) -> Dict[str, int]:
+    merged: Counter = Counter()
+    for result in results:
+        merged.update(result)
+    return dict(merged)
+
+
+class NumpyEngine(PoolEngine):
+    name = "numpy"
+    task = staticmethod(count_file)
+    merge = staticmethod(merge_results)
+    chunk_task = staticmethod(count_bytes)
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities(parallel=True, streaming=True, profiler="cprofile", io=True)
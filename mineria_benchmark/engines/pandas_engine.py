@@ -0,0 +1,130 @@
+"""
+Motor de Pandas (ex-pandas): map-reduce con un DataFrame por archivo.
+
+Cada worker del Pool carga un archivo NDJSON con pandas, mapea el mensaje al
+primer dígito del status y cuenta por grupo. pd.read_json (ujson) es más
+permisivo que json.loads; los archivos donde eso puede cambiar el resultado
+se parsean línea a línea (ver lenient_json).
+"""
+
+import io
+import json
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .base import STATUS_PATTERN, PoolEngine
+
+STATUS_RE = re.compile(STATUS_PATTERN)
+
+# Números que ujson (pd.read_json) acepta y json.loads no, buscados sin espacios:
+# ceros a la izquierda y "1.". Cada patrón empieza por un literal para que re lo
+# busque rápido (una alternativa única recorre byte a byte, 10x más lento)
+_LENIENT_NUMBERS = [re.compile(p) for p in (rb':-?0[0-9]', rb',-?0[0-9]', rb'\[-?0[0-9]',
+                                            rb'\.(?![0-9])(?<=[0-9]\.)')]
+_NON_CONTROL = bytes(range(0x20, 0x100))
+
+
+def read_json_lines_tolerant(file_path: str) -> pd.DataFrame:
+    """Carga un NDJSON descartando las líneas que no son objetos JSON."""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return records_frame(file)
+
+
+def records_frame(lines) -> pd.DataFrame:
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+    return pd.DataFrame.from_records(records)
+
+
+def lenient_json(data: bytes) -> bool:
+    """True si `data` puede tener JSON que ujson acepta y json.loads rechaza.
+
+    ujson tolera comas finales, ceros a la izquierda, "1." y caracteres de
+    control sin escapar. La búsqueda no distingue strings: un falso positivo
+    sólo manda el bloque al parseo línea a línea.
+    """
+    controls = data.translate(None, _NON_CONTROL)
+    if controls.translate(None, b'\r\n') or controls.count(b'\r') != data.count(b'\r\n'):
+        return True
+    compact = data.translate(None, b' \t\r\n')
+    if b',}' in compact or b',]' in compact:
+        return True
+    return any(pattern.search(compact) for pattern in _LENIENT_NUMBERS)
+
+
+def read_json_strict(data: bytes) -> Optional[pd.DataFrame]:
+    """pd.read_json sobre `data`, o None si hay que parsear línea a línea como json.loads."""
+    if lenient_json(data):
+        return None
+    try:
+        return pd.read_json(io.BytesIO(data), lines=True)
+    except ValueError:
+        # Líneas mal formadas: pandas no sabe saltarlas
+        return None
+
+
+def load_dataset_from_path(file_path: str, file_format: str = 'json') -> pd.DataFrame:
+    if file_format == 'json':
+        with open(file_path, 'rb') as file:
+            df = read_json_strict(file.read())
+        if df is None:
+            df = read_json_lines_tolerant(file_path)
+    else:
+        df = pd.read_parquet(file_path)
+    return df
+
+
+def map_function(message) -> Optional[str]:
+    """Maps the status code of a log message to its bucket (first digit),
+    None when the message is missing or has no status code"""
+
+    if not isinstance(message, str):
+        return None
+    match = STATUS_RE.search(message)
+    return match.group(1)[0] if match else None
+
+
+def group_and_reduce_function(filepath: str, column: str = 'message') -> Dict[str, int]:
+    return reduce_frame(load_dataset_from_path(filepath), column)
+
+
+def count_lines(data: bytes) -> Dict[str, int]:
+    """Mismo conteo sobre un bloque de líneas en memoria (--follow, --approx)."""
+    dataframe = read_json_strict(data)
+    if dataframe is None:
+        dataframe = records_frame(data.decode('utf-8', errors='replace').splitlines())
+    return reduce_frame(dataframe)
+
+
+def reduce_frame(dataframe: pd.DataFrame, column: str = 'message') -> Dict[str, int]:
+    if column not in dataframe.columns:
+        return {}
+    dataframe[column] = dataframe[column].map(map_function)  # type: ignore
+    df = dataframe.groupby(column)[column].count().to_dict()  # type: ignore
+
+    return df
+
+
+def merge_results(results: List[Dict[str, int]]) -> Dict[str, int]:
+
+    results_dict = defaultdict(list)
+    for result in results:
+        for key, value in result.items():
+            results_dict[key].append(value)
+    return {key: sum(value) for key, value in results_dict.items()}
+
+
+class PandasEngine(PoolEngine):
+    name = "pandas"
+    task = staticmethod(group_and_reduce_function)
+    merge = staticmethod(merge_results)
+    chunk_task = staticmethod(count_lines)
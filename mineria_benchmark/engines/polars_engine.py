@@ -0,0 +1,152 @@
+"""
+Motor de Polars (ex-polars): escaneo lazy de NDJSON con ejecución en streaming.
+
+scan_ndjson no sabe saltar líneas que no son JSON; si el escaneo falla, el
+motor reintenta leyendo líneas crudas y extrayendo "message" con
+json_path_match, que devuelve null para las líneas inválidas.
+
+El número de hilos de Polars se fija con POLARS_MAX_THREADS antes de importar
+la librería (ver runner.apply_worker_env); `workers` no se puede cambiar
+después dentro del mismo proceso.
+
+Polars no tiene un límite de memoria configurable: con un techo (memcap) la
+consulta sigue en streaming y los volcados a disco van a POLARS_TEMP_DIR.
+"""
+
+import os
+import sys
+from typing import Dict, List, Optional
+
+import polars as pl
+
+from .base import (
+    EXIT_READ_ERROR,
+    STATUS_PATTERN,
+    BenchmarkError,
+    Capabilities,
+    Engine,
+)
+
+
+def scan_messages_tolerant(source) -> "pl.LazyFrame":
+    """Lee cada línea como texto y extrae "message" (null si la línea no es JSON)."""
+    return (
+        pl.scan_csv(
+            source,
+            has_header=False,
+            separator="\x1f",  # separador que no aparece en los logs: una columna por línea
+            quote_char=None,
+            schema={"line": pl.String},
+            truncate_ragged_lines=True,
+        )
+        .select(pl.col("line").str.json_path_match("$.message").alias("message"))
+    )
+
+
+def build_query(source, tolerant: bool = False) -> "pl.LazyFrame":
+    """
+    Pipeline: extraer status (3 dígitos) -> tomar primer dígito como bucket -> agregar.
+    `source` es un patrón o lista de rutas aceptado por pl.scan_ndjson.
+    """
+    scan = scan_messages_tolerant(source) if tolerant else pl.scan_ndjson(source)
+    return bucket_query(scan)
+
+
+def chunk_query(data: bytes) -> "pl.LazyFrame":
+    """Misma consulta sobre un bloque de líneas en memoria (--follow)."""
+    lines = pl.LazyFrame({"line": data.decode("utf-8", errors="replace").splitlines()},
+                         schema={"line": pl.String})
+    return bucket_query(lines.select(pl.col("line").str.json_path_match("$.message").alias("message")))
+
+
+def bucket_query(messages: "pl.LazyFrame") -> "pl.LazyFrame":
+    """Conteo y tasa por bucket a partir de una columna "message"."""
+    return (
+        messages
+        .with_columns(
+            pl.col("message")
+            .str.extract(STATUS_PATTERN, 1)  # captura "200", "404", etc.
+            .alias("status3")
+        )
+        .with_columns(
+            # bucket = primer dígito de status3 -> '2', '4' o '5'
+            pl.when(pl.col("status3").is_not_null())
+              .then(pl.col("status3").str.slice(0, 1))
+              .otherwise(None)
+              .alias("bucket")
+        )
+        .filter(pl.col("bucket").is_not_null())
+        .group_by("bucket")
+        .len()
+        .rename({"len": "count"})
+        .with_columns(
+            (pl.col("count") / pl.col("count").sum()).alias("rate")
+        )
+        .sort("bucket")
+    )
+
+
+class PolarsEngine(Engine):
+    name = "polars"
+
+    def __init__(self, workers: Optional[int] = None):
+        super().__init__(workers)
+        self.profile_files: List[str] = []
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities(parallel=True, lazy=True, streaming=True, profiler="polars", follow=True)
+
+    def limit_memory(self, limit: int, spill_dir: Optional[str] = None) -> None:
+        super().limit_memory(limit, spill_dir)
+        if spill_dir is not None:
+            # Polars lee la variable al crear su directorio temporal, no al importarse
+            os.environ["POLARS_TEMP_DIR"] = spill_dir
+
+    def run(self) -> Dict[str, int]:
+        try:
+            out = self._collect(build_query(self.pattern))
+        except pl.exceptions.PolarsError as e:
+            print(f"[polars] aviso: scan_ndjson falló ({e}); se reintenta con lectura tolerante",
+                  file=sys.stderr)
+            out = self._collect_tolerant()
+
+        # out es un DataFrame con columnas: bucket(str), count(i64), rate(f64)
+        return {str(row["bucket"]): int(row["count"]) for row in out.iter_rows(named=True)}
+
+    def count_chunk(self, data: bytes) -> Dict[str, int]:
+        out = chunk_query(data).collect()
+        return {str(row["bucket"]): int(row["count"]) for row in out.iter_rows(named=True)}
+
+    def _collect(self, query: "pl.LazyFrame") -> "pl.DataFrame":
+        if self.profile_dir is not None:
+            return self._run_profiled(query)
+        # collect(streaming=True) activa ejecución por streaming cuando es posible
+        return query.collect(streaming=True)
+
+    def _collect_tolerant(self) -> "pl.DataFrame":
+        try:
+            return self._collect(build_query(self.pattern, tolerant=True))
+        except pl.exceptions.PolarsError as e:
+            # Suele ocurrir si no hay archivos que coincidan con el patrón o formato inválido
+            raise BenchmarkError(f"falló la lectura/scan de {self.pattern}: {e}", EXIT_READ_ERROR) from e
+
+    def _run_profiled(self, query: "pl.LazyFrame") -> "pl.DataFrame":
+        """Ejecuta con LazyFrame.profile() y guarda el plan y los tiempos por nodo."""
+        from ..profiling import profile_prefix, write_table
+
+        prefix = profile_prefix(self.profile_dir, self.name)
+        plan_path = f"{prefix}-plan.txt"
+        with open(plan_path, "w", encoding="utf-8") as f:
+            f.write(query.explain())
+
+        out, timings = query.profile()
+        rows = [
+            [r["node"], f"{(r['end'] - r['start']) / 1e6:.6f}", r["start"], r["end"]]
+            for r in timings.sort(pl.col("end") - pl.col("start"), descending=True).iter_rows(named=True)
+        ]
+        top_path = write_table(f"{prefix}-top.txt", ["node", "seconds", "start_us", "end_us"], rows)
+        self.profile_files = [plan_path, top_path]
+        return out
+
+    def finish_profile(self) -> List[str]:
+        return self.profile_files
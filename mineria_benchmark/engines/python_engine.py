@@ -0,0 +1,89 @@
+"""
+Motor de Python puro (ex-python): map-reduce con multiprocessing.Pool.
+
+Cada worker lee un archivo completo, mapea cada línea a (bucket, 1) y reduce
+por clave; el proceso principal fusiona los resultados parciales. Las líneas
+que no son JSON o cuyo "message" no tiene status se descartan.
+
+En --follow, los bloques agregados se cuentan en el proceso principal con la
+misma map_function (los incrementos son pequeños frente al costo del IPC); en
+--approx, cada worker lee y cuenta un bloque muestreado.
+"""
+
+import json
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from .base import STATUS_PATTERN, Capabilities, PoolEngine
+
+STATUS_RE = re.compile(STATUS_PATTERN)
+
+
+def map_function(line: str) -> Optional[Tuple[str, int]]:
+    """Maps the status code of a single NDJSON line to (bucket, 1),
+    where bucket is the first digit of the code. Returns None when the line
+    is not a JSON object or its message has no status code"""
+
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("message"), str):
+        return None
+    match = STATUS_RE.search(record["message"])
+    return (match.group(1)[0], 1) if match else None
+
+
+def group_by_function(mapped_items: List[Tuple[str, int]]) -> List[Tuple[str, List[int]]]:
+    "Takes a list of tuples and reduces them by key, adding up all the logs retrieved"
+
+    grouped_dict = defaultdict(list)
+
+    for key, value in mapped_items:
+        grouped_dict[key].append(value)
+
+    return list(grouped_dict.items())
+
+
+def reducer_function(grouped_items: Tuple[str, List[int]]) -> Tuple[str, int]:
+    key, values = grouped_items
+    return (key, sum(values))
+
+
+def map_json(filepath: str) -> List[Tuple[str, int]]:
+    """Takes a json filepath, maps and reduces the logs, returning a list containing the count
+    of logs by error code"""
+
+    with open(filepath, 'r', encoding='utf-8') as file:
+        mapped_data = [item for item in map(map_function, file) if item is not None]
+    grouped_data = group_by_function(mapped_data)
+    reduced_data = [reducer_function(item) for item in grouped_data]
+
+    return reduced_data
+
+
+def merge_results(results: List[List[Tuple[str, int]]]) -> List[Tuple[str, int]]:
+    merged_dict = defaultdict(list)
+    for calculation in results:
+        for key, value in calculation:
+            merged_dict[key].append(value)
+    reduced_result = [reducer_function(error_code) for error_code in merged_dict.items()]
+    return reduced_result
+
+
+def count_lines(data: bytes) -> Dict[str, int]:
+    """Map-reduce de un bloque de líneas NDJSON en memoria."""
+    mapped_data = [item for item in map(map_function, data.decode("utf-8", errors="replace").splitlines())
+                   if item is not None]
+    return dict(reducer_function(item) for item in group_by_function(mapped_data))
+
+
+class PythonEngine(PoolEngine):
+    name = "python"
+    task = staticmethod(map_json)
+    merge = staticmethod(merge_results)
+    chunk_task = staticmethod(count_lines)
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities(parallel=True, profiler="cprofile", follow=True, io=True)
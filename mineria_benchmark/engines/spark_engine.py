@@ -0,0 +1,224 @@
+"""
+Motor de Spark (ex-spark): SparkSession local[*] sobre NDJSON.
+
+La SparkSession se levanta en prepare(), por lo que el arranque de la JVM
+queda dentro del tiempo medido, igual que en el main.py original.
+
+En --approx, los bloques que son archivos completos se leen en un solo job
+agrupado por input_file_name(); los rangos parciales se pasan como RDD de
+líneas a spark.read.json.
+
+Sin verificar: que spark.read.json descarte como json.loads las líneas
+inválidas con forma de objeto del dataset de casos borde (coma final, valor
+ausente, "message" repetido) no se comprobó en un entorno con pyspark; la
+suite de tests/ omite Spark si no está instalado. Antes de medir, correr
+`python -m mineria_benchmark verify --engine spark`.
+"""
+
+import json
+import os
+import sys
+import urllib.parse
+import urllib.request
+from collections import Counter
+from typing import Dict, List, Optional
+
+from pyspark.sql import SparkSession, Window, functions as F
+
+from .base import STATUS_PATTERN, Block, Capabilities, Engine, read_block
+
+
+# Fracción del techo de memoria para el heap de la JVM (metaspace, hilos y
+# buffers off-heap van fuera del heap)
+HEAP_SHARE = 0.6
+
+# Tamaño máximo de partición de lectura; en un directorio compactado se usa el
+# tamaño de rango de su índice, para que cada shard se lea en varias tareas
+MAX_PARTITION_BYTES = "256m"
+
+
+def build_spark(app_name: str = "BenchmarkSparkLocal", workers: Optional[int] = None,
+                memory_limit: Optional[int] = None, local_dir: str = "/tmp/spark") -> SparkSession:
+    """
+    Construye una SparkSession local con configs útiles para procesamiento batch.
+    Optimizado para m5.2xlarge (8 vCPU, 32GB RAM).
+    Con `workers`, usa local[workers] en lugar de todos los cores.
+    Con `memory_limit` (bytes), el heap se ajusta a ese techo en lugar de 24g.
+    """
+    master = f"local[{workers}]" if workers else "local[*]"
+    partitions = str(2 * workers) if workers else "16"
+    # Dejar 8GB para SO
+    memory = f"{int(memory_limit * HEAP_SHARE) // 2**20}m" if memory_limit else "24g"
+    return (
+        SparkSession.builder
+        .appName(app_name)
+        .master(master)  # ejecuta en la propia EC2 con todos los cores disponibles
+        .config("spark.driver.memory", memory)
+        .config("spark.executor.memory", memory)
+        .config("spark.sql.adaptive.enabled", "true")
+        .config("spark.serializer", "org.apache.spark.serializer.KryoSerializer")
+        .config("spark.sql.files.ignoreCorruptFiles", "true")
+        .config("spark.sql.files.maxPartitionBytes", MAX_PARTITION_BYTES)
+        .config("spark.local.dir", local_dir)
+        .config("spark.sql.shuffle.partitions", partitions)  # 2x cores
+        .getOrCreate()
+    )
+
+
+STAGE_FIELDS = (
+    "stageId", "name", "status", "numTasks", "executorRunTime", "executorCpuTime",
+    "jvmGcTime", "inputBytes", "inputRecords", "shuffleReadBytes", "shuffleWriteBytes",
+    "memoryBytesSpilled", "diskBytesSpilled",
+)
+
+
+def stage_metrics(spark: SparkSession) -> List[Dict]:
+    """Métricas por stage de la aplicación actual.
+
+    Usa la API REST del Spark UI; si el UI está deshabilitado, recurre al
+    statusTracker (sólo número de tareas, sin tiempos).
+    """
+    sc = spark.sparkContext
+    if sc.uiWebUrl:
+        url = f"{sc.uiWebUrl}/api/v1/applications/{sc.applicationId}/stages"
+        try:
+            with urllib.request.urlopen(url, timeout=10) as resp:
+                stages = json.load(resp)
+            return [{k: st.get(k) for k in STAGE_FIELDS} for st in stages]
+        except OSError:
+            pass
+
+    tracker = sc.statusTracker()
+    stages = []
+    for job_id in tracker.getJobIdsForGroup(None):
+        job = tracker.getJobInfo(job_id)
+        for stage_id in (job.stageIds if job else []):
+            info = tracker.getStageInfo(stage_id)
+            if info is not None:
+                stages.append({"stageId": info.stageId, "name": info.name,
+                               "numTasks": info.numTasks, "numFailedTasks": info.numFailedTasks})
+    return stages
+
+
+def bucket_column():
+    """Primer dígito del status, null si el mensaje no lo tiene."""
+    status3 = F.regexp_extract(F.col("message"), STATUS_PATTERN, 1)
+    return F.when(status3 != "", F.substring(status3, 1, 1)).otherwise(F.lit(None))
+
+
+def build_query(df):
+    """Extrae status de 3 dígitos y primer dígito como bucket; agrega por bucket."""
+    return (
+        df
+        .withColumn("bucket", bucket_column())
+        .where(F.col("bucket").isNotNull())
+        .groupBy("bucket")
+        .count()
+        .withColumn(
+            "rate",
+            F.col("count") / F.sum("count").over(Window.partitionBy())
+        )
+        .orderBy("bucket")
+    )
+
+
+class SparkEngine(Engine):
+    name = "spark"
+
+    def __init__(self, workers: Optional[int] = None):
+        super().__init__(workers)
+        self.spark = None
+        self.profile_files: List[str] = []
+
+    def capabilities(self) -> Capabilities:
+        return Capabilities(parallel=True, lazy=True, sql=True, jvm=True, profiler="spark")
+
+    def start(self) -> None:
+        if self.spark is None:
+            self.spark = build_spark(workers=self.workers, memory_limit=self.memory_limit,
+                                     local_dir=self.spill_dir or "/tmp/spark")
+            print(f"[spark] Spark version: {self.spark.version}", file=sys.stderr)
+
+    def prepare(self, input_dir: str) -> None:
+        super().prepare(input_dir)
+        # Conf de sesión: el modo servicio reutiliza la sesión entre directorios
+        self.spark.conf.set("spark.sql.files.maxPartitionBytes",
+                            f"{self.index['range_size']}b" if self.index is not None else MAX_PARTITION_BYTES)
+        print(f"[spark] Reading from: {self.pattern}", file=sys.stderr)
+
+    def run(self) -> Dict[str, int]:
+        # Lectura de NDJSON (un objeto por línea)
+        rows = build_query(self.spark.read.json(self.pattern)).collect()
+        return {str(r["bucket"]): int(r["count"]) for r in rows}
+
+    def count_chunk(self, data: bytes) -> Dict[str, int]:
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        if not lines:
+            return {}
+        df = self.spark.read.json(self.spark.sparkContext.parallelize(lines))
+        if "message" not in df.columns:
+            return {}
+        rows = build_query(df).collect()
+        return {str(r["bucket"]): int(r["count"]) for r in rows}
+
+    def count_blocks(self, blocks: List[Block]) -> List[Dict[str, int]]:
+        whole = {b for b in blocks if b.start == 0 and b.end == os.path.getsize(b.path)}
+        by_file = self._count_files(sorted(b.path for b in whole)) if whole else {}
+        return [dict(by_file[b.path]) if b in whole and b.path in by_file else self.count_chunk(read_block(b))
+                for b in blocks]
+
+    def _count_files(self, paths: List[str]) -> Dict[str, Counter]:
+        by_file: Dict[str, Counter] = {path: Counter() for path in paths}
+        df = self.spark.read.json(paths)
+        if "message" not in df.columns:
+            return by_file
+        rows = (
+            df.select(F.input_file_name().alias("file"), bucket_column().alias("bucket"))
+            .where(F.col("bucket").isNotNull())
+            .groupBy("file", "bucket")
+            .count()
+            .collect()
+        )
+        for r in rows:
+            # input_file_name() devuelve una URI (file:///ruta)
+            path = urllib.parse.unquote(urllib.parse.urlparse(r["file"]).path)
+            if path in by_file:
+                by_file[path][str(r["bucket"])] += int(r["count"])
+        return by_file
+
+    def teardown(self) -> None:
+        if self.spark is not None:
+            if self.profile_dir is not None:
+                # Las métricas se leen antes de detener la sesión (el UI muere con ella)
+                self._write_stage_metrics()
+            if self.memory_limit is not None:
+                self.spilled_bytes = self._spilled_bytes()
+            self.spark.stop()
+            self.spark = None
+
+    def _spilled_bytes(self) -> Optional[int]:
+        """Volcado a disco real de los stages; spark.local.dir siempre tiene archivos de shuffle."""
+        stages = stage_metrics(self.spark)
+        if not stages or any("diskBytesSpilled" not in st for st in stages):
+            return None
+        return sum(st.get("diskBytesSpilled") or 0 for st in stages)
+
+    def _write_stage_metrics(self) -> None:
+        from ..profiling import profile_prefix, write_table
+
+        prefix = profile_prefix(self.profile_dir, self.name)
+        stages = stage_metrics(self.spark)
+        json_path = f"{prefix}-stages.json"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(stages, f, indent=2)
+
+        stages = sorted(stages, key=lambda st: st.get("executorRunTime") or 0, reverse=True)
+        rows = [[st.get("stageId"), st.get("executorRunTime", "-"), st.get("numTasks"),
+                 st.get("inputBytes", "-"), st.get("shuffleWriteBytes", "-"), st.get("name")]
+                for st in stages]
+        top_path = write_table(f"{prefix}-top.txt",
+                               ["stage", "run_ms", "tasks", "input_bytes", "shuffle_write", "name"], rows)
+        self.profile_files = [json_path, top_path]
+
+    def finish_profile(self) -> List[str]:
+        return self.profile_files
@@ -0,0 +1,251 @@
+"""
+Modo continuo (--follow): conteos vivos sobre un directorio que crece.
+
+En lugar de un glob fijo, observa el directorio de entrada (inotify en Linux,
+sondeo periódico en otro caso) y guarda el offset en bytes de cada *.json:
+en cada pasada sólo lee los bytes agregados hasta el último salto de línea
+(una línea a medio escribir se procesa en la pasada siguiente) y los cuenta con
+engine.count_chunk(). Si un archivo se trunca o se reemplaza, se relee desde 0.
+
+Cada `emit_interval` segundos emite los conteos acumulados, los de la ventana
+deslizante (`window` segundos) con sus tasas y líneas/s, y la latencia de
+extremo a extremo: desde la última escritura del archivo (mtime al leerlo)
+hasta que el bloque quedó contado. Para el último byte de cada bloque es exacta;
+las líneas anteriores del mismo bloque esperaron a lo sumo un ciclo más.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import sys
+import time
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .engines import BUCKETS, BenchmarkError, get_engine, list_json_files, normalize_counts
+from .engines.base import EXIT_INVALID_INPUT
+
+# Máximo de bytes leídos de un archivo por pasada (acota la memoria con archivos enormes)
+MAX_CHUNK = 64 * 1024**2
+
+_IN_MODIFY, _IN_CLOSE_WRITE, _IN_MOVED_TO, _IN_CREATE = 0x2, 0x8, 0x80, 0x100
+
+
+class PollingWatcher:
+    """Espera fija entre pasadas."""
+
+    kind = "polling"
+
+    def __init__(self, path: str, interval: float = 0.5):
+        self.interval = interval
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(min(timeout, self.interval))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Despierta en cuanto el kernel avisa de escrituras/archivos nuevos en el directorio."""
+
+    kind = "inotify"
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch {path}")
+
+    def wait(self, timeout: float) -> None:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            # Los eventos sólo despiertan la pasada: el estado real se lee con stat()
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(path: str, poll_interval: float = 0.5):
+    """inotify si está disponible; si no, sondeo cada `poll_interval` segundos."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(path, poll_interval)
+
+
+class SlidingWindow:
+    """Conteos y latencias de los últimos `seconds` segundos."""
+
+    def __init__(self, seconds: float = 60.0):
+        self.seconds = seconds
+        self.events: Deque[Tuple[float, Dict[str, int], float]] = deque()
+        # Primer evento recibido: hasta llenar la ventana, la tasa se mide desde aquí
+        self.first: Optional[float] = None
+
+    def add(self, at: float, counts: Dict[str, int], latency: float) -> None:
+        if self.first is None:
+            self.first = at
+        self.events.append((at, counts, latency))
+
+    def _expire(self, now: float) -> None:
+        while self.events and self.events[0][0] < now - self.seconds:
+            self.events.popleft()
+
+    def summary(self, now: float) -> Dict:
+        self._expire(now)
+        counts: Counter = Counter()
+        for _at, chunk, _latency in self.events:
+            counts.update(chunk)
+        counts = normalize_counts(counts)
+        total = sum(counts.values())
+        latencies = sorted(latency for _at, _chunk, latency in self.events)
+        elapsed = min(self.seconds, now - self.first) if self.first is not None else 0.0
+        return {
+            "window_s": self.seconds,
+            "counts": counts,
+            "rates": {b: (counts[b] / total if total else 0.0) for b in BUCKETS},
+            "lines_per_s": total / elapsed if elapsed > 0 else 0.0,
+            "latency_p50_s": _percentile(latencies, 0.50),
+            "latency_p99_s": _percentile(latencies, 0.99),
+            "latency_max_s": latencies[-1] if latencies else None,
+        }
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class Follower:
+    """Offsets por archivo y conteos acumulados de un directorio que crece."""
+
+    def __init__(self, input_dir: str, count_chunk: Callable[[bytes], Dict[str, int]],
+                 window: float = 60.0, max_chunk: int = MAX_CHUNK):
+        self.input_dir = input_dir
+        self.count_chunk = count_chunk
+        self.max_chunk = max_chunk
+        # ruta -> (inode, offset del próximo byte sin procesar)
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        self.totals: Counter = Counter()
+        self.bytes_read = 0
+        self.window = SlidingWindow(window)
+
+    def step(self, final: bool = False) -> int:
+        """Procesa los bytes nuevos de todos los archivos; devuelve los bytes consumidos.
+
+        Con final=True también cuenta la última línea aunque no termine en salto de línea.
+        """
+        consumed = 0
+        for path in list_json_files(self.input_dir):
+            try:
+                consumed += self._read_new(path, final)
+            except FileNotFoundError:
+                self.offsets.pop(path, None)
+        return consumed
+
+    def _read_new(self, path: str, final: bool) -> int:
+        st = os.stat(path)
+        inode, offset = self.offsets.get(path, (st.st_ino, 0))
+        if inode != st.st_ino or st.st_size < offset:
+            offset = 0  # archivo reemplazado o truncado
+        consumed = 0
+        while st.st_size > offset:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(min(st.st_size - offset, self.max_chunk))
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                if not final and len(data) < self.max_chunk:
+                    break  # línea a medio escribir: se espera a su salto de línea
+                end = len(data)
+            self._count(data[:end], st.st_mtime)
+            offset += end
+            consumed += end
+        self.offsets[path] = (st.st_ino, offset)
+        return consumed
+
+    def _count(self, data: bytes, written_at: float) -> None:
+        counts = normalize_counts(self.count_chunk(data))
+        now = time.time()
+        self.totals.update(counts)
+        self.bytes_read += len(data)
+        if any(counts.values()):
+            # La latencia se mide sobre líneas contadas, no sobre ruido descartado
+            self.window.add(now, counts, max(0.0, now - written_at))
+
+    def status(self, started: float) -> Dict:
+        now = time.time()
+        return {
+            "elapsed_s": now - started,
+            "files": len(self.offsets),
+            "bytes": self.bytes_read,
+            "counts": normalize_counts(self.totals),
+            "window": self.window.summary(now),
+        }
+
+
+def format_status(engine: str, status: Dict) -> str:
+    w = status["window"]
+    latency = ("-" if w["latency_p50_s"] is None
+               else f"p50 {w['latency_p50_s']:.3f}s p99 {w['latency_p99_s']:.3f}s")
+    rates = {b: round(r, 4) for b, r in w["rates"].items()}
+    return (f"[follow {engine}] t={status['elapsed_s']:.1f}s total {status['counts']} | "
+            f"ventana {w['window_s']:g}s: {w['lines_per_s']:.1f} líneas/s tasas {rates} | "
+            f"latencia {latency}")
+
+
+def follow(engine_name: str, input_dir: str, emit_interval: float = 5.0, window: float = 60.0,
+           duration: Optional[float] = None, poll_interval: float = 0.5, fmt: str = "log",
+           workers: Optional[int] = None, out=sys.stdout) -> Dict:
+    """Sigue `input_dir` hasta `duration` segundos (o Ctrl-C) y devuelve el último estado."""
+    if not os.path.isdir(input_dir):
+        raise BenchmarkError(f"'{input_dir}' no es un directorio válido.", EXIT_INVALID_INPUT)
+    engine = get_engine(engine_name)(workers=workers)
+    if not engine.capabilities().follow:
+        raise BenchmarkError(f"el motor '{engine_name}' no soporta --follow (disponible en: python, polars)",
+                             EXIT_INVALID_INPUT)
+
+    follower = Follower(input_dir, engine.count_chunk, window=window)
+    watcher = make_watcher(input_dir, poll_interval)
+    print(f"[follow {engine_name}] observando {input_dir} ({watcher.kind})", file=sys.stderr)
+
+    def emit():
+        status = follower.status(started)
+        print(json.dumps(status) if fmt == "json" else format_status(engine_name, status), file=out, flush=True)
+        return status
+
+    started = time.time()
+    next_emit = started + emit_interval
+    try:
+        while duration is None or time.time() - started < duration:
+            follower.step()
+            now = time.time()
+            if now >= next_emit:
+                emit()
+                next_emit = now + emit_interval
+            remaining = next_emit - now
+            if duration is not None:
+                remaining = min(remaining, started + duration - now)
+            watcher.wait(max(0.0, remaining))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    follower.step(final=True)
+    return emit()
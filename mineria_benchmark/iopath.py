@@ -0,0 +1,227 @@
+"""
+Ruta de lectura seleccionable para los motores que leen desde Python (--io).
+
+python, pandas y numpy abren los archivos cada uno a su manera (texto, bytes,
+np.memmap), y MetricsSampler sólo ve el read_bytes del proceso principal: no
+distingue lecturas servidas por el page cache de lecturas a disco. Con
+`run --io ESTRATEGIA`, los motores de Pool leen cada archivo (o cada rango del
+índice de compact) con una de estas estrategias, en bloques de `chunk_size`
+bytes que se cortan en el último salto de línea antes de pasarlos a
+chunk_task:
+- buffered: read() de bloques grandes sobre un descriptor sin buffer de Python;
+- mmap: mmap de sólo lectura con madvise(MADV_SEQUENTIAL) (readahead agresivo);
+- fadvise: pread() con posix_fadvise SEQUENTIAL, WILLNEED sobre el bloque
+  siguiente (prefetch mientras se cuenta el actual) y DONTNEED sobre el ya
+  leído (el archivo no queda en el page cache);
+- direct: O_DIRECT con buffer, offsets y tamaños alineados a ALIGNMENT (sin
+  page cache: siempre es una lectura a disco).
+
+Cada tarea mide, con /proc/self/io del worker, los bytes que realmente vinieron
+del dispositivo (read_bytes) frente a los bytes entregados; su cociente da la
+tasa de aciertos del page cache de la medición (BenchmarkResult.io).
+
+evict() saca archivos del page cache (fdatasync + POSIX_FADV_DONTNEED) para
+medir en frío (`run --cold-cache`) sin vaciar el caché de todo el sistema.
+"""
+
+import mmap
+import os
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .defaults import DEFAULT_IO_CHUNK, IO_STRATEGIES
+from .engines.base import EXIT_INVALID_INPUT, EXIT_READ_ERROR, BenchmarkError, Block
+
+# Alineación de O_DIRECT: bloque lógico de la mayoría de los discos y tamaño de página
+ALIGNMENT = 4096
+
+
+def available_strategies() -> List[str]:
+    """Estrategias que el sistema operativo soporta."""
+    supported = {
+        "buffered": True,
+        "mmap": hasattr(mmap.mmap, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"),
+        "fadvise": hasattr(os, "posix_fadvise"),
+        "direct": hasattr(os, "O_DIRECT"),
+    }
+    return [name for name in IO_STRATEGIES if supported[name]]
+
+
+def check_strategy(strategy: str) -> None:
+    if strategy not in IO_STRATEGIES:
+        raise BenchmarkError(f"estrategia de lectura desconocida '{strategy}'. "
+                             f"Disponibles: {', '.join(IO_STRATEGIES)}", EXIT_INVALID_INPUT)
+    if strategy not in available_strategies():
+        raise BenchmarkError(f"la estrategia de lectura '{strategy}' no está disponible en este sistema",
+                             EXIT_INVALID_INPUT)
+
+
+def _read_buffered(path: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    with open(path, "rb", buffering=0) as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                return
+            remaining -= len(data)
+            yield data
+
+
+def _read_mmap(path: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    if end <= start:
+        return  # mmap no acepta archivos vacíos
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+        for pos in range(start, end, chunk_size):
+            yield mm[pos:min(pos + chunk_size, end)]
+
+
+def _read_fadvise(path: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, start, end - start, os.POSIX_FADV_SEQUENTIAL)
+        os.posix_fadvise(fd, start, chunk_size, os.POSIX_FADV_WILLNEED)
+        pos = start
+        while pos < end:
+            size = min(chunk_size, end - pos)
+            # El siguiente bloque se pide antes de leer este: el kernel lo trae mientras se cuenta
+            os.posix_fadvise(fd, pos + size, chunk_size, os.POSIX_FADV_WILLNEED)
+            data = os.pread(fd, size, pos)
+            if not data:
+                return
+            os.posix_fadvise(fd, pos, len(data), os.POSIX_FADV_DONTNEED)
+            pos += len(data)
+            yield data
+    finally:
+        os.close(fd)
+
+
+def _read_direct(path: str, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    size = -(-chunk_size // ALIGNMENT) * ALIGNMENT
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECT)
+    except OSError as e:
+        raise BenchmarkError(f"O_DIRECT no soportado para {path}: {e}", EXIT_READ_ERROR) from e
+    # Un mmap anónimo está alineado a página, como exige O_DIRECT para el buffer
+    buf = mmap.mmap(-1, size)
+    try:
+        pos = start - start % ALIGNMENT
+        while pos < end:
+            n = os.preadv(fd, [buf], pos)
+            if n <= 0:
+                return
+            yield buf[max(start - pos, 0):min(n, end - pos)]
+            pos += n
+            if n < size:
+                return  # fin de archivo
+    finally:
+        buf.close()
+        os.close(fd)
+
+
+_READERS = {
+    "buffered": _read_buffered,
+    "mmap": _read_mmap,
+    "fadvise": _read_fadvise,
+    "direct": _read_direct,
+}
+
+
+def read_range(path: str, strategy: str, start: int = 0, end: Optional[int] = None,
+               chunk_size: int = DEFAULT_IO_CHUNK) -> Iterator[bytes]:
+    """Bytes [start, end) de `path` en bloques de hasta `chunk_size`, leídos con `strategy`."""
+    if end is None:
+        end = os.path.getsize(path)
+    return _READERS[strategy](path, start, end, chunk_size)
+
+
+def split_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Reagrupa bloques para que cada uno termine en salto de línea (el último, donde termine)."""
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk if carry else chunk
+        cut = data.rfind(b"\n") + 1
+        if cut:
+            yield data[:cut]
+        carry = data[cut:]
+    if carry:
+        yield carry
+
+
+def proc_io() -> Optional[Dict[str, int]]:
+    """Contadores de /proc/self/io (rchar, read_bytes...), o None si no existen."""
+    try:
+        with open("/proc/self/io", "r") as f:
+            return {key: int(value) for key, value in (line.split(": ") for line in f)}
+    except (OSError, ValueError):
+        return None
+
+
+def count_range(chunk_task: Callable[[bytes], Dict[str, int]], strategy: str, block: Block,
+                chunk_size: int = DEFAULT_IO_CHUNK) -> Tuple[Dict[str, int], Dict]:
+    """Tarea de Pool: cuenta un rango que empieza en inicio de línea; devuelve (conteos, estadísticas)."""
+    before = proc_io()
+    counts: Counter = Counter()
+    logical = 0
+    read_s = 0.0
+    chunks = split_lines(read_range(block.path, strategy, block.start, block.end, chunk_size))
+    while True:
+        t0 = time.perf_counter()
+        data = next(chunks, None)
+        read_s += time.perf_counter() - t0
+        if data is None:
+            break
+        logical += len(data)
+        counts.update(chunk_task(data))
+    after = proc_io()
+    disk = after["read_bytes"] - before["read_bytes"] if before is not None and after is not None else None
+    return dict(counts), {"logical_bytes": logical, "disk_bytes": disk, "read_s": read_s}
+
+
+def merge_io_stats(strategy: str, stats: List[Dict]) -> Dict:
+    """Suma las estadísticas de las tareas y calcula la tasa de aciertos del page cache."""
+    logical = sum(s["logical_bytes"] for s in stats)
+    disks = [s["disk_bytes"] for s in stats]
+    disk = None if any(d is None for d in disks) else sum(disks)
+    return {
+        "strategy": strategy,
+        "logical_bytes": logical,
+        "disk_bytes": disk,
+        # read_bytes cuenta el readahead: puede superar lo pedido
+        "cache_hit_ratio": max(0.0, 1 - disk / logical) if disk is not None and logical else None,
+        "read_s": sum(s["read_s"] for s in stats),
+    }
+
+
+def evict(paths: Iterable[str]) -> int:
+    """Saca `paths` del page cache y devuelve los bytes tratados.
+
+    Las páginas sucias no se pueden descartar: se escriben antes con fdatasync
+    (un dataset recién generado sigue sucio). No requiere privilegios, a
+    diferencia de /proc/sys/vm/drop_caches.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        raise BenchmarkError("--cold-cache requiere posix_fadvise (Linux)", EXIT_INVALID_INPUT)
+    total = 0
+    for path in paths:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fdatasync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            total += os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+    return total
+
+
+def format_io(io: Dict) -> str:
+    parts = [f"io {io['strategy'] or 'lector del motor'}"]
+    if io["cold_cache"]:
+        parts.append(f"caché vaciado ({io['evicted_bytes'] / 1024**2:.1f} MB)")
+    if io.get("logical_bytes") is not None:
+        parts.append(f"leídos {io['logical_bytes'] / 1024**2:.1f} MB en {io['read_s']:.3f}s")
+    if io.get("cache_hit_ratio") is not None:
+        parts.append(f"disco {io['disk_bytes'] / 1024**2:.1f} MB, aciertos de caché {io['cache_hit_ratio']:.0%}")
+    return ", ".join(parts)
@@ -0,0 +1,134 @@
+"""
+Barrido de escalamiento (modo matriz): motores x workers x distribución de
+tamaños de archivo x volumen total, sobre datos generados localmente.
+
+Cada medición corre en un proceso nuevo (`python -m mineria_benchmark run
+--workers N --format json`), porque algunas librerías (Polars) fijan su pool
+de hilos al importarse. Los datasets se generan una vez y se reutilizan desde
+`data_dir`.
+
+El resultado es una lista de registros JSON (uno por medición) que
+analysis_utils convierte en MB/s, líneas/s por core, eficiencia paralela y
+ajustes de Amdahl.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+from .datagen import estimate_line_bytes, file_sizes, generate_dataset
+from .defaults import DEFAULT_DATA_DIR
+from .runner import ROOT, subprocess_env
+
+
+def default_workers() -> List[int]:
+    """Potencias de 2 hasta el número de cores, más el número de cores."""
+    cores = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cores:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cores:
+        workers.append(cores)
+    return workers
+
+
+def build_dataset(data_dir: str, files: int, total_mb: float, distribution: str,
+                  seed: int = 0) -> Dict:
+    """Genera (o reutiliza) un dataset y devuelve su manifiesto."""
+    path = os.path.join(data_dir, f"{distribution}-{files}f-{total_mb:g}mb-s{seed}")
+    manifest_path = os.path.join(path, "manifest.txt")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    total_lines = int(total_mb * 1024**2 / estimate_line_bytes(seed))
+    sizes = file_sizes(files, total_lines, distribution, seed=seed)
+    expected = generate_dataset(path, lines_per_file=sizes, seed=seed)
+    manifest = {
+        "path": path,
+        "files": files,
+        "distribution": distribution,
+        "total_mb": total_mb,
+        "lines": total_lines,
+        "bytes": sum(os.path.getsize(os.path.join(path, f"part-{i:05d}.json")) for i in range(files)),
+        "largest_file_share": max(sizes) / total_lines if total_lines else 0.0,
+        "expected": expected,
+    }
+    # .txt para que los motores (que leen *.json) no lo tomen como dato
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def run_point(engine: str, input_dir: str, workers: int, timeout: Optional[float] = None) -> Dict:
+    """Ejecuta una medición en un proceso nuevo y devuelve su registro JSON."""
+    # El proceso corre en ROOT: una ruta relativa se resuelve antes
+    proc = subprocess.run(
+        [sys.executable, "-m", "mineria_benchmark", "run", "--engine", engine,
+         "--input", os.path.abspath(input_dir), "--workers", str(workers), "--format", "json"],
+        capture_output=True, text=True, env=subprocess_env(), cwd=ROOT, timeout=timeout,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip()
+                           else f"código de salida {proc.returncode}")
+    return json.loads(proc.stdout)
+
+
+def run_matrix(
+    engines: List[str],
+    workers: List[int],
+    distributions: List[str],
+    sizes_mb: List[float],
+    files: int = 64,
+    repeat: int = 3,
+    data_dir: str = DEFAULT_DATA_DIR,
+    seed: int = 0,
+    timeout: Optional[float] = None,
+    log=None,
+) -> List[Dict]:
+    """Recorre la matriz completa y devuelve un registro por medición."""
+    records = []
+    for distribution in distributions:
+        for total_mb in sizes_mb:
+            dataset = build_dataset(data_dir, files, total_mb, distribution, seed=seed)
+            for engine in engines:
+                for n in workers:
+                    for rep in range(repeat):
+                        record = {
+                            "engine": engine,
+                            "workers": n,
+                            "distribution": distribution,
+                            "files": files,
+                            "total_mb": total_mb,
+                            "bytes": dataset["bytes"],
+                            "lines": dataset["lines"],
+                            "largest_file_share": dataset["largest_file_share"],
+                            "repeat": rep,
+                        }
+                        try:
+                            result = run_point(engine, dataset["path"], n, timeout=timeout)
+                            record.update(
+                                wall_time_s=result["wall_time_s"],
+                                prepare_s=result["prepare_s"],
+                                run_s=result["run_s"],
+                                ok=result["counts"] == dataset["expected"],
+                            )
+                        except (RuntimeError, subprocess.TimeoutExpired) as e:
+                            record.update(wall_time_s=None, ok=False, error=str(e))
+                        records.append(record)
+                        if log is not None:
+                            log(record)
+    return records
+
+
+def format_record(record: Dict) -> str:
+    if record.get("wall_time_s") is None:
+        return (f"[{record['engine']}] {record['distribution']} {record['total_mb']:g}MB "
+                f"w={record['workers']}: ERROR {record.get('error')}")
+    mb_s = record["bytes"] / 1024**2 / record["wall_time_s"]
+    flag = "" if record["ok"] else "  (¡conteos distintos al esperado!)"
+    return (f"[{record['engine']}] {record['distribution']} {record['total_mb']:g}MB "
+            f"w={record['workers']} #{record['repeat']}: {record['wall_time_s']:.3f}s "
+            f"{mb_s:.1f} MB/s{flag}")
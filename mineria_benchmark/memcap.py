@@ -0,0 +1,337 @@
+"""
+Modo con memoria acotada (memcap): cada motor corre bajo un techo de memoria.
+
+Cada medición es un proceso nuevo (`python -m mineria_benchmark run
+--memory-limit N --spill-dir D --format json`) en el que:
+- el motor ajusta sus opciones (DuckDB memory_limit/temp_directory, heap y
+  spark.local.dir de Spark, POLARS_TEMP_DIR de Polars; ver limit_memory());
+- el techo se impone sobre todo el árbol de procesos con un cgroup de memoria
+  (v2 o v1) si se puede crear uno; si no, con resource.setrlimit en cada
+  proceso (RLIMIT_DATA, heredado por los workers) más un vigilante que suma el
+  RSS del árbol y lo termina al superar el techo.
+
+Cada medición queda como ok, spill (terminó volcando a disco: el directorio de
+spill llegó a tener datos, o el motor informó volcados; ver spilled_bytes()),
+oom, timeout o error, con su throughput.
+"""
+
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+from .defaults import DEFAULT_LIMITS_GB, GB, parse_size  # noqa: F401 (reexportados)
+from .runner import ROOT, subprocess_env
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Rastros de falta de memoria en stderr (Python, DuckDB, JVM, Rust/C++). Con
+# RLIMIT_DATA, la pila de un hilo nuevo también cuenta y su creación falla primero.
+OOM_MARKERS = ("MemoryError", "Out of Memory", "OutOfMemoryError", "memory allocation of",
+               "std::bad_alloc", "Cannot allocate memory", "can't start new thread")
+
+
+class Cgroup:
+    """cgroup de memoria creado para una medición (v2 o v1)."""
+
+    def __init__(self, path: str, version: int):
+        self.path = path
+        self.version = version
+
+    @classmethod
+    def create(cls, name: str, limit: int) -> Optional["Cgroup"]:
+        """Crea el cgroup con el techo `limit`; None si no hay cgroups escribibles."""
+        for version, parent in ((2, _cgroup_v2_parent()), (1, _cgroup_v1_parent())):
+            if parent is None:
+                continue
+            cgroup = cls(os.path.join(parent, name), version)
+            try:
+                os.makedirs(cgroup.path, exist_ok=True)
+                if version == 2:
+                    cgroup._write("memory.max", limit)
+                    if os.path.exists(os.path.join(cgroup.path, "memory.swap.max")):
+                        cgroup._write("memory.swap.max", 0)
+                else:
+                    cgroup._write("memory.limit_in_bytes", limit)
+                    if os.path.exists(os.path.join(cgroup.path, "memory.memsw.limit_in_bytes")):
+                        cgroup._write("memory.memsw.limit_in_bytes", limit)
+                return cgroup
+            except OSError:
+                cgroup.remove()
+        return None
+
+    @property
+    def label(self) -> str:
+        return f"cgroup-v{self.version}"
+
+    def _write(self, name: str, value) -> None:
+        with open(os.path.join(self.path, name), "w") as f:
+            f.write(str(value))
+
+    def _read(self, name: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, name), "r") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def add_self(self) -> None:
+        """Mueve el proceso actual (y sus futuros hijos) al cgroup."""
+        self._write("cgroup.procs", os.getpid())
+
+    def peak(self) -> Optional[int]:
+        value = self._read("memory.peak" if self.version == 2 else "memory.max_usage_in_bytes")
+        return int(value) if value and value.strip().isdigit() else None
+
+    def oom_kills(self) -> int:
+        text = self._read("memory.events" if self.version == 2 else "memory.oom_control") or ""
+        for line in text.splitlines():
+            key, _, value = line.partition(" ")
+            if key == "oom_kill":
+                return int(value)
+        return 0
+
+    def remove(self) -> None:
+        try:
+            os.rmdir(self.path)
+        except OSError:
+            pass
+
+
+def _cgroup_v2_parent(controller: str = "memory") -> Optional[str]:
+    if not os.path.exists(os.path.join(CGROUP_ROOT, "cgroup.controllers")):
+        return None
+    with open("/proc/self/cgroup", "r") as f:
+        relative = next((line.split("::", 1)[1].strip() for line in f if line.startswith("0::")), "/")
+    # Un proceso sólo puede estar en hojas: el cgroup propio debe delegar el controlador a sus hijos
+    for path in (os.path.join(CGROUP_ROOT, relative.lstrip("/")), CGROUP_ROOT):
+        try:
+            with open(os.path.join(path, "cgroup.subtree_control"), "r") as f:
+                if controller in f.read().split() and os.access(path, os.W_OK):
+                    return path
+        except OSError:
+            continue
+    return None
+
+
+def _cgroup_v1_parent(controller: str = "memory") -> Optional[str]:
+    mount = os.path.join(CGROUP_ROOT, controller)
+    if not os.path.exists(os.path.join(mount, "cgroup.procs")):
+        return None
+    relative = "/"
+    with open("/proc/self/cgroup", "r") as f:
+        for line in f:
+            _, controllers, path = line.strip().split(":", 2)
+            if controller in controllers.split(","):
+                relative = path
+    # En contenedores el montaje suele ser ya el cgroup propio
+    for path in (os.path.join(mount, relative.lstrip("/")), mount):
+        if os.path.isdir(path) and os.access(path, os.W_OK):
+            return path
+    return None
+
+
+def _limit_process(cgroup: Optional[Cgroup], limit: int) -> None:
+    """preexec_fn del proceso medido: entra al cgroup o fija el rlimit."""
+    if cgroup is not None:
+        cgroup.add_self()
+        return
+    # RLIMIT_DATA cuenta la memoria anónima escribible (no los mmap de archivos de
+    # sólo lectura ni las reservas PROT_NONE de la JVM), lo más cercano al RSS
+    kind = getattr(resource, "RLIMIT_DATA", resource.RLIMIT_AS)
+    resource.setrlimit(kind, (limit, limit))
+
+
+def _dir_bytes(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class TreeMonitor:
+    """Muestrea el RSS del árbol de procesos y el tamaño del directorio de spill.
+
+    Con `kill_above`, termina el árbol completo si el RSS total lo supera. Sin
+    `spill_dir` sólo se mide el RSS.
+    """
+
+    def __init__(self, pid: int, spill_dir: Optional[str], kill_above: Optional[int] = None,
+                 interval: float = 0.1):
+        self.pid = pid
+        self.spill_dir = spill_dir
+        self.kill_above = kill_above
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_spill = 0
+        self.killed = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+    def tree(self) -> List["psutil.Process"]:
+        import psutil
+
+        try:
+            root = psutil.Process(self.pid)
+            return [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    def kill_tree(self) -> None:
+        """Mata el árbol completo; un proceso que ya terminó se ignora."""
+        import psutil
+
+        for proc in self.tree():
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+
+    def _loop(self) -> None:
+        import psutil  # sólo al medir: la CLI no debe exigirlo
+
+        while not self._stop.is_set():
+            procs = self.tree()
+            rss = 0
+            for proc in procs:
+                try:
+                    rss += proc.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak_rss = max(self.peak_rss, rss)
+            if self.spill_dir is not None:
+                self.peak_spill = max(self.peak_spill, _dir_bytes(self.spill_dir))
+            if self.kill_above is not None and rss > self.kill_above and not self.killed:
+                self.killed = True
+                for proc in procs:
+                    try:
+                        proc.send_signal(signal.SIGKILL)
+                    except psutil.Error:
+                        pass
+            self._stop.wait(self.interval)
+
+
+def classify(returncode: Optional[int], stderr: str, oom_killed: bool, spilled: bool) -> str:
+    """ok | spill | oom | timeout | error.
+
+    Un OOM puede terminar en timeout: si el kernel mata un worker, el Pool de
+    multiprocessing espera su resultado para siempre.
+    """
+    if oom_killed or returncode == -signal.SIGKILL or any(m in stderr for m in OOM_MARKERS):
+        return "oom"
+    if returncode is None:
+        return "timeout"
+    if returncode != 0:
+        return "error"
+    return "spill" if spilled else "ok"
+
+
+def spilled_bytes(result: Optional[Dict], spill_dir_peak: int) -> int:
+    """Volcado a disco de una medición.
+
+    Si el motor lo informa (Spark, desde las métricas de sus stages: su
+    spark.local.dir siempre tiene archivos de shuffle) se usa ese valor; si
+    no, el tamaño máximo que llegó a tener el directorio de spill.
+    """
+    if result is not None and result.get("spilled_bytes") is not None:
+        return int(result["spilled_bytes"])
+    return spill_dir_peak
+
+
+def run_capped(engine: str, input_dir: str, limit: int, workers: Optional[int] = None,
+               timeout: Optional[float] = None) -> Dict:
+    """Ejecuta una medición bajo el techo `limit` (bytes) y devuelve su registro."""
+    spill_dir = tempfile.mkdtemp(prefix=f"memcap-{engine}-")
+    cgroup = Cgroup.create(f"mineria-{os.getpid()}-{engine}", limit)
+    # El proceso corre en ROOT: una ruta relativa se resuelve antes
+    cmd = [sys.executable, "-m", "mineria_benchmark", "run", "--engine", engine,
+           "--input", os.path.abspath(input_dir), "--format", "json",
+           "--memory-limit", str(limit), "--spill-dir", spill_dir]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+
+    record = {
+        "engine": engine,
+        "memory_limit_gb": limit / GB,
+        "enforcement": cgroup.label if cgroup is not None else "rlimit",
+        "workers": workers,
+    }
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                env=subprocess_env(), cwd=ROOT, preexec_fn=lambda: _limit_process(cgroup, limit))
+        monitor = TreeMonitor(proc.pid, spill_dir, kill_above=None if cgroup is not None else limit)
+        with monitor:
+            try:
+                stdout, stderr = proc.communicate(timeout=timeout)
+                returncode = proc.returncode
+            except subprocess.TimeoutExpired:
+                monitor.kill_tree()
+                stdout, stderr = proc.communicate()
+                returncode = None
+
+        oom_killed = monitor.killed or (cgroup is not None and cgroup.oom_kills() > 0)
+        if cgroup is not None and cgroup.peak() is not None:
+            # Incluye page cache cargada al cgroup (reclamable, no provoca OOM)
+            record["cgroup_peak_mb"] = cgroup.peak() / 1024**2
+    finally:
+        if cgroup is not None:
+            cgroup.remove()
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    result = json.loads(stdout) if returncode == 0 else None
+    spilled = spilled_bytes(result, monitor.peak_spill)
+    record.update(
+        outcome=classify(returncode, stderr, oom_killed, spilled > 0),
+        peak_rss_mb=monitor.peak_rss / 1024**2,
+        spill_mb=spilled / 1024**2,
+    )
+    if result is not None:
+        record.update(wall_time_s=result["wall_time_s"], mb_per_s=result["mb_per_s"],
+                      bytes=result["bytes"])
+    else:
+        lines = stderr.strip().splitlines()
+        record.update(wall_time_s=None, mb_per_s=None, error=lines[-1] if lines else None)
+    return record
+
+
+def run_memcap(engines: List[str], input_dir: str, limits: List[int],
+               workers: Optional[int] = None, repeat: int = 1,
+               timeout: Optional[float] = None, log=None) -> List[Dict]:
+    """Recorre motores x techos; un registro por medición."""
+    records = []
+    for engine in engines:
+        for limit in limits:
+            for rep in range(repeat):
+                record = run_capped(engine, input_dir, limit, workers=workers, timeout=timeout)
+                record["repeat"] = rep
+                records.append(record)
+                if log is not None:
+                    log(record)
+    return records
+
+
+def format_record(record: Dict) -> str:
+    head = (f"[{record['engine']}] {record['memory_limit_gb']:g}GB ({record['enforcement']}): "
+            f"{record['outcome']}")
+    if record.get("wall_time_s") is None:
+        return f"{head} {record.get('error') or ''}".rstrip()
+    return (f"{head} {record['wall_time_s']:.3f}s {record['mb_per_s']:.1f} MB/s "
+            f"pico {record['peak_rss_mb']:.0f} MB, spill {record['spill_mb']:.0f} MB")
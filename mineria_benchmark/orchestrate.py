@@ -0,0 +1,253 @@
+"""
+Orquestador local de la matriz completa (orchestrate): motores x datasets en
+una sola máquina, sin Terraform ni S3.
+
+run.sh lanza un par (experimento, tamaño) por vez en una EC2 y espera el
+resultado en S3. orchestrate() recorre todos los pares en local, cada medición
+en un proceso nuevo (`python -m mineria_benchmark run --format json`):
+- fijado a un conjunto de CPUs (formato de taskset: "0-3,6"): con un cgroup
+  cpuset (v2 o v1) si se puede crear uno, que el proceso medido no puede
+  ampliar; si no, con sched_setaffinity (lo que hace taskset), heredado por
+  todos sus hilos e hijos;
+- con el page cache vaciado antes de cada medición: "evict" saca sólo los
+  archivos del dataset (iopath.evict), "drop" vacía el de todo el sistema
+  (/proc/sys/vm/drop_caches, requiere root);
+- con un límite de tiempo que mata el árbol de procesos completo.
+
+Cada dataset se nombra GRUPO/TAMAÑO (p. ej. 5k/10) y cada medición exitosa
+escribe su log en results_dir/GRUPO/ex-MOTOR/TAMAÑO/output.log (output-N.log
+para la repetición N), la estructura que lee
+analysis_utils.procesar_logs_multi_formato. record.json, en la misma carpeta,
+guarda todas las repeticiones de la celda con su resultado, CPUs, caché y pico
+de RSS del árbol; con resume, las celdas completas no se vuelven a medir.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .defaults import CACHE_MODES, PIN_MODES
+from .engines import BenchmarkError, list_json_files
+from .engines.base import EXIT_INVALID_INPUT
+from .iopath import evict
+from .memcap import Cgroup, TreeMonitor, _cgroup_v1_parent, _cgroup_v2_parent, classify
+from .runner import ROOT, subprocess_env
+
+DROP_CACHES = "/proc/sys/vm/drop_caches"
+RECORD_FILE = "record.json"
+
+
+def parse_cpus(spec: str) -> List[int]:
+    """'0-3,6' -> [0, 1, 2, 3, 6]; deben estar entre las CPUs permitidas al proceso."""
+    cpus = set()
+    try:
+        for part in spec.split(","):
+            if not part.strip():
+                continue
+            first, _, last = part.partition("-")
+            cpus.update(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise BenchmarkError(f"lista de CPUs inválida '{spec}' (use el formato de taskset: 0-3,6)",
+                             EXIT_INVALID_INPUT) from None
+    allowed = os.sched_getaffinity(0)
+    if not cpus or not cpus <= allowed:
+        raise BenchmarkError(f"las CPUs '{spec}' no están disponibles (permitidas: "
+                             f"{','.join(map(str, sorted(allowed)))})", EXIT_INVALID_INPUT)
+    return sorted(cpus)
+
+
+def parse_dataset(spec: str) -> Tuple[str, str, str]:
+    """'GRUPO/TAMAÑO=DIRECTORIO' -> (grupo, tamaño, directorio)."""
+    label, _, path = spec.partition("=")
+    group, _, size = label.partition("/")
+    if not group or not size or "/" in size or not path:
+        raise BenchmarkError(f"dataset inválido '{spec}' (use GRUPO/TAMAÑO=DIRECTORIO, p. ej. 5k/10=/datos)",
+                             EXIT_INVALID_INPUT)
+    if not os.path.isdir(path):
+        raise BenchmarkError(f"'{path}' no es un directorio válido.", EXIT_INVALID_INPUT)
+    return group, size, path
+
+
+class CpusetCgroup(Cgroup):
+    """cgroup cpuset creado para el barrido (v2 o v1)."""
+
+    @classmethod
+    def create(cls, name: str, cpus: List[int]) -> Optional["CpusetCgroup"]:
+        """Crea el cgroup limitado a `cpus`; None si no hay cgroups cpuset escribibles."""
+        for version, parent in ((2, _cgroup_v2_parent("cpuset")), (1, _cgroup_v1_parent("cpuset"))):
+            if parent is None:
+                continue
+            cgroup = cls(os.path.join(parent, name), version)
+            try:
+                # En v1 un cpuset sin memoria asignada no admite procesos: se heredan las del padre
+                with open(os.path.join(parent, "cpuset.mems.effective" if version == 2 else "cpuset.mems")) as f:
+                    mems = f.read().strip()
+                os.makedirs(cgroup.path, exist_ok=True)
+                cgroup._write("cpuset.cpus", ",".join(map(str, cpus)))
+                cgroup._write("cpuset.mems", mems)
+                return cgroup
+            except OSError:
+                cgroup.remove()
+        return None
+
+
+def _pin_process(cgroup: Optional[Cgroup], cpus: Optional[List[int]]) -> None:
+    """preexec_fn de la medición: entra al cgroup o fija la afinidad."""
+    if cgroup is not None:
+        cgroup.add_self()
+    elif cpus is not None:
+        os.sched_setaffinity(0, cpus)
+
+
+def reset_cache(mode: str, files: List[str]) -> int:
+    """Vacía el page cache según `mode` y devuelve los bytes desalojados (0 si no se sabe)."""
+    if mode == "evict":
+        return evict(files)
+    if mode == "drop":
+        os.sync()
+        try:
+            with open(DROP_CACHES, "w") as f:
+                f.write("3")
+        except OSError as e:
+            raise BenchmarkError(f"--cache drop requiere root ({DROP_CACHES}: {e})", EXIT_INVALID_INPUT) from e
+    return 0
+
+
+def run_cell(engine: str, input_dir: str, cgroup: Optional[Cgroup] = None,
+             cpus: Optional[List[int]] = None, workers: Optional[int] = None,
+             timeout: Optional[float] = None) -> Tuple[Dict, Optional[Dict]]:
+    """Ejecuta una medición fijada a las CPUs; devuelve (registro, resultado JSON o None)."""
+    cmd = [sys.executable, "-m", "mineria_benchmark", "run", "--engine", engine,
+           "--input", os.path.abspath(input_dir), "--format", "json"]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                            env=subprocess_env(), cwd=ROOT, preexec_fn=lambda: _pin_process(cgroup, cpus))
+    monitor = TreeMonitor(proc.pid, None)
+    with monitor:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+            returncode = proc.returncode
+        except subprocess.TimeoutExpired:
+            monitor.kill_tree()
+            stdout, stderr = proc.communicate()
+            returncode = None
+
+    result = json.loads(stdout) if returncode == 0 else None
+    record = {
+        "outcome": classify(returncode, stderr, False, False),
+        "peak_rss_mb": monitor.peak_rss / 1024**2,
+    }
+    if result is not None:
+        record.update(
+            wall_time_s=result["wall_time_s"],
+            prepare_s=result["prepare_s"],
+            run_s=result["run_s"],
+            mb_per_s=result["mb_per_s"],
+            files=result["files"],
+            bytes=result["bytes"],
+            workers=result["workers"],
+            counts=result["counts"],
+        )
+    else:
+        lines = stderr.strip().splitlines()
+        record.update(wall_time_s=None, mb_per_s=None, error=lines[-1] if lines else None)
+    return record, result
+
+
+def cell_dir(results_dir: str, group: str, engine: str, size: str) -> str:
+    return os.path.join(results_dir, group, f"ex-{engine}", size)
+
+
+def log_name(rep: int) -> str:
+    return "output.log" if rep == 0 else f"output-{rep}.log"
+
+
+def _completed(path: str, repeat: int) -> Optional[List[Dict]]:
+    """Registros de una celda ya medida con `repeat` repeticiones exitosas, o None."""
+    try:
+        with open(os.path.join(path, RECORD_FILE), "r", encoding="utf-8") as f:
+            records = json.load(f)
+    except (OSError, ValueError):
+        return None
+    done = [r for r in records if r.get("outcome") == "ok" and os.path.exists(os.path.join(path, r["log"]))]
+    return records if len(done) >= repeat else None
+
+
+def orchestrate(engines: List[str], datasets: List[Tuple[str, str, str]], results_dir: str,
+                cpus: Optional[List[int]] = None, pin: str = "auto", cache: str = "evict",
+                workers: Optional[int] = None, repeat: int = 1, timeout: Optional[float] = None,
+                resume: bool = False, log=None) -> List[Dict]:
+    """Recorre motores x datasets; escribe logs y record.json por celda y devuelve todos los registros."""
+    if pin not in PIN_MODES or cache not in CACHE_MODES:
+        raise BenchmarkError(f"pin debe ser uno de {PIN_MODES} y cache uno de {CACHE_MODES}", EXIT_INVALID_INPUT)
+    if cpus is None and pin != "none":
+        cpus = sorted(os.sched_getaffinity(0))
+    if cache == "drop" and not os.access(DROP_CACHES, os.W_OK):
+        raise BenchmarkError(f"--cache drop requiere root (no se puede escribir {DROP_CACHES})", EXIT_INVALID_INPUT)
+
+    cgroup = None
+    if pin in ("auto", "cgroup"):
+        cgroup = CpusetCgroup.create(f"mineria-{os.getpid()}-cpuset", cpus)
+        if cgroup is None and pin == "cgroup":
+            raise BenchmarkError("no hay un cgroup cpuset escribible; use --pin affinity", EXIT_INVALID_INPUT)
+    pinning = cgroup.label if cgroup is not None else ("affinity" if pin != "none" else "none")
+    if workers is None and cpus is not None:
+        workers = len(cpus)
+
+    records = []
+    try:
+        for group, size, input_dir in datasets:
+            files = list_json_files(input_dir)
+            for engine in engines:
+                path = cell_dir(results_dir, group, engine, size)
+                previous = _completed(path, repeat) if resume else None
+                if previous is not None:
+                    records.extend(previous)
+                    if log is not None:
+                        log({**previous[0], "outcome": "reused"})
+                    continue
+                os.makedirs(path, exist_ok=True)
+                # Un log viejo de otra corrida no debe mezclarse con esta
+                for name in os.listdir(path):
+                    if name.startswith("output") and name.endswith(".log"):
+                        os.remove(os.path.join(path, name))
+
+                cell = []
+                for rep in range(repeat):
+                    evicted = reset_cache(cache, files)
+                    record = {"engine": engine, "group": group, "size": size, "input_dir": input_dir,
+                              "repeat": rep, "cpus": cpus, "pinning": pinning,
+                              "cache": {"mode": cache, "evicted_bytes": evicted}, "timeout": timeout,
+                              "timestamp": time.time()}
+                    measured, result = run_cell(engine, input_dir, cgroup=cgroup, cpus=cpus,
+                                                workers=workers, timeout=timeout)
+                    record.update(measured)
+                    if result is not None:
+                        record["log"] = log_name(rep)
+                        with open(os.path.join(path, record["log"]), "w", encoding="utf-8") as f:
+                            f.write(f"Execution time: {result['wall_time_s']:.6f} seconds\n{result['counts']}\n")
+                    cell.append(record)
+                    if log is not None:
+                        log(record)
+                # Se reescribe completo al final: su presencia marca una celda terminada
+                with open(os.path.join(path, RECORD_FILE), "w", encoding="utf-8") as f:
+                    json.dump(cell, f, indent=2)
+                records.extend(cell)
+    finally:
+        if cgroup is not None:
+            cgroup.remove()
+    return records
+
+
+def format_record(record: Dict) -> str:
+    head = f"[{record['engine']}] {record['group']}/{record['size']} #{record['repeat']} ({record['pinning']})"
+    if record["outcome"] == "reused":
+        return f"{head}: ya medido (resume)"
+    if record.get("wall_time_s") is None:
+        return f"{head}: {record['outcome']} {record.get('error') or ''}".rstrip()
+    return (f"{head}: {record['wall_time_s']:.3f}s {record['mb_per_s']:.1f} MB/s "
+            f"pico {record['peak_rss_mb']:.0f} MB")
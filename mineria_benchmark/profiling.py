@@ -0,0 +1,164 @@
+"""
+Perfilado de la ruta caliente de cada motor (--profile).
+
+- python / pandas: cProfile determinista del proceso principal y de cada
+  worker del Pool. Los perfiles de los workers se fusionan con el del proceso
+  principal y se escriben como:
+    profile-<motor>.prof       pstats fusionado (snakeviz, pstats)
+    profile-<motor>.collapsed  pilas colapsadas ("a;b;c <us>") para flamegraph.pl/speedscope
+    profile-<motor>-top.txt    top-N por tiempo acumulado
+- polars: LazyFrame.profile() (tiempos por nodo) + plan optimizado.
+- duckdb: perfil JSON de la consulta (enable_profiling) + top-N de operadores.
+- spark: métricas por stage desde la API REST del UI (o statusTracker).
+"""
+
+import cProfile
+import glob
+import io
+import os
+import pstats
+import shutil
+import tempfile
+from multiprocessing.util import Finalize
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_TOP = 25
+
+_worker_profiler: Optional[cProfile.Profile] = None
+
+
+def profile_prefix(out_dir: str, engine: str) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    return os.path.join(out_dir, f"profile-{engine}")
+
+
+def _dump_worker_profile(path: str) -> None:
+    if _worker_profiler is not None:
+        _worker_profiler.disable()
+        _worker_profiler.dump_stats(path)
+
+
+def start_worker_profile(worker_dir: str) -> None:
+    """Initializer del Pool: perfila el worker completo y lo vuelca al salir.
+
+    El volcado corre como finalizador de multiprocessing, que se ejecuta cuando
+    el worker termina tras pool.close() + pool.join() (no con terminate()).
+    """
+    global _worker_profiler
+    _worker_profiler = cProfile.Profile()
+    path = os.path.join(worker_dir, f"worker-{os.getpid()}.prof")
+    Finalize(None, _dump_worker_profile, args=(path,), exitpriority=16)
+    _worker_profiler.enable()
+
+
+class PoolProfiler:
+    """cProfile del proceso principal y de todos los workers de un Pool."""
+
+    def __init__(self, out_dir: str, engine: str, top: int = DEFAULT_TOP):
+        self.prefix = profile_prefix(out_dir, engine)
+        self.top = top
+        self.worker_dir = tempfile.mkdtemp(prefix=f"profile-{engine}-")
+        self.main = cProfile.Profile()
+
+    def pool_kwargs(self) -> Dict:
+        return {"initializer": start_worker_profile, "initargs": (self.worker_dir,)}
+
+    def start(self) -> None:
+        self.main.enable()
+
+    def stop(self) -> List[str]:
+        """Detiene el perfil principal, fusiona los workers y escribe los archivos."""
+        self.main.disable()
+        stats = pstats.Stats(self.main)
+        for path in sorted(glob.glob(os.path.join(self.worker_dir, "worker-*.prof"))):
+            stats.add(path)
+        shutil.rmtree(self.worker_dir, ignore_errors=True)
+        return write_pstats(stats, self.prefix, self.top)
+
+
+def write_pstats(stats: pstats.Stats, prefix: str, top: int = DEFAULT_TOP) -> List[str]:
+    prof_path = f"{prefix}.prof"
+    stats.dump_stats(prof_path)
+
+    collapsed_path = f"{prefix}.collapsed"
+    with open(collapsed_path, "w", encoding="utf-8") as f:
+        for stack, us in collapsed_stacks(stats.stats):
+            f.write(f"{stack} {us}\n")
+
+    top_path = f"{prefix}-top.txt"
+    buf = io.StringIO()
+    stats.stream = buf
+    stats.sort_stats("cumulative").print_stats(top)
+    with open(top_path, "w", encoding="utf-8") as f:
+        f.write(buf.getvalue())
+
+    return [prof_path, collapsed_path, top_path]
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # funciones built-in: "<built-in method ...>"
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(raw: Dict, max_depth: int = 64) -> List[Tuple[str, int]]:
+    """Reconstruye pilas colapsadas a partir del grafo de llamadas de pstats.
+
+    cProfile no guarda pilas completas: el tiempo de cada arista caller->callee
+    se reparte por el árbol en proporción a su tiempo acumulado.
+    """
+    callees: Dict = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    roots = [func for func, stat in raw.items() if not stat[4]]
+    out: Dict[str, float] = {}
+    # Ramas por debajo de este umbral se descartan para acotar la exploración
+    min_s = sum(stat[2] for stat in raw.values()) * 1e-4
+
+    def walk(func, stack: List[str], seen: frozenset, scale: float) -> None:
+        cc, nc, tt, ct, _callers = raw[func]
+        stack = stack + [_label(func)]
+        key = ";".join(stack)
+        out[key] = out.get(key, 0.0) + tt * scale
+        if len(stack) >= max_depth:
+            return
+        for callee, edge_ct in callees.get(func, []):
+            if callee in seen or callee not in raw:
+                continue
+            callee_ct = raw[callee][3]
+            if callee_ct <= 0 or edge_ct * scale < min_s:
+                continue
+            # tiempo propio del callee atribuible a esta rama
+            walk(callee, stack, seen | {callee}, scale * min(edge_ct / callee_ct, 1.0))
+
+    for root in roots:
+        walk(root, [], frozenset([root]), 1.0)
+
+    stacks = [(k, int(round(v * 1e6))) for k, v in out.items()]
+    return [(k, us) for k, us in sorted(stacks) if us > 0]
+
+
+def write_table(path: str, header: List[str], rows: List[List]) -> str:
+    """Escribe una tabla de texto alineada (top-N de nodos/operadores/stages)."""
+    cells = [header] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(r[i]) for r in cells) for i in range(len(header))]
+    with open(path, "w", encoding="utf-8") as f:
+        for row in cells:
+            f.write("  ".join(c.rjust(w) for c, w in zip(row, widths)) + "\n")
+    return path
+
+
+def duckdb_operators(node: Dict, depth: int = 0) -> List[Tuple[int, str, float, int]]:
+    """Aplana el árbol del perfil JSON de DuckDB: (profundidad, operador, segundos, filas)."""
+    rows = []
+    name = node.get("operator_name") or node.get("name")
+    if name:
+        timing = node.get("operator_timing", node.get("timing", 0.0))
+        cardinality = node.get("operator_cardinality", node.get("cardinality", 0))
+        rows.append((depth, name, float(timing), int(cardinality)))
+    for child in node.get("children", []):
+        rows.extend(duckdb_operators(child, depth + 1 if name else depth))
+    return rows
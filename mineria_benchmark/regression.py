@@ -0,0 +1,263 @@
+"""
+Compuerta de regresiones de rendimiento (compare) contra líneas base guardadas.
+
+calcular_medias_medianas y calcular_y_graficar_consistencia describen
+resultados pasados, pero nada avisa cuando un cambio vuelve más lento a un
+motor. compare() corre la suite sobre datasets generados pequeños (los de
+matrix.build_dataset, reutilizados desde data_dir), cada medición en un
+proceso nuevo (orchestrate.run_cell) y con las repeticiones de los motores
+intercaladas, para que una deriva de la máquina afecte a todos por igual.
+
+Por motor y dataset se comparan las muestras de tres métricas con las de la
+línea base: wall_time_s y peak_rss_mb (peor si suben) y mb_per_s (peor si
+baja). Una métrica es regresión si la prueba de Mann-Whitney unilateral da
+p < alpha y la mediana empeoró al menos min_effect (relativo): con pocas
+repeticiones una diferencia mínima puede ser significativa, y una grande puede
+no serlo. El p-valor es exacto sin empates y n1*n2 <= EXACT_MAX_PAIRS, y usa
+la aproximación normal con corrección por empates en otro caso (sin scipy). Un
+conteo distinto al esperado o una medición fallida también hacen fallar la
+compuerta. peak_rss_mb se reporta pero no la hace fallar (ver GATED): es el
+máximo de muestras de TreeMonitor cada 0.1 s, así que un pico corto entre dos
+muestras no se ve y su variación es en parte ruido del muestreo.
+
+La línea base es un JSON con las muestras de cada motor y dataset, y la huella
+de la máquina donde se tomaron: tiempos de otra máquina no son comparables.
+"""
+
+import json
+import math
+import os
+import platform
+import socket
+import time
+from collections import Counter
+from functools import lru_cache
+from statistics import median
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .engines import BenchmarkError, list_json_files
+from .engines.base import EXIT_INVALID_INPUT
+from .matrix import build_dataset
+from .orchestrate import reset_cache, run_cell
+
+EXIT_REGRESSION = 5
+
+BASELINE_VERSION = 1
+
+# métrica -> True si un valor mayor es peor
+METRICS = {"wall_time_s": True, "peak_rss_mb": True, "mb_per_s": False}
+
+# Métricas cuya regresión hace fallar la compuerta; el resto sólo se informa
+GATED = ("wall_time_s", "mb_per_s")
+
+# Hasta aquí el p-valor se calcula con la distribución exacta de U
+EXACT_MAX_PAIRS = 400
+
+
+@lru_cache(maxsize=None)
+def _u_counts(n1: int, n2: int) -> Tuple[int, ...]:
+    """Cantidad de ordenamientos de n1 + n2 valores distintos por cada valor de U (0..n1*n2)."""
+    if n1 == 0 or n2 == 0:
+        return (1,)
+    counts = [0] * (n1 * n2 + 1)
+    # El mayor de todos es de x (supera a los n2 de y) o de y (no suma)
+    for u, c in enumerate(_u_counts(n1 - 1, n2)):
+        counts[u + n2] += c
+    for u, c in enumerate(_u_counts(n1, n2 - 1)):
+        counts[u] += c
+    return tuple(counts)
+
+
+def _midranks(values: Sequence[float]) -> List[float]:
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def mann_whitney(x: Sequence[float], y: Sequence[float]) -> Tuple[float, float]:
+    """U de `x` y p-valor unilateral de la hipótesis "x tiende a ser mayor que y"."""
+    n1, n2 = len(x), len(y)
+    if not n1 or not n2:
+        raise ValueError("mann_whitney necesita al menos una muestra por grupo")
+    values = list(x) + list(y)
+    u = sum(_midranks(values)[:n1]) - n1 * (n1 + 1) / 2
+    ties = Counter(values)
+    if len(ties) == len(values) and n1 * n2 <= EXACT_MAX_PAIRS:
+        counts = _u_counts(n1, n2)
+        return u, sum(counts[int(u):]) / sum(counts)
+    n = n1 + n2
+    tie_term = sum(t**3 - t for t in ties.values()) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0  # todos los valores iguales
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_samples(metric: str, base: Sequence[float], current: Sequence[float],
+                    alpha: float, min_effect: float) -> Dict:
+    """Compara dos muestras de `metric`: veredicto regression | improvement | same."""
+    higher_is_worse = METRICS[metric]
+    worse, better = (current, base) if higher_is_worse else (base, current)
+    u, p_worse = mann_whitney(worse, better)
+    _, p_better = mann_whitney(better, worse)
+    base_median, current_median = median(base), median(current)
+    change = (current_median - base_median) / base_median if base_median else 0.0
+    worse_change = change if higher_is_worse else -change
+    if p_worse < alpha and worse_change >= min_effect:
+        verdict = "regression"
+    elif p_better < alpha and -worse_change >= min_effect:
+        verdict = "improvement"
+    else:
+        verdict = "same"
+    return {
+        "metric": metric,
+        "base_median": base_median,
+        "current_median": current_median,
+        "change": change,
+        "p_value": min(p_worse, p_better),
+        # Delta de Cliff en la dirección "peor": 1 = toda muestra actual es peor que toda la base
+        "cliffs_delta": 2 * u / (len(base) * len(current)) - 1,
+        "verdict": verdict,
+        "gated": metric in GATED,
+    }
+
+
+def host_fingerprint() -> Dict:
+    return {
+        "hostname": socket.gethostname(),
+        "machine": platform.machine(),
+        "cpus": len(os.sched_getaffinity(0)),
+        "python": platform.python_version(),
+    }
+
+
+def load_baseline(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {"version": BASELINE_VERSION, "host": None, "entries": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BenchmarkError(f"no se pudo leer la línea base '{path}': {e}", EXIT_INVALID_INPUT) from e
+    if baseline.get("version") != BASELINE_VERSION:
+        raise BenchmarkError(f"la línea base '{path}' tiene otra versión; vuelva a grabarla con --update",
+                             EXIT_INVALID_INPUT)
+    return baseline
+
+
+def save_baseline(path: str, baseline: Dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def measure(engines: List[str], datasets: List[Dict], repeat: int = 5, cpus: Optional[List[int]] = None,
+            workers: Optional[int] = None, cache: str = "none", timeout: Optional[float] = None,
+            log=None) -> Dict[str, Dict[str, Dict]]:
+    """Muestras por motor y dataset: {motor: {dataset: {métrica: [...], "errors": [...]}}}."""
+    samples: Dict[str, Dict[str, Dict]] = {}
+    for dataset in datasets:
+        label = os.path.basename(dataset["path"])
+        files = list_json_files(dataset["path"])
+        for rep in range(repeat):
+            for engine in engines:
+                entry = samples.setdefault(engine, {}).setdefault(
+                    label, {**{metric: [] for metric in METRICS}, "errors": []})
+                reset_cache(cache, files)
+                record, result = run_cell(engine, dataset["path"], cpus=cpus, workers=workers, timeout=timeout)
+                if result is None:
+                    entry["errors"].append(f"{record['outcome']}: {record.get('error') or ''}".rstrip(": "))
+                elif result["counts"] != dataset["expected"]:
+                    entry["errors"].append(f"conteos distintos al esperado: {result['counts']}")
+                else:
+                    for metric in METRICS:
+                        entry[metric].append(record[metric])
+                if log is not None:
+                    log({"engine": engine, "dataset": label, "repeat": rep, **record})
+    return samples
+
+
+def compare(baseline: Dict, samples: Dict[str, Dict[str, Dict]], alpha: float = 0.05,
+            min_effect: float = 0.05) -> List[Dict]:
+    """Una fila por motor, dataset y métrica con su veredicto (o "new"/"error" por motor y dataset)."""
+    rows = []
+    for engine, by_dataset in samples.items():
+        for label, entry in by_dataset.items():
+            head = {"engine": engine, "dataset": label}
+            if entry["errors"]:
+                rows.append({**head, "metric": None, "verdict": "error", "error": entry["errors"][0]})
+                continue
+            base = baseline["entries"].get(engine, {}).get(label)
+            if base is None:
+                rows.append({**head, "metric": None, "verdict": "new"})
+                continue
+            for metric in METRICS:
+                rows.append({**head, **compare_samples(metric, base[metric], entry[metric], alpha, min_effect)})
+    return rows
+
+
+def update_baseline(baseline: Dict, samples: Dict[str, Dict[str, Dict]]) -> Dict:
+    """Reemplaza en la línea base las muestras de los pares medidos sin errores."""
+    entries = baseline["entries"]
+    for engine, by_dataset in samples.items():
+        for label, entry in by_dataset.items():
+            if not entry["errors"]:
+                entries.setdefault(engine, {})[label] = {
+                    **{metric: entry[metric] for metric in METRICS}, "timestamp": time.time()}
+    return {"version": BASELINE_VERSION, "host": host_fingerprint(), "entries": entries}
+
+
+def run_compare(engines: List[str], baseline_path: str, distributions: List[str], sizes_mb: List[float],
+                files: int, data_dir: str, seed: int = 0, repeat: int = 5, alpha: float = 0.05,
+                min_effect: float = 0.05, update: bool = False, cpus: Optional[List[int]] = None,
+                workers: Optional[int] = None, cache: str = "none", timeout: Optional[float] = None,
+                log=None, warn=None) -> List[Dict]:
+    """Mide la suite, la compara con la línea base y, con `update`, la regraba."""
+    if repeat < 2:
+        raise BenchmarkError("--repeat debe ser al menos 2 para comparar distribuciones", EXIT_INVALID_INPUT)
+    baseline = load_baseline(baseline_path)
+    host = host_fingerprint()
+    if baseline["host"] is not None and baseline["host"] != host and warn is not None:
+        warn(f"la línea base se tomó en otra máquina ({baseline['host']}); los tiempos pueden no ser comparables")
+    datasets = [build_dataset(data_dir, files, total_mb, distribution, seed=seed)
+                for distribution in distributions for total_mb in sizes_mb]
+    samples = measure(engines, datasets, repeat=repeat, cpus=cpus, workers=workers, cache=cache,
+                      timeout=timeout, log=log)
+    rows = compare(baseline, samples, alpha=alpha, min_effect=min_effect)
+    if update:
+        save_baseline(baseline_path, update_baseline(baseline, samples))
+    return rows
+
+
+def failed(rows: List[Dict]) -> bool:
+    return any(row["verdict"] == "error" or (row["verdict"] == "regression" and row["gated"]) for row in rows)
+
+
+_LABELS = {"regression": "REGRESIÓN", "improvement": "mejora", "same": "=", "new": "sin base", "error": "ERROR"}
+
+
+def format_report(rows: List[Dict]) -> str:
+    """Tabla compacta: una línea por motor, dataset y métrica."""
+    lines = [f"{'motor':<8} {'dataset':<28} {'métrica':<12} {'base':>10} {'actual':>10} {'cambio':>8} "
+             f"{'p':>6}  veredicto"]
+    for row in rows:
+        head = f"{row['engine']:<8} {row['dataset']:<28}"
+        if row["metric"] is None:
+            detail = f": {row['error']}" if row.get("error") else ""
+            lines.append(f"{head} {'-':<12} {_LABELS[row['verdict']]}{detail}")
+            continue
+        lines.append(f"{head} {row['metric']:<12} {row['base_median']:>10.3f} {row['current_median']:>10.3f} "
+                     f"{row['change']:>+8.1%} {row['p_value']:>6.3f}  {_LABELS[row['verdict']]}"
+                     f"{'' if row['gated'] else ' (informativa)'}")
+    counts = Counter(row["verdict"] for row in rows)
+    lines.append(", ".join(f"{_LABELS[v]}: {n}" for v, n in counts.items()))
+    return "\n".join(lines)
@@ -0,0 +1,91 @@
+"""
+Esquema canónico de resultados del benchmark.
+
+Todos los motores producen un BenchmarkResult. Se puede emitir:
+- como log (to_log): las dos líneas que esperan run.sh y
+  analysis_utils.procesar_logs_multi_formato;
+- como registro JSON (to_dict), con tasas y metadatos.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .engines import BUCKETS
+
+
+@dataclass
+class BenchmarkResult:
+    engine: str
+    input_dir: str
+    files: int
+    bytes: int
+    wall_time_s: float
+    counts: Dict[str, int]
+    workers: Optional[int] = None
+    import_s: float = 0.0
+    prepare_s: float = 0.0
+    run_s: float = 0.0
+    metrics: Optional[Dict] = None
+    startup: Optional[Dict] = None
+    profile: Optional[List[str]] = None
+    memory_limit: Optional[int] = None
+    spilled_bytes: Optional[int] = None
+    io: Optional[Dict] = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def rates(self) -> Dict[str, float]:
+        total = self.total
+        return {b: (self.counts.get(b, 0) / total if total else 0.0) for b in BUCKETS}
+
+    @property
+    def mb_per_s(self) -> float:
+        return (self.bytes / (1024**2)) / self.wall_time_s if self.wall_time_s > 0 else 0.0
+
+    def to_log(self) -> str:
+        return f"Execution time: {self.wall_time_s:.6f} seconds\n{self.counts}"
+
+    def to_dict(self) -> Dict:
+        record = {
+            "engine": self.engine,
+            "input_dir": self.input_dir,
+            "files": self.files,
+            "bytes": self.bytes,
+            "workers": self.workers,
+            "wall_time_s": self.wall_time_s,
+            "import_s": self.import_s,
+            "prepare_s": self.prepare_s,
+            "run_s": self.run_s,
+            "mb_per_s": self.mb_per_s,
+            "counts": dict(self.counts),
+            "total": self.total,
+            "rates": self.rates,
+            "timestamp": self.timestamp,
+        }
+        if self.metrics is not None:
+            record["metrics"] = self.metrics
+        if self.startup is not None:
+            record["startup"] = self.startup
+        if self.profile is not None:
+            record["profile"] = self.profile
+        if self.memory_limit is not None:
+            record["memory_limit"] = self.memory_limit
+        if self.spilled_bytes is not None:
+            record["spilled_bytes"] = self.spilled_bytes
+        if self.io is not None:
+            record["io"] = self.io
+        return record
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def total_bytes(paths) -> int:
+    return sum(os.path.getsize(p) for p in paths)
@@ -0,0 +1,127 @@
+"""
+Ejecución de un motor con la medición estándar del benchmark.
+
+El tiempo medido cubre prepare() + run(), igual que los main.py originales
+(validación, arranque del Pool / conexión / SparkSession y procesamiento).
+teardown() queda fuera de la medición. prepare_s y run_s se reportan por
+separado para poder descontar el arranque en datasets pequeños.
+
+Con profile_dir, el motor escribe su perfil (ver profiling.py) y las rutas
+quedan en BenchmarkResult.profile. Con memory_limit, el motor ajusta sus
+propias opciones de memoria (el límite sobre el proceso lo impone memcap.py).
+Con io_strategy, los motores que leen desde Python usan esa ruta de lectura
+(iopath.py); con cold_cache, los archivos de entrada salen del page cache
+antes de medir, y ambos quedan en BenchmarkResult.io.
+"""
+
+import os
+import time
+from contextlib import nullcontext
+from typing import Dict, Optional
+
+from .engines import BenchmarkError, Engine, get_engine, list_json_files, normalize_counts
+from .results import BenchmarkResult, total_bytes
+
+# Raíz del repo: los subprocesos deben poder importar mineria_benchmark
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_engine(engine: Engine, input_dir: str, sampler=None,
+               profile_dir: Optional[str] = None,
+               memory_limit: Optional[int] = None,
+               spill_dir: Optional[str] = None,
+               io_strategy: Optional[str] = None,
+               cold_cache: bool = False) -> BenchmarkResult:
+    """Ejecuta `engine` sobre `input_dir` y devuelve el resultado canónico.
+
+    `sampler` es opcional y debe ser un context manager con summary(),
+    como benchmark_utils.MetricsSampler.
+    """
+    if profile_dir is not None:
+        engine.start_profile(profile_dir)
+    if memory_limit is not None:
+        engine.limit_memory(memory_limit, spill_dir)
+    if io_strategy is not None:
+        engine.use_io(io_strategy)
+    evicted = None
+    if cold_cache:
+        from .iopath import evict
+        evicted = evict(list_json_files(input_dir)) if os.path.isdir(input_dir) else 0
+
+    with sampler if sampler is not None else nullcontext():
+        t0 = time.perf_counter()
+        try:
+            engine.prepare(input_dir)
+            t1 = time.perf_counter()
+            try:
+                counts = engine.run()
+            except BenchmarkError:
+                raise
+            except Exception as e:
+                raise BenchmarkError(f"falló la ejecución: {e}") from e
+            t2 = time.perf_counter()
+        finally:
+            engine.teardown()
+
+    profile = engine.finish_profile() if profile_dir is not None else None
+    io = None
+    if io_strategy is not None or cold_cache:
+        io = {"strategy": io_strategy, "cold_cache": cold_cache, "evicted_bytes": evicted,
+              **(engine.io_stats or {})}
+
+    return BenchmarkResult(
+        engine=engine.name,
+        input_dir=input_dir,
+        files=len(engine.files),
+        bytes=total_bytes(engine.files),
+        workers=engine.workers,
+        wall_time_s=t2 - t0,
+        counts=normalize_counts(counts),
+        prepare_s=t1 - t0,
+        run_s=t2 - t1,
+        metrics=sampler.summary() if sampler is not None else None,
+        profile=profile,
+        memory_limit=memory_limit,
+        spilled_bytes=engine.spilled_bytes,
+        io=io,
+    )
+
+
+# Variables de entorno que fijan el paralelismo de librerías con pool de hilos global
+WORKER_ENV_VARS = ("POLARS_MAX_THREADS", "RAYON_NUM_THREADS")
+
+
+def subprocess_env() -> Dict[str, str]:
+    """Entorno para lanzar `python -m mineria_benchmark ...` con ROOT en PYTHONPATH."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    return env
+
+
+def apply_worker_env(workers: int) -> None:
+    """Fija el número de hilos de las librerías que lo leen al importarse."""
+    for var in WORKER_ENV_VARS:
+        os.environ[var] = str(workers)
+
+
+def run_named_engine(name: str, input_dir: str, sampler=None,
+                     profile_dir: Optional[str] = None,
+                     workers: Optional[int] = None,
+                     memory_limit: Optional[int] = None,
+                     spill_dir: Optional[str] = None,
+                     io_strategy: Optional[str] = None,
+                     cold_cache: bool = False) -> BenchmarkResult:
+    """Atajo: resuelve el motor por nombre en el registro y lo ejecuta.
+
+    La importación del motor (pyspark, polars...) se mide aparte en import_s.
+    """
+    if workers is not None:
+        apply_worker_env(workers)
+    t0 = time.perf_counter()
+    engine_cls = get_engine(name)
+    import_s = time.perf_counter() - t0
+    result = run_engine(engine_cls(workers=workers), input_dir, sampler=sampler, profile_dir=profile_dir,
+                        memory_limit=memory_limit, spill_dir=spill_dir, io_strategy=io_strategy,
+                        cold_cache=cold_cache)
+    result.import_s = import_s
+    return result
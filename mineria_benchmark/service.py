@@ -0,0 +1,364 @@
+"""
+Servicio caliente (serve) y cliente de carga (loadtest).
+
+Cada `main.py` paga el arranque completo (intérprete, Pool, conexión de
+DuckDB, SparkSession/JVM) y lo descarta. `serve` levanta un motor una sola vez
+(engine.start()) y atiende consultas por HTTP en localhost o en un socket Unix,
+reutilizando el Pool pre-forkeado, la conexión persistente o la SparkSession:
+
+  POST /query  {"query": "count", "input": "/dir"}
+               {"query": "rollup", "inputs": ["/dir/dia1", "/dir/dia2"]}
+  GET  /health
+
+Las respuestas incluyen los conteos (por entrada y total en rollup) y la
+latencia medida en el servidor. Los motores no son seguros entre hilos (un
+Pool, una conexión, un estado de archivos), así que las consultas se
+serializan: con concurrencia, la latencia incluye la espera en cola.
+
+`loadtest` mide latencia p50/p99 y consultas/s con N clientes concurrentes y,
+como referencia, la ruta fría: lanzar ex-<motor>/main.py por consulta.
+"""
+
+import http.client
+import http.server
+import json
+import os
+import shutil
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+from .defaults import DEFAULT_PORT
+from .engines import BenchmarkError, Engine, get_engine, normalize_counts
+from .engines.base import EXIT_INVALID_INPUT, EXIT_RUN_ERROR
+from .runner import ROOT, apply_worker_env, subprocess_env
+
+
+class QueryService:
+    """Un motor caliente que responde consultas de conteo y rollup."""
+
+    def __init__(self, engine_name: str, workers: Optional[int] = None):
+        if workers is not None:
+            apply_worker_env(workers)
+        t0 = time.perf_counter()
+        self.engine: Engine = get_engine(engine_name)(workers=workers)
+        self.engine.start()
+        self.startup_s = time.perf_counter() - t0
+        self.started_at = time.time()
+        self.served = 0
+        self._lock = threading.Lock()
+
+    def query(self, request: Dict) -> Dict:
+        kind = request.get("query", "count") if isinstance(request, dict) else None
+        if kind == "count" and isinstance(request.get("input"), str):
+            inputs = [request["input"]]
+        elif kind == "rollup" and isinstance(request.get("inputs"), list) and request["inputs"]:
+            inputs = [str(path) for path in request["inputs"]]
+        else:
+            raise BenchmarkError("consulta inválida: use {'query': 'count', 'input': dir} "
+                                 "o {'query': 'rollup', 'inputs': [dir, ...]}", EXIT_INVALID_INPUT)
+
+        t0 = time.perf_counter()
+        with self._lock:
+            waited = time.perf_counter() - t0
+            by_input = {path: self._count(path) for path in inputs}
+            self.served += 1
+        total = normalize_counts({})
+        for counts in by_input.values():
+            for bucket, n in counts.items():
+                total[bucket] += n
+        response = {"engine": self.engine.name, "query": kind, "counts": total,
+                    "latency_s": time.perf_counter() - t0, "queue_s": waited}
+        if kind == "rollup":
+            response["by_input"] = by_input
+        return response
+
+    def _count(self, input_dir: str) -> Dict[str, int]:
+        self.engine.prepare(input_dir)
+        try:
+            return normalize_counts(self.engine.run())
+        except BenchmarkError:
+            raise
+        except Exception as e:
+            raise BenchmarkError(f"falló la ejecución: {e}") from e
+
+    def health(self) -> Dict:
+        return {"engine": self.engine.name, "workers": self.engine.workers,
+                "startup_s": self.startup_s, "uptime_s": time.time() - self.started_at,
+                "served": self.served}
+
+    def close(self) -> None:
+        self.engine.teardown()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: el cliente reutiliza la conexión
+
+    def _reply(self, status: int, body: Dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, self.server.service.health())
+        else:
+            self._reply(404, {"error": f"ruta desconocida {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/query":
+            self._reply(404, {"error": f"ruta desconocida {self.path}"})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError as e:
+            self._reply(400, {"error": f"JSON inválido: {e}", "exit_code": EXIT_INVALID_INPUT})
+            return
+        if not isinstance(request, dict):
+            self._reply(400, {"error": "la consulta debe ser un objeto JSON", "exit_code": EXIT_INVALID_INPUT})
+            return
+        try:
+            self._reply(200, self.server.service.query(request))
+        except BenchmarkError as e:
+            self._reply(400, {"error": str(e), "exit_code": e.exit_code})
+        except Exception as e:
+            # Un fallo inesperado no debe matar el hilo sin responder
+            self._reply(500, {"error": f"{type(e).__name__}: {e}", "exit_code": EXIT_RUN_ERROR})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _TCPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)  # BaseHTTPRequestHandler espera (host, puerto)
+
+
+def make_server(service: QueryService, port: int = DEFAULT_PORT, socket_path: Optional[str] = None):
+    """Servidor HTTP en 127.0.0.1:`port` o, con `socket_path`, en un socket Unix."""
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixServer(socket_path, _Handler)
+    else:
+        server = _TCPServer(("127.0.0.1", port), _Handler)
+    server.service = service
+    return server
+
+
+def address_of(server) -> str:
+    if isinstance(server, _UnixServer):
+        return f"unix://{server.server_address}"
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ServiceClient:
+    """Cliente HTTP (TCP o socket Unix) con conexión persistente; uno por hilo."""
+
+    def __init__(self, address: str, timeout: Optional[float] = None):
+        url = urlparse(address)
+        if url.scheme == "unix":
+            self.conn = _UnixHTTPConnection(url.path, timeout=timeout)
+        else:
+            self.conn = http.client.HTTPConnection(url.hostname, url.port or DEFAULT_PORT, timeout=timeout)
+
+    def _request(self, method: str, path: str, body: Optional[Dict] = None) -> Dict:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        self.conn.request(method, path, body=payload, headers=headers)
+        response = self.conn.getresponse()
+        data = json.loads(response.read() or b"{}")
+        if response.status != 200:
+            raise BenchmarkError(data.get("error", f"HTTP {response.status}"),
+                                 data.get("exit_code", EXIT_INVALID_INPUT))
+        return data
+
+    def query(self, request: Dict) -> Dict:
+        return self._request("POST", "/query", request)
+
+    def health(self) -> Dict:
+        return self._request("GET", "/health")
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _summary(mode: str, latencies: List[float], elapsed: float, errors: int, **extra) -> Dict:
+    return {
+        "mode": mode,
+        **extra,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "p50_s": percentile(latencies, 0.50),
+        "p99_s": percentile(latencies, 0.99),
+        "mean_s": sum(latencies) / len(latencies) if latencies else None,
+        "qps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def load_test(address: str, request: Dict, concurrency: int, requests: int) -> Dict:
+    """`requests` consultas repartidas entre `concurrency` clientes concurrentes."""
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    latencies: List[float] = []
+    server_latencies: List[float] = []
+    errors: List[str] = []
+
+    def client_loop():
+        client = ServiceClient(address)
+        try:
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                t0 = time.perf_counter()
+                try:
+                    response = client.query(request)
+                except (BenchmarkError, OSError, http.client.HTTPException) as e:
+                    with lock:
+                        errors.append(str(e))
+                    client.close()
+                    client = ServiceClient(address)
+                    continue
+                elapsed = time.perf_counter() - t0
+                with lock:
+                    latencies.append(elapsed)
+                    server_latencies.append(response["latency_s"])
+        finally:
+            client.close()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(client_loop) for _ in range(concurrency)]:
+            future.result()
+    summary = _summary("warm", latencies, time.perf_counter() - t0, len(errors), concurrency=concurrency)
+    summary["server_p50_s"] = percentile(server_latencies, 0.50)
+    if errors:
+        summary["last_error"] = errors[-1]
+    return summary
+
+
+def cold_baseline(engine: str, input_dir: str, runs: int, workers: Optional[int] = None,
+                  timeout: Optional[float] = None) -> Dict:
+    """Ruta fría: un proceso ex-<motor>/main.py por consulta, en serie.
+
+    Con los mismos `workers` que el servicio caliente, la diferencia es sólo el arranque.
+    """
+    script = os.path.join(ROOT, f"ex-{engine}", "main.py")
+    cmd = [sys.executable, script, "--input", input_dir]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+    latencies: List[float] = []
+    errors = 0
+    t_start = time.perf_counter()
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        if proc.returncode == 0:
+            latencies.append(time.perf_counter() - t0)
+        else:
+            errors += 1
+    return _summary("cold", latencies, time.perf_counter() - t_start, errors, concurrency=1, workers=workers)
+
+
+def format_summary(summary: Dict) -> str:
+    if summary["p50_s"] is None:
+        return (f"{summary['mode']} c={summary['concurrency']}: sin respuestas ({summary['errors']} errores) "
+                f"{summary.get('last_error') or ''}").rstrip()
+    return (f"{summary['mode']:>4} c={summary['concurrency']:<3} p50 {summary['p50_s'] * 1000:.1f} ms  "
+            f"p99 {summary['p99_s'] * 1000:.1f} ms  {summary['qps']:.2f} qps  "
+            f"({summary['requests']} consultas, {summary['errors']} errores)")
+
+
+def serve(engine_name: str, port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+          workers: Optional[int] = None) -> None:
+    """Levanta el motor y atiende consultas hasta Ctrl-C/SIGTERM."""
+    service = QueryService(engine_name, workers=workers)
+    server = make_server(service, port=port, socket_path=socket_path)
+    print(f"[{engine_name}] servicio listo en {address_of(server)} (arranque {service.startup_s:.3f}s)",
+          file=sys.stderr, flush=True)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+@contextmanager
+def spawned_service(engine_name: str, workers: Optional[int] = None,
+                    timeout: float = 120.0) -> Iterator[str]:
+    """Lanza `serve` en un proceso aparte sobre un socket Unix; entrega su dirección."""
+    socket_dir = tempfile.mkdtemp(prefix="mineria-")
+    socket_path = os.path.join(socket_dir, "service.sock")
+    cmd = [sys.executable, "-m", "mineria_benchmark", "serve", "--engine", engine_name,
+           "--socket", socket_path]
+    if workers is not None:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, env=subprocess_env(), cwd=ROOT)
+    address = f"unix://{socket_path}"
+    try:
+        _wait_ready(proc, address, timeout)
+        yield address
+    finally:
+        proc.terminate()
+        proc.wait()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+def _wait_ready(proc: subprocess.Popen, address: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise BenchmarkError(f"el servicio terminó al arrancar (código {proc.returncode})")
+        try:
+            client = ServiceClient(address, timeout=5)
+            client.health()
+            client.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise BenchmarkError(f"el servicio no respondió en {timeout:.0f}s")
@@ -0,0 +1,512 @@
+"""
+Ejecución por shards con un coordinador y workers (modo shard) para los
+motores que no son Spark.
+
+El coordinador reparte la lista de archivos de un directorio (o de un
+manifiesto, una ruta por línea) en shards de bytes parecidos y los despacha a
+workers que se conectan por multiprocessing.connection (TCP con authkey):
+- procesos locales lanzados por el propio coordinador (`--local-workers N`), o
+- otros hosts que corren `python -m mineria_benchmark worker --connect
+  HOST:PUERTO` y ven los mismos archivos.
+
+Cada worker arma el shard como un directorio propio y corre la lógica
+existente del motor sobre él (prepare() + run(), con los recursos del motor
+levantados una sola vez, como en el modo servicio). Con transfer="link" el
+directorio tiene enlaces simbólicos a los archivos (sistema de archivos
+compartido; --root remapea el punto de montaje); con transfer="copy" los
+archivos se copian antes de contar, como una descarga de un object store
+(ObjectStore es ese stub: un directorio cuyas claves son rutas relativas). Si
+la entrada está compactada, el shard lleva las entradas de su índice.
+
+El resultado de cada shard es un histograma parcial {bucket: n} que se suma
+(merge_counts). Un shard cuyo worker devuelve error, se desconecta o pasa de
+`shard_timeout` se vuelve a encolar (hasta `max_attempts` intentos); cuando la
+cola está vacía y un shard lleva más de `slow_factor` veces lo esperado (según
+los segundos por byte de los shards ya terminados), se despacha una copia a un
+worker libre y gana el primer resultado. Cada shard se suma exactamente una vez.
+"""
+
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .defaults import DEFAULT_MAX_ATTEMPTS, DEFAULT_SLOW_FACTOR
+from .engines import INDEX_FILE, BenchmarkError, get_engine, list_json_files, load_index, merge_counts, normalize_counts
+from .engines.base import EXIT_INVALID_INPUT, EXIT_READ_ERROR, EXIT_RUN_ERROR
+from .runner import ROOT, apply_worker_env, subprocess_env
+
+# Variable con la authkey de los workers locales (no va en la línea de comandos)
+AUTHKEY_ENV = "MINERIA_AUTHKEY"
+
+# Espera entre revisiones de estado (shards lentos, timeouts, fin)
+POLL_S = 0.05
+
+# Un shard no se considera lento antes de este tiempo, aunque lo esperado sea menor
+MIN_SLOW_S = 1.0
+
+TRANSFERS = ("link", "copy")
+
+
+class Shard(NamedTuple):
+    """Grupo de archivos que procesa un worker; `files` son claves relativas a la raíz."""
+    id: int
+    files: List[str]
+    bytes: int
+
+
+def manifest_files(manifest: str) -> List[str]:
+    """Rutas absolutas de un manifiesto: una por línea, relativas a su directorio; '#' comenta."""
+    base = os.path.dirname(os.path.abspath(manifest))
+    try:
+        with open(manifest, "r", encoding="utf-8") as f:
+            entries = [line.strip() for line in f]
+    except OSError as e:
+        raise BenchmarkError(f"no se pudo leer el manifiesto '{manifest}': {e}", EXIT_INVALID_INPUT) from e
+    files = [os.path.normpath(os.path.join(base, e)) for e in entries if e and not e.startswith("#")]
+    missing = [f for f in files if not os.path.isfile(f)]
+    if missing:
+        raise BenchmarkError(f"el manifiesto lista archivos inexistentes: {', '.join(missing[:3])}",
+                             EXIT_INVALID_INPUT)
+    return files
+
+
+def plan_shards(files: List[str], shards: int) -> Tuple[str, List[Shard]]:
+    """Reparte los archivos no vacíos en hasta `shards` grupos de bytes parecidos.
+
+    Asignación greedy de mayor a menor tamaño al shard con menos bytes (LPT);
+    dentro de cada shard se conserva el orden original. Devuelve la raíz común y
+    los shards con rutas relativas a ella.
+    """
+    sizes = {path: os.path.getsize(path) for path in files}
+    files = [path for path in files if sizes[path]]
+    if not files:
+        raise BenchmarkError("no hay archivos JSON no vacíos para repartir", EXIT_READ_ERROR)
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+    n = max(1, min(shards, len(files)))
+    groups: List[List[str]] = [[] for _ in range(n)]
+    loads = [0] * n
+    for path in sorted(files, key=lambda p: sizes[p], reverse=True):
+        i = loads.index(min(loads))
+        groups[i].append(path)
+        loads[i] += sizes[path]
+    order = {path: i for i, path in enumerate(files)}
+    return root, [
+        Shard(i, [os.path.relpath(path, root) for path in sorted(group, key=order.get)], load)
+        for i, (group, load) in enumerate(zip(groups, loads))
+    ]
+
+
+class ObjectStore:
+    """Stub local de un object store: un directorio cuyas claves son rutas relativas."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def get(self, key: str, dest: str) -> int:
+        """Descarga el objeto `key` en `dest` y devuelve sus bytes."""
+        shutil.copyfile(os.path.join(self.root, key), dest)
+        return os.path.getsize(dest)
+
+
+def shard_file_name(i: int, key: str) -> str:
+    """Nombre único dentro del directorio del shard; termina en .json para que los motores lo lean."""
+    name = f"{i:05d}-{os.path.basename(key)}"
+    return name if name.endswith(".json") else name + ".json"
+
+
+def materialize(task: Dict, root: str, transfer: str, dest: str) -> None:
+    """Arma en `dest` el directorio del shard (enlaces o copias) y su índice si lo hay."""
+    store = ObjectStore(root)
+    names = {}
+    for i, key in enumerate(task["files"]):
+        names[key] = shard_file_name(i, key)
+        target = os.path.join(dest, names[key])
+        if transfer == "copy":
+            store.get(key, target)
+        else:
+            os.symlink(os.path.join(root, key), target)
+    if task.get("index"):
+        index = dict(task["index"], shards=[dict(entry, file=names[key]) for key, entry in task["index"]["shards"]])
+        with open(os.path.join(dest, INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+
+def serve_worker(address: Tuple[str, int], authkey: bytes, root: Optional[str] = None,
+                 transfer: str = "link", scratch: Optional[str] = None) -> int:
+    """Bucle de un worker: recibe shards, los cuenta con el motor y devuelve histogramas parciales.
+
+    Devuelve la cantidad de shards procesados.
+    """
+    conn = Client(address, authkey=authkey)
+    try:
+        hello = conn.recv()
+    except EOFError:
+        conn.close()
+        return 0  # el coordinador terminó antes de asignarle trabajo
+    if hello["engine_workers"]:
+        apply_worker_env(hello["engine_workers"])
+    engine = get_engine(hello["engine"])(workers=hello["engine_workers"])
+    root = root or hello["root"]
+    conn.send({"host": socket.gethostname(), "pid": os.getpid()})
+    work_dir = tempfile.mkdtemp(prefix="mineria-worker-", dir=scratch)
+    done = 0
+    try:
+        while True:
+            try:
+                task = conn.recv()
+            except EOFError:
+                break  # el coordinador terminó
+            if task["type"] == "stop":
+                break
+            shard_dir = os.path.join(work_dir, f"shard-{task['shard']}-{task['attempt']}")
+            os.makedirs(shard_dir)
+            try:
+                t0 = time.perf_counter()
+                materialize(task, root, transfer, shard_dir)
+                t1 = time.perf_counter()
+                engine.prepare(shard_dir)
+                counts = engine.run()
+                t2 = time.perf_counter()
+                reply = {"type": "result", "shard": task["shard"], "counts": merge_counts([counts]),
+                         "fetch_s": t1 - t0, "run_s": t2 - t1}
+            except Exception as e:  # el coordinador decide si reintenta
+                reply = {"type": "error", "shard": task["shard"], "error": f"{type(e).__name__}: {e}"}
+            finally:
+                shutil.rmtree(shard_dir, ignore_errors=True)
+            try:
+                conn.send(reply)
+            except OSError:
+                break
+            done += 1
+    finally:
+        engine.teardown()
+        conn.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return done
+
+
+class Coordinator:
+    """Despacha shards a los workers conectados y fusiona sus histogramas parciales."""
+
+    def __init__(self, engine: str, root: str, shards: List[Shard], engine_workers: Optional[int] = None,
+                 index: Optional[Dict] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 slow_factor: float = DEFAULT_SLOW_FACTOR, shard_timeout: Optional[float] = None,
+                 authkey: Optional[bytes] = None):
+        self.engine = engine
+        self.root = root
+        self.shards = {s.id: s for s in shards}
+        self.engine_workers = engine_workers
+        self.index = index
+        self.max_attempts = max_attempts
+        self.slow_factor = slow_factor
+        self.shard_timeout = shard_timeout
+        # Texto: los workers la reciben por la variable AUTHKEY_ENV o --authkey
+        self.authkey = authkey or os.urandom(16).hex().encode()
+
+        self.cond = threading.Condition()
+        self.pending = [s.id for s in sorted(shards, key=lambda s: s.bytes, reverse=True)]
+        self.running: Dict[int, Dict[int, float]] = {}  # shard -> {worker: inicio}
+        self.results: Dict[int, Dict] = {}
+        self.attempts: Dict[int, int] = {s.id: 0 for s in shards}
+        self.events = {"failed": 0, "timeout": 0, "speculative": 0, "duplicate": 0}
+        self.errors: List[str] = []
+        self.workers: Dict[int, Dict] = {}
+        self.live = 0
+        self.error: Optional[str] = None
+        self.finished = False
+        self.listener: Optional[Listener] = None
+        self.address: Optional[Tuple[str, int]] = None
+        self._threads: List[threading.Thread] = []
+
+    # --- ciclo de vida ---
+
+    def listen(self, address: Tuple[str, int] = ("127.0.0.1", 0)) -> Tuple[str, int]:
+        """Abre el socket y acepta workers en segundo plano; devuelve la dirección real."""
+        self.listener = Listener(address, authkey=self.authkey)
+        self.address = self.listener.address
+        acceptor = threading.Thread(target=self._accept, daemon=True)
+        acceptor.start()
+        self._threads.append(acceptor)
+        return self.address
+
+    def wait(self, timeout: Optional[float] = None, alive=None) -> Dict[int, Dict]:
+        """Espera a que todos los shards terminen; `alive()` dice si aún puede llegar algún worker."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while not self.finished:
+                if deadline is not None and time.monotonic() > deadline:
+                    self.error = f"se superó el límite de {timeout:g}s"
+                    self.finished = True
+                elif self.live == 0 and alive is not None and not alive():
+                    self.error = "no quedan workers: " + ("; ".join(self.errors[-3:]) or "terminaron sin conectarse")
+                    self.finished = True
+                else:
+                    self.cond.wait(POLL_S)
+            self.cond.notify_all()
+        if self.error is not None:
+            raise BenchmarkError(f"ejecución por shards fallida: {self.error}", EXIT_RUN_ERROR)
+        return self.results
+
+    def close(self) -> None:
+        with self.cond:
+            self.finished = True
+            self.cond.notify_all()
+        if self.listener is not None:
+            try:
+                # accept() no se despierta al cerrar el socket: una conexión propia lo libera
+                Client(self.address, authkey=self.authkey).close()
+            except OSError:
+                pass
+            self.listener.close()
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    # --- planificación ---
+
+    def _expected_s(self, shard: Shard) -> Optional[float]:
+        rates = [r["run_s"] / self.shards[sid].bytes for sid, r in self.results.items() if self.shards[sid].bytes]
+        return statistics.median(rates) * shard.bytes if rates else None
+
+    def _straggler(self, worker: int) -> Optional[int]:
+        """Shard en curso que ya tardó `slow_factor` veces lo esperado y no corre en `worker`."""
+        now = time.monotonic()
+        for sid, runs in sorted(self.running.items(), key=lambda item: min(item[1].values())):
+            if worker in runs or len(runs) > 1:
+                continue
+            expected = self._expected_s(self.shards[sid])
+            if expected is not None and now - min(runs.values()) > max(MIN_SLOW_S, self.slow_factor * expected):
+                return sid
+        return None
+
+    def _next(self, worker: int) -> Optional[Tuple[int, int]]:
+        """Bloquea hasta tener un shard para `worker`: (shard, intento), o None al terminar."""
+        with self.cond:
+            while not self.finished:
+                sid = self.pending.pop(0) if self.pending else self._straggler(worker)
+                if sid is not None:
+                    if self.running.get(sid):
+                        self.events["speculative"] += 1
+                    self.attempts[sid] += 1
+                    self.running.setdefault(sid, {})[worker] = time.monotonic()
+                    return sid, self.attempts[sid]
+                self.cond.wait(POLL_S)
+            return None
+
+    def _complete(self, worker: int, sid: int, reply: Dict) -> None:
+        with self.cond:
+            self.running.get(sid, {}).pop(worker, None)
+            if sid in self.results:
+                self.events["duplicate"] += 1  # ya lo sumó otra copia
+            else:
+                self.running.pop(sid, None)
+                self.results[sid] = {**reply, "worker": worker, "attempts": self.attempts[sid]}
+                if len(self.results) == len(self.shards):
+                    self.finished = True
+            self.cond.notify_all()
+
+    def _fail(self, worker: int, sid: int, error: str, kind: str = "failed") -> None:
+        with self.cond:
+            runs = self.running.get(sid, {})
+            runs.pop(worker, None)
+            if sid in self.results or self.finished:
+                return  # copia sobrante de un shard ya sumado
+            self.events[kind] += 1
+            self.errors.append(f"shard {sid}: {error}")
+            if not runs:
+                self.running.pop(sid, None)
+                if self.attempts[sid] >= self.max_attempts:
+                    self.error = f"el shard {sid} falló {self.attempts[sid]} veces (último error: {error})"
+                    self.finished = True
+                else:
+                    self.pending.insert(0, sid)
+            self.cond.notify_all()
+
+    # --- conexiones ---
+
+    def _accept(self) -> None:
+        while not self.finished:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                if self.finished:
+                    return
+                continue  # authkey inválida o conexión caída antes del saludo
+            if self.finished:
+                conn.close()
+                return
+            thread = threading.Thread(target=self._serve, args=(conn,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _task(self, sid: int, attempt: int) -> Dict:
+        task = {"type": "task", "shard": sid, "attempt": attempt, "files": self.shards[sid].files}
+        if self.index is not None:
+            by_name = {entry["file"]: entry for entry in self.index["shards"]}
+            task["index"] = {"version": self.index.get("version"), "range_size": self.index["range_size"],
+                             "shards": [(key, by_name[key]) for key in task["files"]]}
+        return task
+
+    def _serve(self, conn) -> None:
+        with self.cond:
+            worker = len(self.workers)
+            self.workers[worker] = {"shards": 0}
+            self.live += 1
+        sid = None
+        try:
+            conn.send({"engine": self.engine, "engine_workers": self.engine_workers, "root": self.root})
+            self.workers[worker].update(conn.recv())
+            while True:
+                job = self._next(worker)
+                if job is None:
+                    conn.send({"type": "stop"})
+                    return
+                sid, attempt = job
+                conn.send(self._task(sid, attempt))
+                started = time.monotonic()
+                while not conn.poll(POLL_S):
+                    if self.finished:
+                        return
+                    if self.shard_timeout is not None and time.monotonic() - started > self.shard_timeout:
+                        # El worker queda colgado: se descarta junto con su conexión
+                        self._fail(worker, sid, f"sin respuesta tras {self.shard_timeout:g}s", "timeout")
+                        sid = None
+                        return
+                reply = conn.recv()
+                if reply["type"] == "result":
+                    self._complete(worker, sid, reply)
+                    self.workers[worker]["shards"] += 1
+                else:
+                    self._fail(worker, sid, reply["error"])
+                sid = None
+        except (EOFError, OSError) as e:
+            if sid is not None:
+                self._fail(worker, sid, f"worker desconectado ({type(e).__name__})")
+        finally:
+            conn.close()
+            with self.cond:
+                self.live -= 1
+                self.cond.notify_all()
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """'host:puerto' -> (host, puerto)."""
+    host, _, port = value.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"dirección inválida '{value}' (use host:puerto)")
+    return host, int(port)
+
+
+def spawn_workers(address: Tuple[str, int], authkey: bytes, n: int, transfer: str = "link") -> List:
+    """Lanza `n` procesos worker locales conectados a `address`."""
+    env = subprocess_env()
+    env[AUTHKEY_ENV] = authkey.decode()
+    cmd = [sys.executable, "-m", "mineria_benchmark", "worker", "--connect", f"{address[0]}:{address[1]}",
+           "--transfer", transfer]
+    return [subprocess.Popen(cmd, env=env, cwd=ROOT, stdout=subprocess.DEVNULL) for _ in range(n)]
+
+
+def run_sharded(engine: str, input_dir: Optional[str] = None, manifest: Optional[str] = None,
+                local_workers: int = 2, shards: Optional[int] = None,
+                engine_workers: Optional[int] = None, transfer: str = "link",
+                listen: Tuple[str, int] = ("127.0.0.1", 0), authkey: Optional[bytes] = None,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, slow_factor: float = DEFAULT_SLOW_FACTOR,
+                shard_timeout: Optional[float] = None, timeout: Optional[float] = None,
+                log=None) -> Dict:
+    """Cuenta `input_dir` (o los archivos de `manifest`) repartidos en shards entre workers."""
+    if engine == "spark":
+        raise BenchmarkError("spark ya reparte el trabajo en su cluster local[*]; use run --engine spark",
+                             EXIT_INVALID_INPUT)
+    get_engine(engine)  # motor desconocido: error antes de lanzar workers
+    if transfer not in TRANSFERS:
+        raise BenchmarkError(f"transfer debe ser uno de {', '.join(TRANSFERS)}", EXIT_INVALID_INPUT)
+    if manifest is not None:
+        files = manifest_files(manifest)
+        index = None
+    else:
+        if input_dir is None or not os.path.isdir(input_dir):
+            raise BenchmarkError(f"'{input_dir}' no es un directorio válido.", EXIT_INVALID_INPUT)
+        files = list_json_files(os.path.abspath(input_dir))
+        index = load_index(os.path.abspath(input_dir), files) if files else None
+    if local_workers <= 0 and listen[0] in ("127.0.0.1", "localhost"):
+        raise BenchmarkError("sin workers locales el coordinador debe escuchar en una interfaz accesible "
+                             "(p. ej. --listen 0.0.0.0:8766)", EXIT_INVALID_INPUT)
+    if engine_workers is None and local_workers > 0:
+        engine_workers = max(1, (os.cpu_count() or 1) // local_workers)
+
+    root, plan = plan_shards(files, shards or 4 * max(1, local_workers))
+    coordinator = Coordinator(engine, root, plan, engine_workers=engine_workers, index=index,
+                              max_attempts=max_attempts, slow_factor=slow_factor,
+                              shard_timeout=shard_timeout, authkey=authkey)
+    t0 = time.perf_counter()
+    address = coordinator.listen(listen)
+    if log is not None:
+        log(f"coordinador en {address[0]}:{address[1]}: {len(plan)} shards, {len(files)} archivos")
+    procs = spawn_workers(address, coordinator.authkey, local_workers, transfer)
+    try:
+        results = coordinator.wait(
+            timeout=timeout,
+            # Sin workers locales vivos sólo pueden llegar workers remotos
+            alive=(lambda: any(p.poll() is None for p in procs)) if local_workers > 0 else None,
+        )
+        wall = time.perf_counter() - t0
+    finally:
+        coordinator.close()
+        connected = {w.get("pid") for w in coordinator.workers.values()}
+        for proc in procs:
+            if proc.pid not in connected:
+                proc.kill()  # llegó tarde: no hay trabajo para él
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    counts = normalize_counts(merge_counts([r["counts"] for r in results.values()]))
+    total_bytes = sum(s.bytes for s in plan)
+    return {
+        "engine": engine,
+        "mode": "sharded",
+        "input_dir": input_dir,
+        "manifest": manifest,
+        "files": sum(len(s.files) for s in plan),
+        "bytes": total_bytes,
+        "local_workers": local_workers,
+        "engine_workers": engine_workers,
+        "transfer": transfer,
+        "shards": len(plan),
+        "wall_time_s": wall,
+        "mb_per_s": total_bytes / 1024**2 / wall if wall > 0 else 0.0,
+        "counts": counts,
+        "total": sum(counts.values()),
+        "redispatch": dict(coordinator.events),
+        "errors": coordinator.errors,
+        "workers": list(coordinator.workers.values()),
+        "shard_times": [
+            {"shard": sid, "bytes": coordinator.shards[sid].bytes, "files": len(coordinator.shards[sid].files),
+             "worker": r["worker"], "attempts": r["attempts"], "fetch_s": r["fetch_s"], "run_s": r["run_s"]}
+            for sid, r in sorted(results.items())
+        ],
+        "timestamp": time.time(),
+    }
+
+
+def to_log(record: Dict) -> str:
+    """Formato de output.log."""
+    return f"Execution time: {record['wall_time_s']:.6f} seconds\n{record['counts']}"
+
+
+def format_sharded(record: Dict) -> str:
+    busy = sum(t["fetch_s"] + t["run_s"] for t in record["shard_times"])
+    events = ", ".join(f"{k} {v}" for k, v in record["redispatch"].items() if v) or "sin re-despachos"
+    return (f"[{record['engine']}] shard: {record['shards']} shards en {len(record['workers'])} workers "
+            f"({record['transfer']}), {record['wall_time_s']:.3f}s {record['mb_per_s']:.1f} MB/s, "
+            f"{busy:.3f}s de trabajo en workers, {events}")
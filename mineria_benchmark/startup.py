@@ -0,0 +1,136 @@
+"""
+Perfilado del arranque de cada motor.
+
+Separa el costo de arranque del tiempo de procesamiento, que en datasets
+pequeños domina la medición:
+- interpreter_s: lanzar un intérprete vacío hasta su primer byte en stdout.
+- ready_s: lanzar un intérprete, importar el motor y ejecutar prepare()
+  (Pool, conexión DuckDB, SparkSession/JVM) hasta su primer byte en stdout.
+- imports: tiempos de `python -X importtime` al importar el módulo del motor.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .engines import ENGINES, get_engine
+from .runner import ROOT, subprocess_env
+
+# Marca que el probe escribe en stdout cuando el motor está listo
+_READY = b"R"
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """Parsea la salida de `-X importtime` ("import time: self | cumulative | módulo")."""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # encabezado "self [us] | cumulative | imported package"
+        timings.append(ImportTiming(parts[2].strip(), self_us, cumulative_us))
+    return timings
+
+
+def engine_module(engine: str) -> str:
+    module_name = ENGINES[engine].split(":")[0]
+    return f"mineria_benchmark.engines.{module_name}"
+
+
+def profile_imports(engine: str, top: int = 10) -> Dict:
+    """Importa el módulo del motor con `-X importtime` y resume los más costosos."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {engine_module(engine)}"],
+        capture_output=True, text=True, env=subprocess_env(), cwd=ROOT,
+    )
+    timings = parse_importtime(proc.stderr)
+    # El total es la suma de los tiempos propios (los acumulados se solapan)
+    total_us = sum(t.self_us for t in timings)
+    slowest = sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]
+    return {
+        "modules": len(timings),
+        "total_s": total_us / 1e6,
+        "top": [
+            {"module": t.module, "self_s": t.self_us / 1e6, "cumulative_s": t.cumulative_us / 1e6}
+            for t in slowest
+        ],
+    }
+
+
+def time_to_first_byte(cmd: List[str]) -> float:
+    """Segundos desde lanzar `cmd` hasta leer el primer byte de su stdout."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            env=subprocess_env(), cwd=ROOT)
+    try:
+        first = proc.stdout.read(1)
+        elapsed = time.perf_counter() - t0
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    if proc.returncode != 0 or not first:
+        raise RuntimeError(f"el proceso {cmd} terminó con código {proc.returncode}")
+    return elapsed
+
+
+def profile_startup(engine: str, input_dir: Optional[str] = None, repeat: int = 3) -> Dict:
+    """Perfil de arranque de `engine` (medianas sobre `repeat` lanzamientos)."""
+    interpreter = [sys.executable, "-c", f"import sys; sys.stdout.buffer.write({_READY!r})"]
+    probe = [sys.executable, "-m", "mineria_benchmark.startup", engine]
+    if input_dir is not None:
+        probe.append(os.path.abspath(input_dir))  # la sonda corre en ROOT
+
+    interpreter_s = statistics.median(time_to_first_byte(interpreter) for _ in range(repeat))
+    ready_s = statistics.median(time_to_first_byte(probe) for _ in range(repeat))
+    return {
+        "engine": engine,
+        "repeat": repeat,
+        "interpreter_s": interpreter_s,
+        "ready_s": ready_s,
+        "engine_startup_s": max(ready_s - interpreter_s, 0.0),
+        "prepare_included": input_dir is not None,
+        "imports": profile_imports(engine),
+    }
+
+
+def format_startup(profile: Dict) -> str:
+    lines = [
+        f"[{profile['engine']}] startup: interpreter {profile['interpreter_s']:.3f}s, "
+        f"ready {profile['ready_s']:.3f}s (+{profile['engine_startup_s']:.3f}s), "
+        f"imports {profile['imports']['total_s']:.3f}s en {profile['imports']['modules']} módulos",
+    ]
+    for t in profile["imports"]["top"]:
+        lines.append(f"  {t['cumulative_s']:>8.3f}s  {t['module']}")
+    return "\n".join(lines)
+
+
+def _probe(engine: str, input_dir: Optional[str]) -> None:
+    """Importa el motor, ejecuta prepare() si hay entrada y avisa por stdout."""
+    instance = get_engine(engine)()
+    try:
+        if input_dir is not None:
+            instance.prepare(input_dir)
+        sys.stdout.buffer.write(_READY)
+        sys.stdout.buffer.flush()
+    finally:
+        instance.teardown()
+
+
+if __name__ == "__main__":
+    _probe(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
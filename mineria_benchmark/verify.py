@@ -0,0 +1,92 @@
+"""
+Oráculo de corrección y verificación cruzada entre motores.
+
+Las comparaciones de tiempo sólo tienen sentido si todos los motores producen
+el mismo histograma. La semántica de referencia es:
+- se leen los archivos *.json del directorio, línea por línea;
+- las líneas que no son un objeto JSON, o cuyo "message" no es texto, se descartan;
+- el status es el primer match de STATUS_PATTERN en "message" y el bucket su
+  primer dígito; sólo se reportan los buckets 2, 4 y 5.
+"""
+
+import json
+import re
+import tempfile
+from typing import Dict, Iterable, List, Optional
+
+from .datagen import generate_dataset
+from .engines import BUCKETS, STATUS_PATTERN, BenchmarkError, list_json_files
+from .runner import run_named_engine
+
+EXIT_VERIFY_ERROR = 4
+
+_STATUS_RE = re.compile(STATUS_PATTERN)
+
+
+def reference_counts(files: Iterable[str]) -> Dict[str, int]:
+    """Implementación de referencia (lenta y simple) de la semántica del benchmark."""
+    counts = {b: 0 for b in BUCKETS}
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                message = record.get("message") if isinstance(record, dict) else None
+                if not isinstance(message, str):
+                    continue
+                match = _STATUS_RE.search(message)
+                if match and match.group(1)[0] in counts:
+                    counts[match.group(1)[0]] += 1
+    return counts
+
+
+def verify_engines(engines: List[str], input_dir: str,
+                   expected: Optional[Dict[str, int]] = None) -> List[Dict]:
+    """Ejecuta cada motor sobre `input_dir` y compara con `expected` (u oráculo)."""
+    if expected is None:
+        expected = reference_counts(list_json_files(input_dir))
+
+    report = []
+    for name in engines:
+        entry = {"engine": name, "expected": expected}
+        try:
+            entry["counts"] = run_named_engine(name, input_dir).counts
+            entry["ok"] = entry["counts"] == expected
+        except ImportError as e:
+            entry.update(ok=None, error=f"no disponible ({e})")
+        except BenchmarkError as e:
+            entry.update(ok=False, error=str(e))
+        report.append(entry)
+    return report
+
+
+def verify_generated(engines: List[str], seed: int = 0, files: int = 6,
+                     lines_per_file: int = 500) -> List[Dict]:
+    """Verifica los motores sobre un dataset generado con casos borde y conteos conocidos."""
+    with tempfile.TemporaryDirectory(prefix="mineria-verify-") as tmp:
+        expected = generate_dataset(tmp, files=files, lines_per_file=lines_per_file,
+                                    seed=seed, edge_cases=True)
+        return verify_engines(engines, tmp, expected)
+
+
+def require_verified(engine: str, seed: int = 0) -> None:
+    """Lanza BenchmarkError si `engine` no reproduce el histograma esperado."""
+    entry = verify_generated([engine], seed=seed)[0]
+    if entry["ok"] is None:
+        raise BenchmarkError(entry["error"], EXIT_VERIFY_ERROR)
+    if not entry["ok"]:
+        got = entry.get("counts", entry.get("error"))
+        raise BenchmarkError(
+            f"verificación fallida: esperado {entry['expected']}, obtenido {got}", EXIT_VERIFY_ERROR
+        )
+
+
+def format_report(report: List[Dict]) -> str:
+    lines = []
+    for entry in report:
+        status = {True: "OK", False: "FALLA", None: "OMITIDO"}[entry["ok"]]
+        detail = entry.get("counts", entry.get("error"))
+        lines.append(f"{status:8} {entry['engine']:8} {detail}")
+    return "\n".join(lines)
@@ -18,6 +18,8 @@ echo "============================================================"
 
 # copy main.py to s3
 aws s3 cp  "./${EXPERIMENT}/main.py"  s3://${BUCKET}/scripts/${EXPERIMENT}/main.py --region us-east-2 --profile maraosoc
+# main.py delegates to the mineria_benchmark package, upload it next to it
+aws s3 sync "./mineria_benchmark"  s3://${BUCKET}/scripts/${EXPERIMENT}/mineria_benchmark/ --exclude "*__pycache__/*" --delete --region us-east-2 --profile maraosoc
 # Delete previous results
 RESULT_PATH="results/${EXPERIMENT}/${DATASIZE}/output.log"
 S3_FILE="s3://${BUCKET}/${RESULT_PATH}"
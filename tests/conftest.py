@@ -0,0 +1,31 @@
+import pytest
+
+from mineria_benchmark import available_engines, get_engine
+from mineria_benchmark.datagen import generate_dataset
+
+
+@pytest.fixture(scope="session")
+def clean_dataset(tmp_path_factory):
+    """Dataset sin ruido: (directorio, conteos esperados)."""
+    path = tmp_path_factory.mktemp("clean")
+    expected = generate_dataset(str(path), files=5, lines_per_file=400, seed=7)
+    return str(path), expected
+
+
+@pytest.fixture(scope="session")
+def edge_dataset(tmp_path_factory):
+    """Dataset con líneas mal formadas, números extra, archivos vacíos y no JSON."""
+    path = tmp_path_factory.mktemp("edge")
+    expected = generate_dataset(str(path), files=6, lines_per_file=300, seed=11,
+                                edge_cases=True, edge_rate=0.2)
+    return str(path), expected
+
+
+@pytest.fixture(params=available_engines())
+def engine_name(request):
+    """Nombre de cada motor; se omite si su librería no está instalada."""
+    try:
+        get_engine(request.param)
+    except ImportError as e:
+        pytest.skip(f"{request.param} no disponible: {e}")
+    return request.param
@@ -0,0 +1,82 @@
+import os
+
+from mineria_benchmark import get_engine
+from mineria_benchmark.approx import StratifiedEstimator, approximate, plan_blocks, stratify
+from mineria_benchmark.engines import list_json_files, read_block
+
+
+def test_blocks_cover_every_line_once(edge_dataset):
+    files = list_json_files(edge_dataset[0])
+    for block_size in (1, 97, 4096, 1 << 30):
+        blocks = plan_blocks(files, block_size)
+        for path in files:
+            with open(path, "rb") as f:
+                expected = f.read()
+            assert b"".join(read_block(b) for b in blocks if b.path == path) == expected
+
+
+def test_stratify_keeps_order_and_sizes():
+    blocks = plan_blocks([__file__], 64)
+    groups = stratify(blocks, 4)
+    assert len(groups) == 4
+    assert [b for g in groups for b in g] == blocks
+    assert abs(sum(b.size for b in groups[0]) - os.path.getsize(__file__) / 4) <= 64
+
+
+def test_count_blocks_matches_expected(engine_name, edge_dataset):
+    input_dir, expected = edge_dataset
+    engine = get_engine(engine_name)(workers=1)
+    engine.prepare(input_dir)
+    try:
+        # Mitad de los archivos completos y la otra mitad en rangos que cortan líneas
+        blocks = []
+        for i, path in enumerate(engine.files):
+            blocks += plan_blocks([path], 1 << 30 if i % 2 else 1013)
+        totals = {b: 0 for b in expected}
+        for counts in engine.count_blocks(blocks):
+            for b in totals:
+                totals[b] += counts.get(b, 0)
+    finally:
+        engine.teardown()
+    assert totals == expected
+
+
+def test_full_census_is_exact(clean_dataset):
+    input_dir, expected = clean_dataset
+    record = approximate(get_engine("python")(workers=1), input_dir, target_error=0.0, block_size=4096, seed=1)
+    assert record["stopped"] == "exhausted"
+    assert record["counts"] == expected
+    assert record["half_width"] == 0.0
+    assert record["bytes_scanned"] == record["bytes"]
+
+
+def test_early_stop_interval_contains_true_rate(clean_dataset):
+    input_dir, expected = clean_dataset
+    record = approximate(get_engine("python")(workers=1), input_dir, target_error=0.1, block_size=2048,
+                         strata=4, seed=3)
+    assert record["stopped"] == "target"
+    assert record["bytes_scanned"] < record["bytes"]
+    total = sum(expected.values())
+    for b, (low, high) in record["ci"].items():
+        assert low <= expected[b] / total <= high
+
+
+def test_estimator_requires_two_samples_per_stratum():
+    estimator = StratifiedEstimator([3, 5])
+    estimator.add(0, {"2": 10, "4": 5})
+    estimator.add(1, {"2": 7, "5": 1})
+    estimator.add(1, {"2": 8, "4": 2})
+    assert estimator.estimate()["half_width"] is None
+    estimator.add(0, {"2": 9, "4": 6})
+    estimate = estimator.estimate()
+    assert estimate["half_width"] > 0
+    assert abs(sum(estimate["rates"].values()) - 1) < 1e-9
+
+
+def test_max_fraction_caps_bytes_read(clean_dataset):
+    input_dir, _expected = clean_dataset
+    for max_fraction in (0.05, 0.3, 0.55):
+        record = approximate(get_engine("python")(workers=1), input_dir, target_error=0.0, block_size=1024,
+                             strata=3, max_fraction=max_fraction, seed=2)
+        assert record["stopped"] == "max_fraction"
+        assert 0 < record["bytes_scanned"] <= max_fraction * record["bytes"]
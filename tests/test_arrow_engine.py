@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from mineria_benchmark import run_named_engine  # noqa: E402
+
+
+def test_retries_only_failing_files(tmp_path):
+    """Un archivo que el lector de Arrow rechaza no invalida los demás."""
+    (tmp_path / "a.json").write_text('{"message":"HTTP Status Code: 200"}\n{"message":"HTTP Status Code: 404"}\n')
+    (tmp_path / "b.json").write_text('{"message":5}\n{"message":"HTTP  Status Code:503"}\nnot json\n')
+    assert run_named_engine("arrow", str(tmp_path)).counts == {"2": 1, "4": 1, "5": 1}
+
+
+def test_single_worker_does_not_hang(tmp_path):
+    """Con --workers 1 el pool de IO de Arrow (global del proceso) queda en 2 hilos."""
+    (tmp_path / "a.json").write_text('{"message":"HTTP Status Code: 200"}\n')
+    proc = subprocess.run([sys.executable, "-m", "mineria_benchmark", "run", "--engine", "arrow",
+                           "--input", str(tmp_path), "--workers", "1", "--format", "json"],
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    assert '"2": 1' in proc.stdout
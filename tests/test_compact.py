@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from mineria_benchmark import get_engine, run_named_engine
+from mineria_benchmark.compact import compact, compare_layouts, summarize_layouts
+from mineria_benchmark.engines import INDEX_FILE, BenchmarkError, list_json_files, load_index
+from mineria_benchmark.verify import reference_counts
+
+
+@pytest.fixture(scope="module")
+def compacted(edge_dataset, tmp_path_factory):
+    """Dataset con casos borde compactado en shards pequeños: (directorio, índice)."""
+    out_dir = str(tmp_path_factory.mktemp("compacted"))
+    return out_dir, compact(edge_dataset[0], out_dir, shard_size=16 * 1024, range_size=3000)
+
+
+def test_shards_preserve_lines_and_offsets_start_lines(edge_dataset, compacted):
+    input_dir, expected = edge_dataset
+    out_dir, index = compacted
+    shards = list_json_files(out_dir)
+    assert [os.path.basename(p) for p in shards] == [s["file"] for s in index["shards"]]
+    assert 1 < len(shards) < index["files"]
+
+    sources = b""
+    for path in list_json_files(input_dir):
+        with open(path, "rb") as f:
+            data = f.read()
+        sources += data + (b"\n" if data and not data.endswith(b"\n") else b"")
+    shard_bytes = b""
+    for path, shard in zip(shards, index["shards"]):
+        with open(path, "rb") as f:
+            data = f.read()
+        shard_bytes += data
+        assert shard["offsets"][0] == 0 and shard["offsets"][-1] == len(data)
+        assert all(data[o - 1:o] == b"\n" for o in shard["offsets"][1:])
+        assert all(b - a >= 3000 for a, b in zip(shard["offsets"], shard["offsets"][1:-1]))
+    assert shard_bytes == sources
+    assert reference_counts(shards) == expected
+
+
+def test_engines_split_shards_into_ranges(engine_name, compacted, edge_dataset):
+    out_dir, index = compacted
+    engine = get_engine(engine_name)(workers=2)
+    engine.prepare(out_dir)
+    try:
+        assert engine.index is not None
+        assert len(engine.ranges) == sum(len(s["offsets"]) - 1 for s in index["shards"]) > len(engine.files)
+    finally:
+        engine.teardown()
+    assert run_named_engine(engine_name, out_dir, workers=2).counts == edge_dataset[1]
+
+
+def test_stale_index_is_ignored(compacted, tmp_path):
+    out_dir, index = compacted
+    for name in os.listdir(out_dir):
+        with open(os.path.join(out_dir, name), "rb") as src, open(tmp_path / name, "wb") as dst:
+            dst.write(src.read())
+    files = list_json_files(str(tmp_path))
+    assert load_index(str(tmp_path), files) is not None
+    with open(files[0], "ab") as f:
+        f.write(b'{"message":"HTTP Status Code: 500"}\n')
+    assert load_index(str(tmp_path), files) is None
+
+    result = run_named_engine("python", str(tmp_path), workers=1)
+    assert result.counts == reference_counts(files)
+
+
+def test_compact_reuses_matching_output_and_rejects_other(edge_dataset, compacted, clean_dataset):
+    out_dir, index = compacted
+    again = compact(edge_dataset[0], out_dir, shard_size=16 * 1024, range_size=3000)
+    assert again["reused"] and again["shards"] == index["shards"]
+    with pytest.raises(BenchmarkError) as e:
+        compact(clean_dataset[0], out_dir, shard_size=16 * 1024, range_size=3000)
+    assert e.value.exit_code == 1
+    with open(os.path.join(out_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+        assert json.load(f)["shards"] == index["shards"]
+
+
+def test_compare_layouts_python(clean_dataset, tmp_path):
+    input_dir, expected = clean_dataset
+    compact(input_dir, str(tmp_path), shard_size=1 << 30, range_size=8192)
+    records = compare_layouts(["python"], input_dir, str(tmp_path), workers=2, repeat=1)
+    assert [(r["layout"], r["ok"]) for r in records] == [("raw", True), ("compacted", True)]
+    assert records[1]["files"] == 1 and records[1]["counts"] == expected
+    assert summarize_layouts(records)[0]["speedup"] > 0
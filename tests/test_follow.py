@@ -0,0 +1,84 @@
+import io
+import json
+
+import pytest
+
+from mineria_benchmark import BenchmarkError, get_engine
+from mineria_benchmark.follow import Follower, SlidingWindow, follow
+
+
+def _line(status):
+    return json.dumps({"message": f"HTTP Status Code: {status}", "service": "training"}) + "\n"
+
+
+@pytest.fixture(params=["python", "polars"])
+def count_chunk(request):
+    try:
+        return get_engine(request.param)().count_chunk
+    except ImportError as e:
+        pytest.skip(f"{request.param} no disponible: {e}")
+
+
+def test_follower_counts_only_appended_bytes(tmp_path, count_chunk):
+    log = tmp_path / "a.json"
+    log.write_text(_line(200) + _line(404))
+    follower = Follower(str(tmp_path), count_chunk)
+    follower.step()
+    assert follower.totals == {"2": 1, "4": 1, "5": 0}
+
+    with open(log, "a") as f:
+        f.write(_line(500) + '{"message": "HTTP Status Code: 2')  # última línea a medio escribir
+    (tmp_path / "b.json").write_text(_line(201))
+    follower.step()
+    assert follower.totals == {"2": 2, "4": 1, "5": 1}
+
+    with open(log, "a") as f:
+        f.write('03"}\n')
+    follower.step()
+    assert follower.totals == {"2": 3, "4": 1, "5": 1}
+    assert follower.step() == 0
+
+
+def test_follower_rereads_truncated_file(tmp_path, count_chunk):
+    log = tmp_path / "a.json"
+    log.write_text(_line(200) * 3)
+    follower = Follower(str(tmp_path), count_chunk)
+    follower.step()
+    log.write_text(_line(404))
+    follower.step()
+    assert follower.totals == {"2": 3, "4": 1, "5": 0}
+
+
+def test_sliding_window_expires_old_chunks():
+    window = SlidingWindow(seconds=10)
+    window.add(100.0, {"2": 4}, 0.5)
+    window.add(108.0, {"5": 1}, 0.1)
+    summary = window.summary(now=112.0)
+    assert summary["counts"] == {"2": 0, "4": 0, "5": 1}
+    assert summary["rates"]["5"] == 1.0
+    assert summary["latency_max_s"] == 0.1
+
+
+def test_sliding_window_rate_before_window_fills():
+    window = SlidingWindow(seconds=60)
+    window.add(100.0, {"2": 30}, 0.1)
+    window.add(105.0, {"4": 20}, 0.1)
+    # 10 s de 60: la tasa se mide sobre lo transcurrido, no sobre la ventana completa
+    assert window.summary(now=110.0)["lines_per_s"] == 5.0
+    assert window.summary(now=200.0)["lines_per_s"] == 0.0
+    window.add(190.0, {"5": 120}, 0.1)
+    assert window.summary(now=200.0)["lines_per_s"] == 2.0
+
+
+def test_follow_matches_batch_counts(clean_dataset):
+    path, expected = clean_dataset
+    out = io.StringIO()
+    status = follow("python", path, emit_interval=0.1, duration=0.3, out=out)
+    assert status["counts"] == expected
+    assert out.getvalue().count("[follow python]") >= 1
+
+
+def test_follow_unsupported_engine(tmp_path):
+    with pytest.raises(BenchmarkError) as exc:
+        follow("pandas", str(tmp_path), duration=0)
+    assert exc.value.exit_code == 1
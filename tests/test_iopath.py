@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from mineria_benchmark import BenchmarkError, run_named_engine
+from mineria_benchmark.compact import compact
+from mineria_benchmark.engines import list_json_files
+from mineria_benchmark.iopath import available_strategies, evict, proc_io, read_range, split_lines
+
+
+@pytest.fixture(params=available_strategies())
+def strategy(request):
+    return request.param
+
+
+def _fs_type(path):
+    """Tipo del sistema de archivos que contiene `path`, según /proc/mounts."""
+    best, fs = "", None
+    with open("/proc/mounts", "r") as f:
+        for line in f:
+            _dev, mount, kind = line.split()[:3]
+            if os.path.realpath(path).startswith(mount) and len(mount) > len(best):
+                best, fs = mount, kind
+    return fs
+
+
+def test_ranges_and_lines_are_exact(strategy, edge_dataset):
+    path = max(list_json_files(edge_dataset[0]), key=os.path.getsize)
+    with open(path, "rb") as f:
+        data = f.read()
+    # Rangos alineados y no alineados con bloques de 4 KiB (O_DIRECT redondea a ALIGNMENT)
+    for start, end in ((0, len(data)), (1, len(data) - 3), (5000, 9000), (4096, 4096)):
+        assert b"".join(read_range(path, strategy, start, end, chunk_size=4096)) == data[start:end]
+    chunks = list(split_lines(read_range(path, strategy, chunk_size=1000)))
+    assert b"".join(chunks) == data
+    assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+
+
+@pytest.mark.parametrize("engine", ["python", "pandas", "numpy"])
+def test_pool_engines_count_with_every_strategy(engine, strategy, edge_dataset):
+    input_dir, expected = edge_dataset
+    result = run_named_engine(engine, input_dir, workers=2, io_strategy=strategy)
+    assert result.counts == expected
+    assert result.io["strategy"] == strategy
+    assert result.io["logical_bytes"] == result.bytes
+
+
+def test_io_strategy_reads_compacted_ranges(edge_dataset, tmp_path):
+    input_dir, expected = edge_dataset
+    compact(input_dir, str(tmp_path), shard_size=1 << 30, range_size=2000)
+    result = run_named_engine("numpy", str(tmp_path), workers=2, io_strategy="buffered")
+    assert result.counts == expected and result.files == 1
+
+
+def test_engines_with_own_reader_reject_io(clean_dataset):
+    pytest.importorskip("duckdb")
+    with pytest.raises(BenchmarkError) as e:
+        run_named_engine("duckdb", clean_dataset[0], io_strategy="buffered")
+    assert e.value.exit_code == 1
+
+
+def test_cold_cache_reads_from_disk(clean_dataset, tmp_path):
+    if "fadvise" not in available_strategies() or proc_io() is None:
+        pytest.skip("requiere posix_fadvise y /proc/self/io")
+    if _fs_type(str(tmp_path)) in ("tmpfs", "ramfs", "overlay"):
+        pytest.skip("el page cache de este sistema de archivos no se puede vaciar")
+    path = tmp_path / "data.json"
+    path.write_bytes(os.urandom(1 << 20))
+    assert evict([str(path)]) == 1 << 20
+    before = proc_io()["read_bytes"]
+    b"".join(read_range(str(path), "buffered"))
+    assert proc_io()["read_bytes"] - before >= 1 << 20
+
+    result = run_named_engine("python", clean_dataset[0], workers=1, io_strategy="buffered", cold_cache=True)
+    assert result.io["cold_cache"] and result.io["evicted_bytes"] == result.bytes
+    assert result.io["disk_bytes"] > 0
+
+
+def test_read_error_keeps_exit_code_through_pool(monkeypatch, clean_dataset):
+    from mineria_benchmark import iopath
+
+    def failing(path, start, end, chunk_size):
+        raise BenchmarkError(f"O_DIRECT no soportado para {path}", 2)
+        yield
+
+    # Los workers del Pool heredan el lector reemplazado (fork)
+    monkeypatch.setitem(iopath._READERS, "direct", failing)
+    with pytest.raises(BenchmarkError) as e:
+        run_named_engine("python", clean_dataset[0], workers=2, io_strategy="direct")
+    assert e.value.exit_code == 2 and "O_DIRECT" in str(e.value)
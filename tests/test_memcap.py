@@ -0,0 +1,62 @@
+import pytest
+
+from mineria_benchmark import memcap
+from mineria_benchmark.memcap import classify, parse_size, run_capped, spilled_bytes
+
+
+def test_parse_size():
+    assert parse_size("512M") == 512 * 1024**2
+    assert parse_size("1.5GB") == int(1.5 * 1024**3)
+    assert parse_size("4096") == 4096
+    with pytest.raises(ValueError):
+        parse_size("cuatro gigas")
+
+
+def test_classify():
+    assert classify(0, "", False, False) == "ok"
+    assert classify(0, "", False, True) == "spill"
+    assert classify(3, "duckdb.OutOfMemoryException: Out of Memory Error", False, False) == "oom"
+    assert classify(None, "", True, False) == "oom"  # worker muerto por el kernel: el Pool cuelga
+    assert classify(None, "", False, False) == "timeout"
+    assert classify(2, "ERROR: no se encontraron archivos", False, False) == "error"
+
+
+def test_engine_reported_spill_wins_over_spill_dir():
+    # Spark siempre deja archivos de shuffle en spark.local.dir sin haber volcado nada
+    assert spilled_bytes({"spilled_bytes": 0}, 10 * 1024**2) == 0
+    assert spilled_bytes({"wall_time_s": 1.0}, 4096) == 4096
+    assert spilled_bytes(None, 0) == 0
+
+
+@pytest.mark.parametrize("cgroups", [True, False])
+def test_run_capped(monkeypatch, clean_dataset, cgroups):
+    if not cgroups:
+        monkeypatch.setattr(memcap.Cgroup, "create", classmethod(lambda cls, name, limit: None))
+    path, _expected = clean_dataset
+    record = run_capped("python", path, parse_size("1G"), workers=1, timeout=120)
+    assert record["outcome"] == "ok", record
+    assert record["mb_per_s"] > 0 and record["peak_rss_mb"] > 0
+    if not cgroups:
+        assert record["enforcement"] == "rlimit"
+
+
+def test_run_capped_rlimit_oom(monkeypatch, clean_dataset):
+    monkeypatch.setattr(memcap.Cgroup, "create", classmethod(lambda cls, name, limit: None))
+    path, _expected = clean_dataset
+    record = run_capped("python", path, parse_size("16M"), workers=1, timeout=120)
+    assert record["outcome"] == "oom", record
+
+
+def test_kill_tree_ignores_exited_children():
+    import subprocess
+    import sys
+
+    import psutil
+
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    gone = psutil.Process(proc.pid)
+    proc.wait()
+    # El hijo terminó entre tree() y kill(): no debe propagar NoSuchProcess
+    monitor = memcap.TreeMonitor(proc.pid, None)
+    monitor.tree = lambda: [gone]
+    monitor.kill_tree()
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mineria_benchmark.engines.numpy_engine import count_file, find_status_codes  # noqa: E402
+
+
+def test_find_status_codes_requires_three_digits():
+    data = np.frombuffer(b"HTTP Status Code: 20x HTTP Status Code: 404 HTTP Status Code: 5", dtype=np.uint8)
+    pos, first = find_status_codes(data)
+    assert pos.tolist() == [22] and first.tolist() == [4]
+
+
+def test_count_file_mixed_layouts(tmp_path):
+    lines = [
+        '{"message":"HTTP Status Code: 200","service":"a"}',       # vía vectorizada
+        json.dumps({"message": "HTTP Status Code: 404"}) + "\r",  # separadores de json.dumps, CRLF
+        '{"service":"a","message":"HTTP Status Code: 500"}',       # status en otra clave: vía lenta
+        '{"message":"HTTP Status Code: 201","service":"a"',        # truncada: se descarta
+        '{"message":"HTTP Status Code: 301"}',                     # fuera de los buckets
+        "",
+    ]
+    path = tmp_path / "a.json"
+    path.write_bytes("\n".join(lines).encode())
+    assert count_file(str(path)) == {"2": 1, "4": 1, "5": 1, "3": 1}
+
+
+def test_count_file_skips_invalid_json_with_canonical_shape(tmp_path):
+    lines = [
+        '{"message":"HTTP Status Code: 200",}',                      # coma final
+        '{"message":"HTTP Status Code: 404","x":}',                  # valor ausente
+        '{"message":"HTTP Status Code: 500","message":null}',        # json.loads se queda con null
+        '{"message":"HTTP Status Code: 201","t":1e3}',               # válido fuera de la gramática estricta
+        '{"message":"HTTP Status Code: 503","timestamp":1760218584.96}',
+    ]
+    path = tmp_path / "a.json"
+    path.write_bytes("\n".join(lines).encode())
+    assert count_file(str(path)) == {"2": 1, "5": 1}
+
+
+def test_count_file_sends_only_suspect_lines_to_json(monkeypatch, tmp_path):
+    from mineria_benchmark.engines import numpy_engine
+
+    lines = [
+        '{"message":"HTTP Status Code: 200","service":"a"}',          # vía vectorizada
+        '{"message": "HTTP Status Code: 404", "x": }',                 # valor ausente con espacio
+        '{"message":"HTTP Status Code: 500","x":[1, ]}',               # coma final en un arreglo
+        '{"message":"HTTP Status Code: 201","who":"ñandú"}',           # no ASCII: válido
+        '{"message":"\\u0048TTP Status Code: 502"}',                   # escape: válido
+        '{"service":"a","timestamp":1}',                               # sin "HTTP": no se parsea
+    ]
+    path = tmp_path / "a.json"
+    path.write_bytes("\n".join(lines).encode())
+    parsed = []
+    count_line = numpy_engine._count_line
+    monkeypatch.setattr(numpy_engine, "_count_line", lambda raw: parsed.append(raw) or count_line(raw))
+    assert count_file(str(path)) == {"2": 2, "5": 1}
+    assert [raw.decode() for raw in parsed] == lines[1:5]
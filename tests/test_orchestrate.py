@@ -0,0 +1,56 @@
+import json
+import os
+
+import pytest
+
+from common.analysis_utils import procesar_logs_multi_formato
+from mineria_benchmark import orchestrate as orch
+from mineria_benchmark.engines import BenchmarkError
+from mineria_benchmark.orchestrate import orchestrate, parse_cpus, parse_dataset
+
+
+def test_parse_cpus_and_dataset(clean_dataset):
+    cpu = min(os.sched_getaffinity(0))
+    assert parse_cpus(f"{cpu}-{cpu},{cpu}") == [cpu]
+    for spec in ("", "a-b", "100000"):
+        with pytest.raises(BenchmarkError):
+            parse_cpus(spec)
+    assert parse_dataset(f"5k/10={clean_dataset[0]}") == ("5k", "10", clean_dataset[0])
+    for spec in ("5k=/tmp", f"5k/10/x={clean_dataset[0]}", "5k/10=/no/existe"):
+        with pytest.raises(BenchmarkError):
+            parse_dataset(spec)
+
+
+@pytest.mark.parametrize("cgroups", [True, False])
+def test_sweep_writes_analysis_layout_and_resumes(monkeypatch, clean_dataset, edge_dataset, tmp_path, cgroups):
+    if not cgroups:
+        monkeypatch.setattr(orch.CpusetCgroup, "create", classmethod(lambda cls, name, cpus: None))
+    datasets = [("5k", "1", clean_dataset[0]), ("10k", "1", edge_dataset[0])]
+    records = orchestrate(["python"], datasets, str(tmp_path), cpus=[min(os.sched_getaffinity(0))], repeat=2)
+    assert [r["outcome"] for r in records] == ["ok"] * 4
+    assert all(r["workers"] == 1 and r["peak_rss_mb"] > 0 for r in records)
+    assert all(r["cache"]["evicted_bytes"] > 0 for r in records)
+    if not cgroups:
+        assert {r["pinning"] for r in records} == {"affinity"}
+
+    df = procesar_logs_multi_formato(str(tmp_path))
+    assert len(df) == 4
+    for group, expected in (("5k", clean_dataset[1]), ("10k", edge_dataset[1])):
+        rows = df[(df["Subcarpeta_1"] == group) & (df["Subcarpeta_2"] == "ex-python") & (df["Subcarpeta_3"] == "1")]
+        assert len(rows) == 2
+        assert all(int(rows[b].iloc[0]) == n for b, n in expected.items())
+
+    record_path = tmp_path / "5k" / "ex-python" / "1" / "record.json"
+    mtime = os.path.getmtime(record_path)
+    again = orchestrate(["python"], datasets, str(tmp_path), resume=True, repeat=2)
+    assert again == records and os.path.getmtime(record_path) == mtime
+
+
+def test_timeout_leaves_no_log(clean_dataset, tmp_path):
+    records = orchestrate(["python"], [("5k", "1", clean_dataset[0])], str(tmp_path), pin="none",
+                          cache="none", timeout=0.01)
+    assert records[0]["outcome"] == "timeout" and records[0]["wall_time_s"] is None
+    cell = tmp_path / "5k" / "ex-python" / "1"
+    assert os.listdir(cell) == ["record.json"]
+    with open(cell / "record.json", "r", encoding="utf-8") as f:
+        assert json.load(f)[0]["outcome"] == "timeout"
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+from mineria_benchmark import run_named_engine
+from mineria_benchmark.profiling import collapsed_stacks, duckdb_operators
+
+
+def test_python_profile_includes_pool_workers(clean_dataset, tmp_path):
+    """map_function sólo corre en los workers: si aparece, sus perfiles se fusionaron."""
+    path, _expected = clean_dataset
+    proc = subprocess.run([sys.executable, "-m", "mineria_benchmark", "run", "--engine", "python",
+                           "--input", path, "--workers", "2", "--profile", str(tmp_path)],
+                          capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    collapsed = (tmp_path / "profile-python.collapsed").read_text()
+    assert "map_function (python_engine.py:" in collapsed
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+    assert "map_function" in (tmp_path / "profile-python-top.txt").read_text()
+    assert (tmp_path / "profile-python.prof").stat().st_size > 0
+
+
+def test_collapsed_stacks_splits_shared_callee():
+    # a y b llaman a c; el tiempo propio de c se reparte según cada arista
+    raw = {
+        ("m.py", 1, "a"): (1, 1, 0.1, 0.4, {}),
+        ("m.py", 2, "b"): (1, 1, 0.1, 0.2, {}),
+        ("m.py", 3, "c"): (2, 2, 0.4, 0.4, {("m.py", 1, "a"): (1, 1, 0.3, 0.3),
+                                            ("m.py", 2, "b"): (1, 1, 0.1, 0.1)}),
+    }
+    stacks = dict(collapsed_stacks(raw))
+    assert stacks["a (m.py:1);c (m.py:3)"] == 300000
+    assert stacks["b (m.py:2);c (m.py:3)"] == 100000
+    assert stacks["a (m.py:1)"] == 100000
+
+
+def test_duckdb_operators_flattens_tree():
+    tree = {"name": "Query", "children": [
+        {"operator_name": "HASH_GROUP_BY", "operator_timing": 0.25, "operator_cardinality": 3, "children": [
+            {"operator_name": "READ_CSV", "operator_timing": 1.5, "operator_cardinality": 2000, "children": []},
+        ]},
+    ]}
+    assert duckdb_operators(tree) == [
+        (0, "Query", 0.0, 0),
+        (1, "HASH_GROUP_BY", 0.25, 3),
+        (2, "READ_CSV", 1.5, 2000),
+    ]
+
+
+def test_duckdb_profile_operator_table(clean_dataset, tmp_path):
+    pytest.importorskip("duckdb")
+    path, expected = clean_dataset
+    result = run_named_engine("duckdb", path, profile_dir=str(tmp_path))
+    assert result.counts == expected
+    assert sorted(result.profile) == sorted([str(tmp_path / "profile-duckdb.json"),
+                                             str(tmp_path / "profile-duckdb-top.txt")])
+    header, *rows = (tmp_path / "profile-duckdb-top.txt").read_text().splitlines()
+    assert header.split() == ["operator", "seconds", "rows", "depth"]
+    assert rows
+    seconds = [float(row.split()[-3]) for row in rows]
+    assert seconds == sorted(seconds, reverse=True)
+    assert any("GROUP_BY" in row for row in rows)
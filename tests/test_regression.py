@@ -0,0 +1,86 @@
+import json
+import random
+
+import pytest
+
+from mineria_benchmark import regression
+from mineria_benchmark.regression import (
+    METRICS,
+    compare,
+    compare_samples,
+    failed,
+    format_report,
+    mann_whitney,
+    run_compare,
+)
+
+
+def test_mann_whitney_exact_and_normal(monkeypatch):
+    u, p = mann_whitney([6, 7, 8], [1, 2, 3])
+    assert u == 9 and p == pytest.approx(1 / 20)
+    assert mann_whitney([1, 2, 3], [6, 7, 8])[1] == 1.0
+    assert mann_whitney([5, 5, 5], [5, 5, 5])[1] == 1.0  # todo empatado
+
+    rng = random.Random(3)
+    x = [rng.gauss(1.0, 0.2) for _ in range(15)]
+    y = [rng.gauss(0.9, 0.2) for _ in range(15)]
+    exact = mann_whitney(x, y)[1]
+    monkeypatch.setattr(regression, "EXACT_MAX_PAIRS", 0)
+    assert mann_whitney(x, y)[1] == pytest.approx(exact, abs=0.01)
+    # Con empates se usa la aproximación normal corregida
+    assert 0.3 < mann_whitney([1, 2, 2, 3], [1, 2, 2, 3])[1] < 0.7
+
+
+def test_verdict_needs_significance_and_effect():
+    base = [1.00, 1.01, 1.02, 1.03, 1.04]
+    assert compare_samples("wall_time_s", base, [1.30, 1.31, 1.32, 1.33, 1.34], 0.05, 0.05)["verdict"] == "regression"
+    # Significativo pero menor que el efecto mínimo
+    assert compare_samples("wall_time_s", base, [1.05, 1.06, 1.07, 1.08, 1.09], 0.05, 0.10)["verdict"] == "same"
+    # Grande pero con pocas muestras: no es significativo
+    assert compare_samples("wall_time_s", base[:2], [2.0, 2.1], 0.05, 0.05)["verdict"] == "same"
+    # En MB/s lo peor es bajar
+    row = compare_samples("mb_per_s", [100, 101, 102, 103, 104], [70, 71, 72, 73, 74], 0.05, 0.05)
+    assert row["verdict"] == "regression" and row["change"] < 0 and row["cliffs_delta"] == 1.0
+    assert compare_samples("peak_rss_mb", [80, 81, 82, 83, 84], [50, 51, 52, 53, 54], 0.05, 0.05)["verdict"] \
+        == "improvement"
+
+
+def test_compare_marks_new_and_errors():
+    samples = {
+        "python": {"d": {**{m: [1.0, 2.0] for m in METRICS}, "errors": []}},
+        "duckdb": {"d": {**{m: [] for m in METRICS}, "errors": ["timeout"]}},
+    }
+    rows = compare({"entries": {}}, samples)
+    assert [r["verdict"] for r in rows] == ["new", "error"]
+    assert failed(rows) and "ERROR: timeout" in format_report(rows)
+
+
+def test_run_compare_gates_against_stored_baseline(tmp_path):
+    baseline_path = str(tmp_path / "baseline.json")
+    options = dict(distributions=["uniform"], sizes_mb=[0.5], files=4, data_dir=str(tmp_path / "data"), repeat=4)
+    rows = run_compare(["python"], baseline_path, update=True, **options)
+    assert [r["verdict"] for r in rows] == ["new"] and not failed(rows)
+
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    samples = baseline["entries"]["python"]["uniform-4f-0.5mb-s0"]
+    assert all(len(samples[m]) == 4 for m in METRICS)
+    # Una línea base imposible de igualar: el motor actual queda como regresión
+    samples["wall_time_s"] = [0.001, 0.0011, 0.0012, 0.0013]
+    samples["mb_per_s"] = [1e6, 1.1e6, 1.2e6, 1.3e6]
+    with open(baseline_path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f)
+    rows = run_compare(["python"], baseline_path, **options)
+    verdicts = {r["metric"]: r["verdict"] for r in rows}
+    assert verdicts["wall_time_s"] == verdicts["mb_per_s"] == "regression" and failed(rows)
+
+
+def test_rss_regression_is_reported_without_gating():
+    base = [80, 81, 82, 83, 84]
+    row = {"engine": "python", "dataset": "d",
+           **compare_samples("peak_rss_mb", base, [120, 121, 122, 123, 124], 0.05, 0.05)}
+    assert row["verdict"] == "regression" and not row["gated"]
+    assert not failed([row]) and "(informativa)" in format_report([row])
+    row = {"engine": "python", "dataset": "d",
+           **compare_samples("wall_time_s", [1.0, 1.01, 1.02, 1.03, 1.04], [1.3, 1.31, 1.32, 1.33, 1.34], 0.05, 0.05)}
+    assert row["gated"] and failed([row])
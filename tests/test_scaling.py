@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from mineria_benchmark.datagen import DISTRIBUTIONS, file_sizes
+
+pytest.importorskip("pandas")
+analysis_utils = pytest.importorskip("analysis_utils")
+
+
+@pytest.mark.parametrize("distribution", DISTRIBUTIONS)
+def test_file_sizes_preserve_total(distribution):
+    sizes = file_sizes(32, 10_000, distribution, seed=1)
+    assert len(sizes) == 32 and sum(sizes) == 10_000
+
+
+def test_heavy_tail_is_skewed():
+    sizes = file_sizes(64, 100_000, "heavy-tail", seed=1)
+    assert max(sizes) > 4 * (100_000 / 64)
+
+
+def test_amdahl_recovers_serial_fraction(tmp_path):
+    f = 0.2
+    registros = [
+        {"engine": "polars", "workers": n, "distribution": "uniform", "total_mb": 64,
+         "files": 8, "bytes": 64 * 1024**2, "lines": 800_000, "ok": True,
+         "wall_time_s": 10.0 * (f + (1 - f) / n), "run_s": 0.0}
+        for n in (1, 2, 4, 8)
+    ]
+    ruta = tmp_path / "scaling.json"
+    ruta.write_text(json.dumps(registros))
+    df = analysis_utils.cargar_resultados_escalamiento(str(ruta))
+    metricas = analysis_utils.calcular_metricas_escalamiento(df)
+    assert metricas.loc[metricas["cores"] == 1, "mb_s"].iloc[0] == pytest.approx(6.4)
+    assert metricas.loc[metricas["cores"] == 8, "eficiencia"].iloc[0] == pytest.approx(1 / (8 * f + 1 - f))
+
+    ajuste = analysis_utils.ajustar_amdahl(metricas)
+    assert ajuste["fraccion_serial"].iloc[0] == pytest.approx(f)
+    assert ajuste["speedup_maximo"].iloc[0] == pytest.approx(1 / f)
+
+
+def test_amdahl_without_single_core_baseline(tmp_path):
+    f = 0.2
+    registros = [
+        {"engine": "polars", "workers": n, "distribution": "uniform", "total_mb": 64,
+         "files": 8, "bytes": 64 * 1024**2, "lines": 800_000, "ok": True,
+         "wall_time_s": 10.0 * (f + (1 - f) / n), "run_s": 0.0}
+        for n in (2, 4, 8)
+    ]
+    ruta = tmp_path / "scaling.json"
+    ruta.write_text(json.dumps(registros))
+    metricas = analysis_utils.calcular_metricas_escalamiento(analysis_utils.cargar_resultados_escalamiento(str(ruta)))
+    # El speedup es relativo a 2 cores, pero la fracción serial es la de Amdahl respecto de 1 core
+    assert metricas.loc[metricas["cores"] == 8, "speedup"].iloc[0] == pytest.approx((f + (1 - f) / 2) / (f + (1 - f) / 8))
+    ajuste = analysis_utils.ajustar_amdahl(metricas)
+    assert ajuste["fraccion_serial"].iloc[0] == pytest.approx(f)
+    assert ajuste["error_rms"].iloc[0] == pytest.approx(0.0, abs=1e-9)
+    # La curva punteada usa la misma base (2 cores) que la eficiencia medida
+    for _, fila in metricas.iterrows():
+        assert analysis_utils.eficiencia_amdahl(f, fila["cores"], 2) == pytest.approx(fila["eficiencia"])
@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from mineria_benchmark import BenchmarkError
+from mineria_benchmark.service import QueryService, ServiceClient, address_of, load_test, make_server
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = QueryService("python", workers=1)
+    yield service
+    service.close()
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def address(request, service, tmp_path):
+    socket_path = str(tmp_path / "service.sock") if request.param == "unix" else None
+    server = make_server(service, port=0, socket_path=socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield address_of(server)
+    server.shutdown()
+    server.server_close()
+
+
+def test_count_and_rollup(address, clean_dataset, edge_dataset):
+    clean_dir, clean_expected = clean_dataset
+    edge_dir, edge_expected = edge_dataset
+    client = ServiceClient(address)
+    try:
+        assert client.query({"query": "count", "input": clean_dir})["counts"] == clean_expected
+        rollup = client.query({"query": "rollup", "inputs": [clean_dir, edge_dir]})
+        assert rollup["by_input"] == {clean_dir: clean_expected, edge_dir: edge_expected}
+        assert rollup["counts"] == {b: clean_expected[b] + edge_expected[b] for b in clean_expected}
+        assert client.health()["served"] >= 2
+    finally:
+        client.close()
+
+
+def test_invalid_queries_keep_the_service_up(address, tmp_path):
+    client = ServiceClient(address)
+    try:
+        with pytest.raises(BenchmarkError) as excinfo:
+            client.query({"query": "count"})
+        assert excinfo.value.exit_code == 1
+        with pytest.raises(BenchmarkError) as excinfo:
+            client.query({"query": "count", "input": str(tmp_path / "no-existe")})
+        assert excinfo.value.exit_code == 1
+        with pytest.raises(BenchmarkError) as excinfo:
+            client.query([1, 2])
+        assert excinfo.value.exit_code == 1
+        assert client.health()["engine"] == "python"
+    finally:
+        client.close()
+
+
+def test_unexpected_errors_return_500(address, service, monkeypatch, clean_dataset):
+    def broken(_input_dir):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(service, "_count", broken)
+    client = ServiceClient(address)
+    try:
+        with pytest.raises(BenchmarkError) as excinfo:
+            client.query({"query": "count", "input": clean_dataset[0]})
+        assert excinfo.value.exit_code == 3
+        assert "KeyError" in str(excinfo.value)
+    finally:
+        client.close()
+
+
+def test_load_test_reports_latency(address, clean_dataset):
+    summary = load_test(address, {"query": "count", "input": clean_dataset[0]}, concurrency=2, requests=6)
+    assert summary["errors"] == 0
+    assert summary["requests"] == 6
+    assert 0 < summary["p50_s"] <= summary["p99_s"]
+    assert summary["qps"] > 0
+
+
+def test_cold_baseline_uses_the_service_workers(monkeypatch, clean_dataset):
+    import subprocess
+
+    from mineria_benchmark import service as service_module
+
+    commands = []
+
+    def fake_run(cmd, **kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(service_module.subprocess, "run", fake_run)
+    summary = service_module.cold_baseline("python", clean_dataset[0], runs=2, workers=3)
+    assert summary["workers"] == 3 and summary["errors"] == 0
+    assert all(cmd[-2:] == ["--workers", "3"] for cmd in commands) and len(commands) == 2
+
+
+def test_cold_baseline_runs_the_shim(clean_dataset):
+    from mineria_benchmark.service import cold_baseline
+
+    summary = cold_baseline("python", clean_dataset[0], runs=1, workers=1, timeout=60)
+    assert summary["errors"] == 0 and summary["workers"] == 1
@@ -0,0 +1,145 @@
+import os
+import threading
+
+import pytest
+from multiprocessing.connection import Client
+
+from mineria_benchmark.compact import compact
+from mineria_benchmark.engines import BenchmarkError, get_engine, list_json_files, merge_counts, normalize_counts
+from mineria_benchmark.sharded import Coordinator, materialize, plan_shards, run_sharded, spawn_workers
+from mineria_benchmark.verify import reference_counts
+
+
+def _fake_worker(coordinator, on_task, got_task):
+    """Worker de prueba conectado por el protocolo: on_task(conn, task) decide qué hace."""
+    def serve():
+        conn = Client(coordinator.address, authkey=coordinator.authkey)
+        conn.recv()
+        conn.send({"host": "fake", "pid": -1})
+        try:
+            while True:
+                task = conn.recv()
+                got_task.set()
+                if task["type"] == "stop" or on_task(conn, task):
+                    break
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_plan_shards_balances_bytes_and_skips_empty(edge_dataset):
+    files = list_json_files(edge_dataset[0])
+    root, shards = plan_shards(files, 3)
+    assert root == edge_dataset[0] and len(shards) == 3
+    planned = sorted(os.path.join(root, key) for s in shards for key in s.files)
+    assert planned == sorted(f for f in files if os.path.getsize(f))
+    assert max(s.bytes for s in shards) <= 2 * min(s.bytes for s in shards)
+    with pytest.raises(BenchmarkError):
+        plan_shards([f for f in files if not os.path.getsize(f)], 3)
+
+
+@pytest.mark.parametrize("transfer", ["link", "copy"])
+def test_local_workers_match_reference(edge_dataset, transfer):
+    input_dir, expected = edge_dataset
+    record = run_sharded("python", input_dir, local_workers=2, shards=4, engine_workers=1,
+                         transfer=transfer, timeout=60)
+    assert record["counts"] == expected
+    assert record["shards"] == len(record["shard_times"]) == 4
+    assert not any(record["redispatch"].values())
+
+
+def test_manifest_and_compacted_input(edge_dataset, tmp_path):
+    input_dir, expected = edge_dataset
+    files = list_json_files(input_dir)[:3]
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# subconjunto\n" + "\n".join(os.path.relpath(f, tmp_path) for f in files) + "\n")
+    record = run_sharded("numpy", manifest=str(manifest), local_workers=1, engine_workers=1, timeout=60)
+    assert record["counts"] == reference_counts(files)
+
+    out_dir = str(tmp_path / "compacted")
+    index = compact(input_dir, out_dir, shard_size=8 * 1024, range_size=2000)
+    root, shards = plan_shards(list_json_files(out_dir), 2)
+    coordinator = Coordinator("python", root, shards, index=index)
+    shard_dir = tmp_path / "shard"
+    shard_dir.mkdir()
+    materialize(coordinator._task(0, 1), root, "link", str(shard_dir))
+    engine = get_engine("python")(workers=1)
+    engine.prepare(str(shard_dir))
+    try:
+        assert engine.index is not None and len(engine.ranges) > len(engine.files)
+    finally:
+        engine.teardown()
+
+
+def test_failed_and_slow_shards_are_redispatched(edge_dataset):
+    input_dir, expected = edge_dataset
+    root, shards = plan_shards(list_json_files(input_dir), 4)
+    coordinator = Coordinator("python", root, shards, engine_workers=1)
+    coordinator.listen()
+    release = threading.Event()
+    procs = []
+    try:
+        died, stalled = threading.Event(), threading.Event()
+        # Uno se desconecta con su primer shard; otro lo retiene hasta el final
+        _fake_worker(coordinator, lambda conn, task: True, died)
+        assert died.wait(10)
+        _fake_worker(coordinator, lambda conn, task: release.wait(30), stalled)
+        assert stalled.wait(10)
+        procs = spawn_workers(coordinator.address, coordinator.authkey, 1)
+        results = coordinator.wait(timeout=60)
+    finally:
+        release.set()
+        coordinator.close()
+        for proc in procs:
+            proc.wait(timeout=10)
+    assert normalize_counts(merge_counts([r["counts"] for r in results.values()])) == expected
+    assert coordinator.events["failed"] == 1 and coordinator.events["speculative"] == 1
+
+
+def test_hung_worker_times_out(clean_dataset):
+    input_dir, expected = clean_dataset
+    root, shards = plan_shards(list_json_files(input_dir), 2)
+    # slow_factor alto: el shard retenido sólo vuelve a la cola por shard_timeout
+    coordinator = Coordinator("python", root, shards, engine_workers=1, slow_factor=1e6, shard_timeout=0.5)
+    coordinator.listen()
+    release, stalled = threading.Event(), threading.Event()
+    procs = []
+    try:
+        _fake_worker(coordinator, lambda conn, task: release.wait(30), stalled)
+        assert stalled.wait(10)
+        procs = spawn_workers(coordinator.address, coordinator.authkey, 1)
+        results = coordinator.wait(timeout=60)
+    finally:
+        release.set()
+        coordinator.close()
+        for proc in procs:
+            proc.wait(timeout=10)
+    assert normalize_counts(merge_counts([r["counts"] for r in results.values()])) == expected
+    assert coordinator.events["timeout"] == 1 and coordinator.events["speculative"] == 0
+
+
+def test_shard_failing_every_attempt_aborts(clean_dataset):
+    root, shards = plan_shards(list_json_files(clean_dataset[0]), 1)
+    coordinator = Coordinator("python", root, shards, max_attempts=2)
+    coordinator.listen()
+    got = threading.Event()
+    try:
+        _fake_worker(coordinator, lambda conn, task: conn.send(
+            {"type": "error", "shard": task["shard"], "error": "disco lleno"}), got)
+        with pytest.raises(BenchmarkError) as e:
+            coordinator.wait(timeout=30)
+    finally:
+        coordinator.close()
+    assert e.value.exit_code == 3 and "disco lleno" in str(e.value)
+    assert coordinator.attempts[0] == 2
+
+
+def test_spark_is_rejected(clean_dataset):
+    with pytest.raises(BenchmarkError) as e:
+        run_sharded("spark", clean_dataset[0])
+    assert e.value.exit_code == 1
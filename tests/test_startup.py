@@ -0,0 +1,36 @@
+from mineria_benchmark.startup import ImportTiming, format_startup, parse_importtime, profile_startup
+
+# Salida real de `python -X importtime -c "import json"` (recortada), con el encabezado
+IMPORTTIME_STDERR = """\
+import time: self [us] | cumulative | imported package
+import time:       136 |        136 |   _io
+import time:       299 |        852 | _frozen_importlib_external
+import time:        42 |         42 |     _codecs
+import time:       281 |        323 |   codecs
+import time:       593 |       1231 | encodings
+Traceback (most recent call last):
+import time:       412 |       2087 | json.decoder
+"""
+
+
+def test_parse_importtime_skips_header_and_other_lines():
+    assert parse_importtime(IMPORTTIME_STDERR) == [
+        ImportTiming("_io", 136, 136),
+        ImportTiming("_frozen_importlib_external", 299, 852),
+        ImportTiming("_codecs", 42, 42),
+        ImportTiming("codecs", 281, 323),
+        ImportTiming("encodings", 593, 1231),
+        ImportTiming("json.decoder", 412, 2087),
+    ]
+
+
+def test_profile_startup_python(clean_dataset):
+    path, _expected = clean_dataset
+    profile = profile_startup("python", path, repeat=1)
+    assert profile["engine"] == "python" and profile["prepare_included"]
+    assert 0 < profile["interpreter_s"] and 0 < profile["ready_s"]
+    assert profile["engine_startup_s"] >= 0
+    imports = profile["imports"]
+    assert imports["modules"] > 0 and imports["total_s"] > 0
+    assert "mineria_benchmark.engines.python_engine" in [t["module"] for t in imports["top"]]
+    assert format_startup(profile).startswith("[python] startup: interpreter ")
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from mineria_benchmark import BenchmarkError, run_named_engine
+from mineria_benchmark.datagen import generate_dataset
+from mineria_benchmark.engines import list_json_files
+from mineria_benchmark.verify import reference_counts, verify_generated
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_generator_is_reproducible(tmp_path):
+    a = generate_dataset(str(tmp_path / "a"), files=3, lines_per_file=50, seed=3, edge_cases=True)
+    b = generate_dataset(str(tmp_path / "b"), files=3, lines_per_file=50, seed=3, edge_cases=True)
+    assert a == b
+    for name in os.listdir(tmp_path / "a"):
+        assert (tmp_path / "a" / name).read_bytes() == (tmp_path / "b" / name).read_bytes()
+
+
+def test_oracle_matches_generated_counts(edge_dataset):
+    path, expected = edge_dataset
+    assert reference_counts(list_json_files(path)) == expected
+
+
+def test_engine_clean_dataset(engine_name, clean_dataset):
+    path, expected = clean_dataset
+    assert run_named_engine(engine_name, path).counts == expected
+
+
+def test_engine_edge_cases(engine_name, edge_dataset):
+    path, expected = edge_dataset
+    assert run_named_engine(engine_name, path).counts == expected
+
+
+def test_engine_heavy_noise(engine_name, tmp_path):
+    expected = generate_dataset(str(tmp_path), files=3, lines_per_file=200, seed=5,
+                                edge_cases=True, edge_rate=0.9)
+    assert run_named_engine(engine_name, str(tmp_path)).counts == expected
+
+
+def test_engine_invalid_dir(engine_name, tmp_path):
+    with pytest.raises(BenchmarkError) as exc:
+        run_named_engine(engine_name, str(tmp_path / "missing"))
+    assert exc.value.exit_code == 1
+
+
+@pytest.mark.parametrize("layout", ["no_json", "only_empty"])
+def test_engine_no_data(engine_name, tmp_path, layout):
+    if layout == "no_json":
+        (tmp_path / "notes.txt").write_text('{"message": "HTTP Status Code: 200"}\n')
+    else:
+        (tmp_path / "a.json").write_text("")
+        (tmp_path / "b.json").write_text("")
+    with pytest.raises(BenchmarkError) as exc:
+        run_named_engine(engine_name, str(tmp_path))
+    assert exc.value.exit_code == 2
+
+
+def test_verify_generated_reports_all_ok(engine_name):
+    report = verify_generated([engine_name], seed=1)
+    assert report[0]["ok"], report
+
+
+def test_legacy_main_output(engine_name, clean_dataset):
+    """ex-*/main.py mantiene el formato que parsean run.sh y procesar_logs_multi_formato."""
+    path, expected = clean_dataset
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, f"ex-{engine_name}", "main.py"), "--input", path],
+        capture_output=True, text=True, check=True,
+    )
+    lines = proc.stdout.strip().splitlines()
+    assert lines[0].startswith("Execution time: ") and lines[0].endswith(" seconds")
+    assert lines[1] == str(expected)
+
+
+def test_legacy_main_without_optional_dependencies(clean_dataset):
+    """ex-python/main.py corre con `dependencies = []`: la CLI no importa psutil ni los modos."""
+    path, expected = clean_dataset
+    script = os.path.join(ROOT, "ex-python", "main.py")
+    code = ("import runpy, sys; sys.modules['psutil'] = None; "
+            f"sys.argv = [{script!r}, '--input', {path!r}]; runpy.run_path({script!r}, run_name='__main__')")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().splitlines()[1] == str(expected)